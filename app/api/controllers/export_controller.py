@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from app.services.export_service import ExportFormat, ExportService
+
+
+class ExportController:
+    """Controller for bulk data exports.
+
+    Returns lazy iterators so the router can stream them; nothing is
+    materialized here.
+    """
+
+    def __init__(self, export_service: ExportService) -> None:
+        self._export_service = export_service
+
+    def export_tasks(self, fmt: ExportFormat) -> Iterator[str]:
+        """Stream every task of every project in the requested format."""
+        return self._export_service.stream_tasks(fmt)
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from typing import List
+from dataclasses import replace
+from fastapi import HTTPException, Request, status
 
-from fastapi import HTTPException, status
-
-from app.services.project_service import ProjectService
-from app.services.task_service import TaskService
+from app.services.async_project_service import AsyncProjectService
+from app.services.async_task_service import AsyncTaskService
 from app.exceptions.base import ValidationError, NotFoundError
+from app.models.query import ProjectQuery
+from app.api.etag import make_etag
+from app.api.pagination import decode_cursor, encode_cursor
 from app.api.schemas.request.project_request_schema import (
     ProjectCreateRequest,
     ProjectUpdateRequest,
 )
-from app.api.schemas.response.project_response_schema import ProjectResponse
+from app.api.schemas.response.project_response_schema import (
+    ProjectResponse,
+    dump_project_rows,
+)
 
 
 class ProjectController:
@@ -23,8 +28,8 @@ class ProjectController:
 
     def __init__(
         self,
-        project_service: ProjectService,
-        task_service: TaskService | None = None,
+        project_service: AsyncProjectService,
+        task_service: AsyncTaskService | None = None,
     ) -> None:
         self._project_service = project_service
         # task_service is optional for now; may be used later
@@ -32,14 +37,52 @@ class ProjectController:
 
     # ---------- Read / List ----------------------------------------------
 
-    def list_projects(self) -> List[ProjectResponse]:
-        """Return all projects as API response models."""
-        projects = self._project_service.list_projects()
-        return [ProjectResponse.model_validate(p) for p in projects]
+    async def list_projects(
+        self,
+        query: ProjectQuery,
+        cursor: str | None = None,
+    ) -> tuple[bytes, str | None]:
+        """Return one page of projects as a JSON body and the cursor of the
+        next page.
+
+        Like the task listing, rows are serialized in one batch (see
+        dump_project_rows), restricted to ``query.fields`` if given.
+        Maps an invalid cursor to HTTP 400.
+        """
+        query = self._page_query(query, cursor)
+        page = await self._project_service.list_project_rows_page(query)
+        next_cursor = encode_cursor(page.next_after) if page.next_after else None
+        return dump_project_rows(page.items, fields=query.fields), next_cursor
+
+    async def list_projects_etag(
+        self,
+        query: ProjectQuery,
+        cursor: str | None,
+        request: Request,
+    ) -> str:
+        """ETag of one page of projects, computed without loading the page.
+
+        Maps an invalid cursor to HTTP 400.
+        """
+        marker = await self._project_service.list_marker(self._page_query(query, cursor))
+        return make_etag(marker, request)
+
+    @staticmethod
+    def _page_query(query: ProjectQuery, cursor: str | None) -> ProjectQuery:
+        """``query`` positioned after ``cursor`` (HTTP 400 if it is invalid)."""
+        if not cursor:
+            return query
+        try:
+            return replace(query, after=decode_cursor(cursor))
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
 
     # ---------- Create ----------------------------------------------------
 
-    def create_project(
+    async def create_project(
         self,
         payload: ProjectCreateRequest,
     ) -> ProjectResponse:
@@ -48,11 +91,11 @@ class ProjectController:
         Maps ValidationError from the service to HTTP 400.
         """
         try:
-            project = self._project_service.create_project(
+            project = await self._project_service.create_project(
                 name=payload.name,
                 description=payload.description,
             )
-            return ProjectResponse.model_validate(project)
+            return ProjectResponse.from_project(project)
         except ValidationError as exc:
             # Bad input from the client
             raise HTTPException(
@@ -62,7 +105,7 @@ class ProjectController:
 
     # ---------- Update ----------------------------------------------------
 
-    def update_project(
+    async def update_project(
         self,
         project_id: int,
         payload: ProjectUpdateRequest,
@@ -72,12 +115,12 @@ class ProjectController:
         Only fields provided in the payload will be changed.
         """
         try:
-            project = self._project_service.rename_project(
+            project = await self._project_service.rename_project(
                 project_id=project_id,
                 new_name=payload.name,
                 new_description=payload.description,
             )
-            return ProjectResponse.model_validate(project)
+            return ProjectResponse.from_project(project)
         except NotFoundError as exc:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -91,13 +134,13 @@ class ProjectController:
 
     # ---------- Delete ----------------------------------------------------
 
-    def delete_project(self, project_id: int) -> None:
+    async def delete_project(self, project_id: int) -> None:
         """Delete a project.
 
         Returns None; the router will typically use HTTP 204.
         """
         try:
-            self._project_service.delete_project(project_id)
+            await self._project_service.delete_project(project_id)
         except NotFoundError as exc:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
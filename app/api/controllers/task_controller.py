@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import List
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 
-from app.services.task_service import TaskService
+from app.services.async_task_service import AsyncTaskService
 from app.exceptions.base import ValidationError, NotFoundError
+from app.models.query import TaskQuery, parse_task_sort_key
+from app.models.search import SearchQuery, parse_search_key
+from app.api.etag import make_etag
+from app.api.pagination import decode_cursor, encode_cursor
+from app.models.bulk import TaskChanges, TaskDraft
 from app.api.schemas.request.task_request_schema import (
+    TaskBulkCreateRequest,
+    TaskBulkUpdateRequest,
     TaskCreateRequest,
     TaskUpdateRequest,
 )
-from app.api.schemas.response.task_response_schema import TaskResponse
+from app.api.schemas.response.task_response_schema import (
+    TaskBulkCreateResponse,
+    TaskBulkItemResponse,
+    TaskBulkUpdateResponse,
+    TaskResponse,
+    TaskSearchResponse,
+    dump_task_rows,
+)
+
+
+# cursors of search results are only valid for search
+SEARCH_CURSOR = "search"
 
 
 class TaskController:
@@ -19,34 +38,105 @@ class TaskController:
     This layer maps TaskService to HTTP-friendly models and errors.
     """
 
-    def __init__(self, task_service: TaskService) -> None:
+    def __init__(self, task_service: AsyncTaskService) -> None:
         self._task_service = task_service
 
     # ---------- Read / List ----------------------------------------------
 
-    def list_tasks(self, project_id: int) -> List[TaskResponse]:
-        """Return all tasks for a given project."""
+    async def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        cursor: str | None = None,
+    ) -> tuple[bytes, str | None]:
+        """Return one page of a project's tasks as a JSON body, plus the next
+        page's cursor.
+
+        Rows go from the storage straight to JSON in one batch (no Task or
+        TaskResponse per row); the body is the same as ``list[TaskResponse]``,
+        restricted to ``query.fields`` when a sparse fieldset was requested.
+        The cursor is bound to the sort order it was issued for.
+        """
+        sort = query.sort.value
         try:
-            tasks = self._task_service.list_tasks(project_id)
+            if cursor:
+                after = parse_task_sort_key(
+                    decode_cursor(cursor, sort=sort),
+                    query.sort,
+                )
+                query = replace(query, after=after)
+            page = await self._task_service.list_task_rows_page(project_id, query)
         except NotFoundError as exc:
             # If the project doesn't exist, storage/service may raise NotFoundError
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=str(exc),
             ) from exc
+        except ValidationError as exc:
+            # Malformed cursor or cursor issued for another sort order
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+        next_cursor = (
+            encode_cursor(page.next_after, sort=sort) if page.next_after else None
+        )
+        return dump_task_rows(page.items, fields=query.fields), next_cursor
+
+    async def list_tasks_etag(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        request: Request,
+    ) -> str:
+        """ETag of a task listing, computed without loading any task."""
+        try:
+            marker = await self._task_service.list_marker(project_id)
+        except NotFoundError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(exc),
+            ) from exc
+        return make_etag(marker, request, extra=query.overdue_on)
+
+    async def search_tasks(
+        self,
+        query: SearchQuery,
+        cursor: str | None = None,
+    ) -> tuple[List[TaskSearchResponse], str | None]:
+        """Full-text search across all projects, best match first.
+
+        Maps an empty search text or an invalid cursor to HTTP 400.
+        """
+        try:
+            if cursor:
+                after = parse_search_key(decode_cursor(cursor, sort=SEARCH_CURSOR))
+                query = replace(query, after=after)
+            page = await self._task_service.search_tasks_page(query)
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
 
-        return [TaskResponse.model_validate(t) for t in tasks]
+        next_cursor = (
+            encode_cursor(page.next_after, sort=SEARCH_CURSOR)
+            if page.next_after
+            else None
+        )
+        return [TaskSearchResponse.from_hit(h) for h in page.items], next_cursor
 
     # ---------- Create ----------------------------------------------------
 
-    def create_task(
+    async def create_task(
         self,
         project_id: int,
         payload: TaskCreateRequest,
     ) -> TaskResponse:
         """Create a new task inside a project."""
         try:
-            task = self._task_service.create_task(
+            task = await self._task_service.create_task(
                 project_id=project_id,
                 title=payload.title,
                 description=payload.description,
@@ -66,9 +156,48 @@ class TaskController:
                 detail=str(exc),
             ) from exc
 
+    async def create_tasks(
+        self,
+        project_id: int,
+        payload: TaskBulkCreateRequest,
+    ) -> TaskBulkCreateResponse:
+        """Create many tasks at once and report the outcome of every item."""
+        drafts = [
+            TaskDraft(
+                title=item.title,
+                description=item.description,
+                deadline=item.deadline,
+            )
+            for item in payload.tasks
+        ]
+        try:
+            results = await self._task_service.create_tasks(
+                project_id,
+                drafts,
+                atomic=payload.atomic,
+            )
+        except NotFoundError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(exc),
+            ) from exc
+        except ValidationError as exc:
+            # A concurrent insert won the race for one of the titles
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(exc),
+            ) from exc
+
+        created = sum(1 for r in results if r.ok)
+        return TaskBulkCreateResponse(
+            created=created,
+            failed=len(results) - created,
+            results=[TaskBulkItemResponse.model_validate(r) for r in results],
+        )
+
     # ---------- Update ----------------------------------------------------
 
-    def update_task(
+    async def update_task(
         self,
         project_id: int,
         task_id: int,
@@ -76,10 +205,10 @@ class TaskController:
     ) -> TaskResponse:
         """Edit an existing task.
 
-        Uses TaskService.edit_task so we can update title/description/status/deadline.
+        Uses AsyncTaskService.edit_task so we can update title/description/status/deadline.
         """
         try:
-            task = self._task_service.edit_task(
+            task = await self._task_service.edit_task(
                 project_id=project_id,
                 task_id=task_id,
                 title=payload.title,
@@ -99,12 +228,49 @@ class TaskController:
                 detail=str(exc),
             ) from exc
 
+    async def update_tasks(
+        self,
+        project_id: int,
+        payload: TaskBulkUpdateRequest,
+    ) -> TaskBulkUpdateResponse:
+        """Apply the same status/deadline change to every matching task."""
+        flt = payload.filter
+        query = TaskQuery(
+            ids=tuple(flt.ids) if flt.ids is not None else None,
+            status=flt.status,
+            deadline_from=flt.deadline_from,
+            deadline_to=flt.deadline_to,
+        )
+        changes = TaskChanges(
+            status=payload.changes.status,
+            deadline=payload.changes.deadline,
+            shift_deadline_days=payload.changes.shift_deadline_days,
+        )
+        try:
+            result = await self._task_service.update_tasks(
+                project_id,
+                query,
+                changes,
+                returning=payload.return_tasks,
+            )
+        except NotFoundError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(exc),
+            ) from exc
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+        return TaskBulkUpdateResponse.model_validate(result)
+
     # ---------- Delete ----------------------------------------------------
 
-    def delete_task(self, project_id: int, task_id: int) -> None:
+    async def delete_task(self, project_id: int, task_id: int) -> None:
         """Delete a task from a project."""
         try:
-            self._task_service.delete_task(project_id, task_id)
+            await self._task_service.delete_task(project_id, task_id)
         except NotFoundError as exc:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+from typing import AsyncGenerator, Generator
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cache.backend import CACHE_ENABLED
+from app.cache.storage import AsyncCachedStorage, CachedStorage
+from app.db.session import (
+    get_async_replica_session,
+    get_async_session,
+    get_replica_session,
+    get_session,
+)
+from app.repositories.async_sqlalchemy_storage import AsyncSqlAlchemyStorage
+from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
+from todo.storage.async_memory_storage import AsyncInMemoryStorage
+from todo.storage.memory_storage import InMemoryStorage
+from todo.storage.persistence import DATA_DIR as MEMORY_DATA_DIR, MemoryPersistence
+
+
+# Where the API keeps its data: "sql" (PostgreSQL through SqlAlchemyStorage) or
+# "memory" (one thread-safe InMemoryStorage per process, so run a single
+# worker; lost on restart unless MEMORY_DATA_DIR is set).
+SQL_BACKEND = "sql"
+MEMORY_BACKEND = "memory"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", SQL_BACKEND).strip().lower()
+
+if STORAGE_BACKEND not in (SQL_BACKEND, MEMORY_BACKEND):
+    raise RuntimeError(
+        f"STORAGE_BACKEND must be '{SQL_BACKEND}' or '{MEMORY_BACKEND}', "
+        f"got '{STORAGE_BACKEND}'"
+    )
+
+
+# ----------------------
+# Dependencies (DI) shared by all routers
+# ----------------------
+def get_db() -> Generator[Session, None, None]:
+    """Provide a SQLAlchemy session per request."""
+    session = get_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_read_db() -> Generator[Session | None, None, None]:
+    """Provide a replica session per request (None without DATABASE_REPLICA_URLS)."""
+    session = get_replica_session()
+    try:
+        yield session
+    finally:
+        if session is not None:
+            session.close()
+
+
+# Storage handed to routers: the SQLAlchemy storage, behind the read-through
+# cache unless CACHE_ENABLED=0, or the shared in-memory storage.
+Storage = SqlAlchemyStorage | CachedStorage | InMemoryStorage
+AsyncStorage = AsyncSqlAlchemyStorage | AsyncCachedStorage | AsyncInMemoryStorage
+
+
+def get_sql_storage(
+    db: Session = Depends(get_db),
+    read_db: Session | None = Depends(get_read_db),
+) -> Generator[Storage, None, None]:
+    """Provide a SqlAlchemyStorage whose writes share one transaction per request.
+
+    Everything the endpoint does is committed once when it returns, or rolled
+    back if it raises (including HTTPException from the controllers). Use it
+    with ``Depends(get_storage, scope="function")`` so the commit happens
+    before the response is sent.
+
+    Reads go to a replica (if configured) until the request writes something;
+    from then on they use the primary so the request sees its own writes.
+    """
+    storage: Storage = SqlAlchemyStorage(db, read_session=read_db)
+    if CACHE_ENABLED:
+        storage = CachedStorage(storage)
+    with storage.unit_of_work():
+        yield storage
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an AsyncSession per request (async routers)."""
+    session = get_async_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession | None, None]:
+    """Async counterpart of :func:`get_read_db`."""
+    session = get_async_replica_session()
+    try:
+        yield session
+    finally:
+        if session is not None:
+            await session.close()
+
+
+async def get_async_sql_storage(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession | None = Depends(get_async_read_db),
+) -> AsyncGenerator[AsyncStorage, None]:
+    """Async counterpart of :func:`get_sql_storage` (same unit-of-work, replica and cache rules)."""
+    storage: AsyncStorage = AsyncSqlAlchemyStorage(db, read_session=read_db)
+    if CACHE_ENABLED:
+        storage = AsyncCachedStorage(storage)
+    async with storage.unit_of_work():
+        yield storage
+
+
+# Created only in memory mode; every request of the process shares it. With
+# MEMORY_DATA_DIR the storage comes from memory_persistence instead, which the
+# app lifespan opens (snapshot + log replay) and closes (final snapshot).
+memory_persistence = (
+    MemoryPersistence(MEMORY_DATA_DIR)
+    if STORAGE_BACKEND == MEMORY_BACKEND and MEMORY_DATA_DIR
+    else None
+)
+memory_storage = (
+    InMemoryStorage()
+    if STORAGE_BACKEND == MEMORY_BACKEND and memory_persistence is None
+    else None
+)
+
+
+def get_memory_storage() -> InMemoryStorage:
+    """Provide the process-wide InMemoryStorage (STORAGE_BACKEND=memory).
+
+    It is thread-safe on its own (sharded write locks, copy-on-write snapshots
+    for reads), so requests in the threadpool use it directly. The listing
+    cache is skipped: the listings are already served from memory.
+    """
+    if memory_persistence is not None:
+        return memory_persistence.storage
+    if memory_storage is None:
+        raise RuntimeError("STORAGE_BACKEND is not 'memory'")
+    return memory_storage
+
+
+async def get_async_memory_storage() -> AsyncInMemoryStorage:
+    """Async counterpart of :func:`get_memory_storage`."""
+    return AsyncInMemoryStorage(get_memory_storage())
+
+
+# The dependencies routers use, picked once from STORAGE_BACKEND.
+if STORAGE_BACKEND == MEMORY_BACKEND:
+    get_storage = get_memory_storage
+    get_async_storage = get_async_memory_storage
+else:
+    get_storage = get_sql_storage
+    get_async_storage = get_async_sql_storage
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+from fastapi import Request, Response, status
+
+from app.api.pagination import json_default
+from app.models.query import ChangeMarker
+
+
+def make_etag(marker: ChangeMarker, request: Request, *, extra: object = None) -> str:
+    """Strong ETag for a listing response.
+
+    Combines the listing's change marker with everything else that shapes the
+    body: the path and query string (filters, sort, limit, cursor) and ``extra``
+    (e.g. the reference date of ``overdue=true``, which changes daily).
+    """
+    payload = json.dumps(
+        [request.url.path, str(request.url.query), marker, extra],
+        separators=(",", ":"),
+        default=json_default,
+    )
+    return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
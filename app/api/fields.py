@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.exceptions.base import ValidationError
+
+
+def parse_fields(raw: str | None, model: type[BaseModel]) -> tuple[str, ...] | None:
+    """Parse a ``?fields=a,b,c`` sparse fieldset against a response model.
+
+    Returns the requested names in the model's field order (duplicates
+    removed), or None when the parameter is absent and every field is wanted.
+
+    :raises ValidationError: if the list is empty or names a field the model
+        doesn't have
+    """
+    if raw is None:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    if not requested:
+        raise ValidationError("fields must name at least one field")
+    unknown = requested - model.model_fields.keys()
+    if unknown:
+        raise ValidationError(
+            f"unknown field(s): {', '.join(sorted(unknown))}; "
+            f"allowed: {', '.join(model.model_fields)}"
+        )
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+def fields_include(fields: tuple[str, ...] | None) -> dict | None:
+    """``include=`` argument that keeps only ``fields`` of every list item."""
+    return None if fields is None else {"__all__": set(fields)}
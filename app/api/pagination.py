@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from fastapi import Request, Response
+
+from app.exceptions.base import ValidationError
+from app.models.query import SortKey
+
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def json_default(value: object) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(after: SortKey, *, sort: str = "id") -> str:
+    """Pack a keyset into an opaque, URL-safe cursor string."""
+    payload = json.dumps(
+        {"s": sort, "k": list(after)},
+        separators=(",", ":"),
+        default=json_default,
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *, sort: str = "id") -> SortKey:
+    """Unpack a cursor produced by :func:`encode_cursor`.
+
+    :raises ValidationError: if the cursor is malformed or was issued for
+        a different sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = payload["k"]
+        issued_for = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise ValidationError("invalid cursor") from exc
+
+    if issued_for != sort or not isinstance(key, list) or not key:
+        raise ValidationError("invalid cursor")
+    # the row id is always the last component of the key
+    if not isinstance(key[-1], int) or isinstance(key[-1], bool):
+        raise ValidationError("invalid cursor")
+    return tuple(key)
+
+
+def set_next_cursor(
+    request: Request,
+    response: Response,
+    next_cursor: str | None,
+) -> None:
+    """Expose the next page to the client via headers.
+
+    The body stays a plain JSON list, so existing clients keep working; a
+    missing ``X-Next-Cursor`` header means this was the last page.
+    """
+    if next_cursor is None:
+        return
+    response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -1,4 +1,13 @@
 from .project_router import router as project_router
 from .task_router import router as task_router
+from .search_router import router as search_router
+from .export_router import router as export_router
+from .diagnostics_router import router as diagnostics_router
 
-__all__ = ["project_router", "task_router"]
+__all__ = [
+    "project_router",
+    "task_router",
+    "search_router",
+    "export_router",
+    "diagnostics_router",
+]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Any
+
+from anyio import to_thread
+from fastapi import APIRouter
+
+from app.api.dependencies import SQL_BACKEND, STORAGE_BACKEND, memory_persistence
+from app.cache.backend import CACHE_ENABLED, default_cache
+from app.db.pool import pool_status
+from app.db.session import (
+    POOL_SETTINGS,
+    get_async_engine,
+    get_async_replica_engines,
+    get_engine,
+    get_replica_engines,
+)
+
+
+router = APIRouter(
+    prefix="/api/diagnostics",
+    tags=["diagnostics"],
+)
+
+
+@router.get(
+    "/pool",
+    summary="Connection pool and threadpool usage",
+)
+async def get_pool_diagnostics() -> dict[str, Any]:
+    """Checked-out connections, overflow and checkout wait times per pool.
+
+    ``sync`` is the pool used by sync routes and commands, ``async`` the one
+    used by the async project/task routes, ``replicas``/``async_replicas`` the
+    read replica pools; ``threadpool`` is the limiter that runs sync routes and
+    dependencies. With STORAGE_BACKEND=memory there are no pools (``null``
+    and empty lists).
+    """
+    limiter = to_thread.current_default_thread_limiter()
+    threadpool = {
+        "total": limiter.total_tokens,
+        "borrowed": limiter.borrowed_tokens,
+    }
+    if STORAGE_BACKEND != SQL_BACKEND:
+        return {
+            "sync": None,
+            "async": None,
+            "replicas": [],
+            "async_replicas": [],
+            "threadpool": threadpool,
+        }
+    async_engine = get_async_engine()
+    return {
+        "sync": pool_status(get_engine().pool, POOL_SETTINGS).to_dict(),
+        "async": pool_status(async_engine.sync_engine.pool, POOL_SETTINGS).to_dict(),
+        "replicas": [
+            pool_status(e.pool, POOL_SETTINGS).to_dict()
+            for e in get_replica_engines()
+        ],
+        "async_replicas": [
+            pool_status(e.sync_engine.pool, POOL_SETTINGS).to_dict()
+            for e in get_async_replica_engines()
+        ],
+        "threadpool": threadpool,
+    }
+
+
+@router.get(
+    "/cache",
+    summary="Read-through cache statistics",
+)
+async def get_cache_diagnostics() -> dict[str, Any]:
+    """Hit/miss counters of this worker's listing cache."""
+    return {"enabled": CACHE_ENABLED, **default_cache.stats().to_dict()}
+
+
+@router.get(
+    "/persistence",
+    summary="Durable in-memory storage: recovery, snapshots and log",
+)
+async def get_persistence_diagnostics() -> dict[str, Any]:
+    """Startup recovery time, last snapshot and log records/fsyncs (MEMORY_DATA_DIR)."""
+    if memory_persistence is None:
+        return {"enabled": False}
+    return {"enabled": True, **memory_persistence.status()}
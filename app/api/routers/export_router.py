@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import Storage, get_storage
+from app.api.controllers.export_controller import ExportController
+from app.services.export_service import ExportFormat, ExportService
+
+
+router = APIRouter(
+    prefix="/api/export",
+    tags=["export"],
+)
+
+
+# ----------------------
+# Dependencies (DI)
+# ----------------------
+def get_export_controller(
+    # Default (request) scope: the session must stay open until the
+    # streamed response has been fully sent.
+    storage: Storage = Depends(get_storage),
+) -> ExportController:
+    """Wire up ExportService into the controller."""
+    return ExportController(export_service=ExportService(storage))
+
+
+# ----------------------
+# Endpoints
+# ----------------------
+@router.get(
+    "/tasks",
+    response_class=StreamingResponse,
+    summary="Stream all tasks of all projects as NDJSON or CSV",
+    responses={
+        200: {
+            "content": {
+                "application/x-ndjson": {},
+                "text/csv": {},
+            },
+            "description": "One row per task, ordered by project_id and id.",
+        },
+    },
+)
+def export_tasks(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Output format."),
+    controller: ExportController = Depends(get_export_controller),
+):
+    return StreamingResponse(
+        controller.export_tasks(format),
+        media_type=format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{format.value}"',
+        },
+    )
@@ -1,22 +1,29 @@
 from __future__ import annotations
 
-from typing import Generator
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from app.db.session import get_session
-from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
-from app.services.project_service import ProjectService
-from app.services.task_service import TaskService
+from app.api.dependencies import AsyncStorage, get_async_storage
+from app.services.async_project_service import AsyncProjectService
+from app.services.async_task_service import AsyncTaskService
+from app.api.etag import is_not_modified, not_modified
+from app.api.fields import parse_fields
+from app.exceptions.base import ValidationError
+from app.api.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, set_next_cursor
 from app.api.controllers.project_controller import ProjectController
+from app.models.query import ProjectQuery
 from app.api.schemas.request.project_request_schema import (
     ProjectCreateRequest,
+    ProjectInclude,
     ProjectUpdateRequest,
 )
 from app.api.schemas.response.project_response_schema import ProjectResponse
 
 
+DEFAULT_TASKS_LIMIT = 5
+MAX_TASKS_LIMIT = 50
+
+
 router = APIRouter(
     prefix="/api/projects",
     tags=["projects"],
@@ -26,44 +33,88 @@ router = APIRouter(
 # ----------------------
 # Dependencies (DI)
 # ----------------------
-def get_db() -> Generator[Session, None, None]:
-    """Provide a SQLAlchemy session per request."""
-    session = get_session()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
-def get_storage(db: Session = Depends(get_db)) -> SqlAlchemyStorage:
-    """Provide a SqlAlchemyStorage instance per request."""
-    return SqlAlchemyStorage(db)
-
-
-def get_project_controller(
-    storage: SqlAlchemyStorage = Depends(get_storage),
+async def get_project_controller(
+    storage: AsyncStorage = Depends(get_async_storage, scope="function"),
 ) -> ProjectController:
-    """Wire up ProjectService/TaskService into the controller."""
-    project_service = ProjectService(storage)
-    task_service = TaskService(storage)
+    """Wire up AsyncProjectService/AsyncTaskService into the controller."""
+    project_service = AsyncProjectService(storage)
+    task_service = AsyncTaskService(storage)
     return ProjectController(
         project_service=project_service,
         task_service=task_service,
     )
 
 
+async def get_project_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated ProjectResponse fields to return, e.g. id,name.",
+    ),
+) -> tuple[str, ...] | None:
+    """Validate a ``?fields=`` sparse fieldset (400 on unknown fields)."""
+    try:
+        return parse_fields(fields, ProjectResponse)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+async def get_project_query(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    include: list[ProjectInclude] = Query(
+        [],
+        description=(
+            "Optional blocks to embed: counts (tasks per status), "
+            "tasks (first tasks_limit tasks by deadline)."
+        ),
+    ),
+    tasks_limit: int = Query(
+        DEFAULT_TASKS_LIMIT,
+        ge=1,
+        le=MAX_TASKS_LIMIT,
+        description="Tasks embedded per project with include=tasks.",
+    ),
+    fields: tuple[str, ...] | None = Depends(get_project_fields),
+) -> ProjectQuery:
+    """Collect listing options from the query string into a ProjectQuery."""
+    return ProjectQuery(
+        limit=limit,
+        with_counts=ProjectInclude.COUNTS in include,
+        tasks_limit=tasks_limit if ProjectInclude.TASKS in include else None,
+        fields=fields,
+    )
+
+
 # ----------------------
 # Endpoints
 # ----------------------
 @router.get(
     "",
     response_model=list[ProjectResponse],
-    summary="List all projects",
+    summary="List projects (keyset-paginated by id)",
+    responses={304: {"description": "Not modified since the ETag in If-None-Match."}},
 )
-def list_projects(
+async def list_projects(
+    request: Request,
+    query: ProjectQuery = Depends(get_project_query),
+    cursor: str | None = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+    ),
     controller: ProjectController = Depends(get_project_controller),
 ):
-    return controller.list_projects()
+    etag = await controller.list_projects_etag(query, cursor, request)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    # Already-serialized body, as in the task listing
+    body, next_cursor = await controller.list_projects(query, cursor)
+    response = Response(content=body, media_type="application/json")
+    set_next_cursor(request, response, next_cursor)
+    response.headers["ETag"] = etag
+    return response
 
 
 @router.post(
@@ -72,11 +123,11 @@ def list_projects(
     status_code=status.HTTP_201_CREATED,
     summary="Create a new project",
 )
-def create_project(
+async def create_project(
     payload: ProjectCreateRequest,
     controller: ProjectController = Depends(get_project_controller),
 ):
-    return controller.create_project(payload)
+    return await controller.create_project(payload)
 
 
 @router.put(
@@ -84,12 +135,12 @@ def create_project(
     response_model=ProjectResponse,
     summary="Update an existing project",
 )
-def update_project(
+async def update_project(
     project_id: int,
     payload: ProjectUpdateRequest,
     controller: ProjectController = Depends(get_project_controller),
 ):
-    return controller.update_project(project_id, payload)
+    return await controller.update_project(project_id, payload)
 
 
 @router.delete(
@@ -97,8 +148,8 @@ def update_project(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete a project",
 )
-def delete_project(
+async def delete_project(
     project_id: int,
     controller: ProjectController = Depends(get_project_controller),
 ):
-    controller.delete_project(project_id)
+    await controller.delete_project(project_id)
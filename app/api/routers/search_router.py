@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from app.api.controllers.task_controller import TaskController
+from app.api.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, set_next_cursor
+from app.api.routers.task_router import get_task_controller
+from app.api.schemas.response.task_response_schema import TaskSearchResponse
+from app.models.search import SearchQuery
+
+
+router = APIRouter(
+    prefix="/api/tasks",
+    tags=["tasks"],
+)
+
+
+# ----------------------
+# Dependencies (DI)
+# ----------------------
+async def get_search_query(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Words that must all appear in the title or description.",
+    ),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+) -> SearchQuery:
+    return SearchQuery(text=q, limit=limit)
+
+
+# ----------------------
+# Endpoints
+# ----------------------
+@router.get(
+    "/search",
+    response_model=list[TaskSearchResponse],
+    summary="Full-text search over tasks of all projects (ranked, keyset-paginated)",
+)
+async def search_tasks(
+    request: Request,
+    response: Response,
+    query: SearchQuery = Depends(get_search_query),
+    cursor: str | None = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+    ),
+    controller: TaskController = Depends(get_task_controller),
+):
+    hits, next_cursor = await controller.search_tasks(query, cursor)
+    set_next_cursor(request, response, next_cursor)
+    return hits
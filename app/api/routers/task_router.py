@@ -1,19 +1,29 @@
 from __future__ import annotations
 
-from typing import Generator
-
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-
-from app.db.session import get_session
-from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
-from app.services.task_service import TaskService
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from app.api.dependencies import AsyncStorage, get_async_storage
+from app.exceptions.base import ValidationError
+from app.services.async_task_service import AsyncTaskService
+from app.models.query import TaskQuery, TaskSort
+from app.models.task import Status
+from app.api.etag import is_not_modified, not_modified
+from app.api.fields import parse_fields
+from app.api.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, set_next_cursor
 from app.api.controllers.task_controller import TaskController
 from app.api.schemas.request.task_request_schema import (
+    TaskBulkCreateRequest,
+    TaskBulkUpdateRequest,
     TaskCreateRequest,
     TaskUpdateRequest,
 )
-from app.api.schemas.response.task_response_schema import TaskResponse
+from app.api.schemas.response.task_response_schema import (
+    TaskBulkCreateResponse,
+    TaskBulkUpdateResponse,
+    TaskResponse,
+)
 
 
 router = APIRouter(
@@ -25,41 +35,84 @@ router = APIRouter(
 # ----------------------
 # Dependencies (DI)
 # ----------------------
-def get_db() -> Generator[Session, None, None]:
-    """Provide a SQLAlchemy session per request."""
-    session = get_session()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
-def get_storage(db: Session = Depends(get_db)) -> SqlAlchemyStorage:
-    """Provide a SqlAlchemyStorage instance per request."""
-    return SqlAlchemyStorage(db)
-
-
-def get_task_controller(
-    storage: SqlAlchemyStorage = Depends(get_storage),
+async def get_task_controller(
+    storage: AsyncStorage = Depends(get_async_storage, scope="function"),
 ) -> TaskController:
-    """Wire up TaskService into the controller."""
-    task_service = TaskService(storage)
+    """Wire up AsyncTaskService into the controller."""
+    task_service = AsyncTaskService(storage)
     return TaskController(task_service=task_service)
 
 
+async def get_task_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated TaskResponse fields to return, e.g. id,title,status.",
+    ),
+) -> tuple[str, ...] | None:
+    """Validate a ``?fields=`` sparse fieldset (400 on unknown fields)."""
+    try:
+        return parse_fields(fields, TaskResponse)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+async def get_task_query(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    status: Status | None = Query(None, description="Only tasks with this status."),
+    deadline_from: date | None = Query(None, description="Deadline on or after."),
+    deadline_to: date | None = Query(None, description="Deadline on or before."),
+    overdue: bool = Query(
+        False,
+        description="Only tasks past their deadline that are not done.",
+    ),
+    sort: TaskSort = Query(TaskSort.ID, description="Sort key (ascending)."),
+    fields: tuple[str, ...] | None = Depends(get_task_fields),
+) -> TaskQuery:
+    """Collect list filters from the query string into a TaskQuery."""
+    return TaskQuery(
+        limit=limit,
+        status=status,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+        overdue_on=date.today() if overdue else None,
+        sort=sort,
+        fields=fields,
+    )
+
+
 # ----------------------
 # Endpoints
 # ----------------------
 @router.get(
     "",
     response_model=list[TaskResponse],
-    summary="List all tasks in a project",
+    summary="List tasks in a project (filtered, sorted, keyset-paginated)",
+    responses={304: {"description": "Not modified since the ETag in If-None-Match."}},
 )
-def list_tasks(
+async def list_tasks(
     project_id: int,
+    request: Request,
+    query: TaskQuery = Depends(get_task_query),
+    cursor: str | None = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+    ),
     controller: TaskController = Depends(get_task_controller),
 ):
-    return controller.list_tasks(project_id)
+    etag = await controller.list_tasks_etag(project_id, query, request)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    # The body is already JSON; returning a Response skips response_model
+    # re-validation (the model still documents the schema in OpenAPI).
+    body, next_cursor = await controller.list_tasks(project_id, query, cursor)
+    response = Response(content=body, media_type="application/json")
+    set_next_cursor(request, response, next_cursor)
+    response.headers["ETag"] = etag
+    return response
 
 
 @router.post(
@@ -68,12 +121,57 @@ def list_tasks(
     status_code=status.HTTP_201_CREATED,
     summary="Create a new task in a project",
 )
-def create_task(
+async def create_task(
     project_id: int,
     payload: TaskCreateRequest,
     controller: TaskController = Depends(get_task_controller),
 ):
-    return controller.create_task(project_id, payload)
+    return await controller.create_task(project_id, payload)
+
+
+@router.post(
+    ":bulk",
+    response_model=TaskBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many tasks in a project",
+    responses={
+        status.HTTP_207_MULTI_STATUS: {
+            "model": TaskBulkCreateResponse,
+            "description": "Partial success (atomic=false): some items failed.",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": TaskBulkCreateResponse,
+            "description": "atomic=true and at least one item failed; nothing created.",
+        },
+    },
+)
+async def create_tasks(
+    project_id: int,
+    payload: TaskBulkCreateRequest,
+    response: Response,
+    controller: TaskController = Depends(get_task_controller),
+):
+    result = await controller.create_tasks(project_id, payload)
+    if result.failed:
+        response.status_code = (
+            status.HTTP_207_MULTI_STATUS
+            if result.created
+            else status.HTTP_400_BAD_REQUEST
+        )
+    return result
+
+
+@router.patch(
+    "",
+    response_model=TaskBulkUpdateResponse,
+    summary="Update status/deadline of every task matching a filter",
+)
+async def update_tasks(
+    project_id: int,
+    payload: TaskBulkUpdateRequest,
+    controller: TaskController = Depends(get_task_controller),
+):
+    return await controller.update_tasks(project_id, payload)
 
 
 @router.put(
@@ -81,13 +179,13 @@ def create_task(
     response_model=TaskResponse,
     summary="Update an existing task",
 )
-def update_task(
+async def update_task(
     project_id: int,
     task_id: int,
     payload: TaskUpdateRequest,
     controller: TaskController = Depends(get_task_controller),
 ):
-    return controller.update_task(project_id, task_id, payload)
+    return await controller.update_task(project_id, task_id, payload)
 
 
 @router.delete(
@@ -95,9 +193,9 @@ def update_task(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete a task",
 )
-def delete_task(
+async def delete_task(
     project_id: int,
     task_id: int,
     controller: TaskController = Depends(get_task_controller),
 ):
-    controller.delete_task(project_id, task_id)
+    await controller.delete_task(project_id, task_id)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from enum import Enum
+
 from pydantic import BaseModel, Field
 from app.models.task import MAX_TITLE_LEN, MAX_DESC_LEN
 
@@ -39,3 +41,10 @@ class ProjectUpdateRequest(BaseModel):
         max_length=MAX_DESC_LEN,
         description="New project description.",
     )
+
+
+class ProjectInclude(str, Enum):
+    """Optional blocks that can be embedded in project listings (?include=)."""
+
+    COUNTS = "counts"
+    TASKS = "tasks"
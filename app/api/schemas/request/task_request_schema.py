@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from datetime import date
 from pydantic import BaseModel, Field
-from app.models.task import MAX_TITLE_LEN, MAX_DESC_LEN
+from app.models.task import MAX_TITLE_LEN, MAX_DESC_LEN, Status
+
+
+MAX_BULK_TASKS = 1000
 
 
 class TaskCreateRequest(BaseModel):
@@ -54,3 +57,72 @@ class TaskUpdateRequest(BaseModel):
         default=None,
         description="New deadline in YYYY-MM-DD format.",
     )
+
+
+class TaskBulkCreateRequest(BaseModel):
+    """Request body for creating many tasks in one call."""
+
+    tasks: list[TaskCreateRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BULK_TASKS,
+        description=f"Tasks to create (at most {MAX_BULK_TASKS}).",
+    )
+    atomic: bool = Field(
+        default=True,
+        description=(
+            "true: create all tasks or none of them; "
+            "false: create the valid ones and report the rest."
+        ),
+    )
+
+
+class TaskFilterRequest(BaseModel):
+    """Which tasks of the project a mass update applies to (criteria are ANDed)."""
+
+    ids: list[int] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=MAX_BULK_TASKS,
+        description="Only these task ids.",
+    )
+    status: Status | None = Field(
+        default=None,
+        description="Only tasks with this status.",
+    )
+    deadline_from: date | None = Field(
+        default=None,
+        description="Only tasks with deadline on or after this date.",
+    )
+    deadline_to: date | None = Field(
+        default=None,
+        description="Only tasks with deadline on or before this date.",
+    )
+
+
+class TaskChangesRequest(BaseModel):
+    """Changes applied to every matched task."""
+
+    status: Status | None = Field(
+        default=None,
+        description="New status; at_closed is set/cleared like a single update.",
+    )
+    deadline: date | None = Field(
+        default=None,
+        description="New deadline (YYYY-MM-DD).",
+    )
+    shift_deadline_days: int | None = Field(
+        default=None,
+        description="Move existing deadlines by N days (negative = earlier).",
+    )
+
+
+class TaskBulkUpdateRequest(BaseModel):
+    """Request body for updating all tasks that match a filter."""
+
+    filter: TaskFilterRequest
+    changes: TaskChangesRequest
+    return_tasks: bool = Field(
+        default=False,
+        description="Also return the updated tasks.",
+    )
@@ -1,7 +1,29 @@
 from __future__ import annotations
 
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from typing import Iterable
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.api.fields import fields_include
+from app.models.project import Project
+from app.models.query import ProjectRow
+from app.api.schemas.response.task_response_schema import (
+    TaskResponse,
+    TaskRowResponse,
+)
+
+
+class TaskCountsResponse(BaseModel):
+    """Number of tasks of a project per status."""
+
+    todo: int
+    doing: int
+    done: int
+    total: int
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectResponse(BaseModel):
@@ -11,6 +33,72 @@ class ProjectResponse(BaseModel):
     name: str
     description: str
     created_at: datetime
+    # Only present when requested with ?include=counts
+    task_counts: TaskCountsResponse | None = None
+    # Only present when requested with ?include=tasks (first N by deadline)
+    tasks: list[TaskResponse] | None = None
 
     # pydantic v2: allow constructing from dataclass / ORM objects
     model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_project(
+        cls,
+        project: Project,
+        *,
+        with_tasks: bool = False,
+    ) -> "ProjectResponse":
+        """Build the response without touching ``project.tasks`` unless asked.
+
+        In-memory projects carry all of their tasks; validating them just to
+        drop them again would make every project response O(tasks).
+        """
+        return cls(
+            id=project.id,
+            name=project.name,
+            description=project.description,
+            created_at=project.created_at,
+            task_counts=(
+                TaskCountsResponse.model_validate(project.task_counts)
+                if project.task_counts is not None
+                else None
+            ),
+            tasks=(
+                [TaskResponse.model_validate(t) for t in project.tasks]
+                if with_tasks
+                else None
+            ),
+        )
+
+
+class TaskCountsRowResponse(TypedDict):
+    todo: int
+    doing: int
+    done: int
+    total: int
+
+
+class ProjectRowResponse(TypedDict):
+    """ProjectResponse as a plain dict (see TaskRowResponse)."""
+
+    id: int
+    name: str
+    description: str
+    created_at: datetime
+    task_counts: TaskCountsRowResponse | None
+    tasks: list[TaskRowResponse] | None
+
+
+_PROJECT_ROWS_ADAPTER = TypeAdapter(list[ProjectRowResponse])
+
+
+def dump_project_rows(
+    rows: Iterable[ProjectRow],
+    *,
+    fields: tuple[str, ...] | None = None,
+) -> bytes:
+    """JSON body of a project list, byte-identical to ``list[ProjectResponse]``.
+
+    With ``fields``, every item only carries those keys (sparse fieldset).
+    """
+    return _PROJECT_ROWS_ADAPTER.dump_json(list(rows), include=fields_include(fields))
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from pydantic import BaseModel, ConfigDict
+from typing import Iterable
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.api.fields import fields_include
+from app.models.query import TaskRow
+from app.models.search import SearchHit
 from app.models.task import Status
 
 
@@ -16,3 +23,78 @@ class TaskResponse(BaseModel):
     at_closed: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskSearchResponse(TaskResponse):
+    """A task found by full-text search, with its project and relevance."""
+
+    project_id: int
+    rank: float
+
+    @classmethod
+    def from_hit(cls, hit: SearchHit) -> "TaskSearchResponse":
+        return cls(
+            **TaskResponse.model_validate(hit.task).model_dump(),
+            project_id=hit.project_id,
+            rank=hit.rank,
+        )
+
+
+class TaskRowResponse(TypedDict):
+    """TaskResponse as a plain dict, for serializing storage rows directly.
+
+    Same fields in the same order as TaskResponse, so both produce the same
+    JSON. ``status`` is the raw column value (the enum's value), which is what
+    TaskResponse serializes to anyway.
+    """
+
+    id: int
+    title: str
+    description: str
+    status: str
+    deadline: date | None
+    at_closed: datetime | None
+
+
+# Built once: dumping a list of dicts goes straight through pydantic-core,
+# with no model instance per row. Keys not listed above are dropped.
+_TASK_ROWS_ADAPTER = TypeAdapter(list[TaskRowResponse])
+
+
+def dump_task_rows(
+    rows: Iterable[TaskRow],
+    *,
+    fields: tuple[str, ...] | None = None,
+) -> bytes:
+    """JSON body of a task list, byte-identical to ``list[TaskResponse]``.
+
+    With ``fields``, every item only carries those keys (sparse fieldset).
+    """
+    return _TASK_ROWS_ADAPTER.dump_json(list(rows), include=fields_include(fields))
+
+
+class TaskBulkItemResponse(BaseModel):
+    """Outcome of one item of a bulk create, by position in the request."""
+
+    index: int
+    task: TaskResponse | None = None
+    error: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskBulkCreateResponse(BaseModel):
+    """Per-item results of a bulk create."""
+
+    created: int
+    failed: int
+    results: list[TaskBulkItemResponse]
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    """Result of a filter-based mass update."""
+
+    updated: int
+    tasks: list[TaskResponse] | None = None
+
+    model_config = ConfigDict(from_attributes=True)
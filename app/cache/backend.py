@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Hashable, Protocol
+
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+
+# marker for "not in cache" (None is a valid cached value)
+MISS = object()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Hit/miss counters of a cache backend."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+class CacheBackend(Protocol):
+    """Storage for cached values and version counters.
+
+    Version counters must never be evicted: a counter that silently restarts
+    at 0 would make old entries valid again.
+    """
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value or ``MISS``."""
+        ...
+    def set(self, key: Hashable, value: Any) -> None: ...
+    def version(self, key: Hashable) -> int: ...
+    def bump(self, key: Hashable) -> int: ...
+    def clear(self) -> None: ...
+    def stats(self) -> CacheStats: ...
+
+
+class LRUTTLCache:
+    """In-process LRU cache with a per-entry TTL (thread-safe).
+
+    Entries expire ``ttl`` seconds after they were stored; when full, the least
+    recently used entry is dropped. Versions live in a separate dict.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL_SECONDS,
+    ) -> None:
+        if max_entries <= 0 or ttl <= 0:
+            raise ValueError("max_entries and ttl must be positive")
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._versions: dict[Hashable, int] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return MISS
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def version(self, key: Hashable) -> int:
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def bump(self, key: Hashable) -> int:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            return self._versions[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                size=len(self._entries),
+            )
+
+
+# Process-wide backend shared by all requests of this worker.
+default_cache: CacheBackend = LRUTTLCache()
@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Hashable, Iterable, Iterator
+
+from app.cache.backend import MISS, CacheBackend, default_cache
+from app.models.bulk import BulkUpdateResult, TaskChanges, TaskDraft
+from app.models.project import Project
+from app.models.query import (
+    ChangeMarker,
+    ProjectQuery,
+    ProjectRow,
+    TaskQuery,
+    TaskRow,
+)
+from app.models.task import Task
+
+
+def _project_key(project_id: int) -> tuple[str, int]:
+    return ("project", project_id)
+
+
+def _tasks_key(project_id: int) -> tuple[str, int]:
+    return ("tasks", project_id)
+
+
+class _CacheLayer:
+    """منطق مشترک CachedStorage و AsyncCachedStorage (کلیدها، نشانگرها، unit of work).
+
+    هر مقدار cache‌شده کلیدی دارد که وضعیت فعلی داده‌هایش جزء آن است، پس
+    مدخل‌های قدیمی دیگر خوانده نمی‌شوند تا با LRU/TTL بیرون بروند:
+
+    - لیست‌ها با همان change marker دیتابیس (project_list_marker/
+      task_list_marker) که ETag از آن ساخته می‌شود. نشانگر در هر درخواست یک
+      بار خوانده می‌شود و ETag و کلید cache هر دو از همان مقدار می‌آیند؛
+      نوشتن‌های workerهای دیگر، scheduler یا import هم نشانگر را عوض می‌کنند،
+      پس body کهنه هرگز زیر ETag تازه فرستاده نمی‌شود.
+    - get_project با شمارنده‌ی نسخه‌ی همین process (که نوشتن‌ها بالا می‌برند).
+
+    نشانگر/نسخه قبل از کوئری خوانده می‌شود، پس نتیجه‌ای که هم‌زمان با یک
+    نوشتن خوانده شده زیر کلید قدیمی ذخیره می‌شود و هرگز دیده نمی‌شود.
+
+    داخل unit of work، بعد از اولین نوشتن cache دور زده می‌شود (داده‌ی commit
+    نشده نباید cache شود) و در پایان بلوک نسخه‌های لمس‌شده دوباره بالا می‌روند
+    تا چیزی که دیگران بین نوشتن و commit خوانده‌اند هم باطل شود.
+    """
+
+    def __init__(self, inner: Any, backend: CacheBackend) -> None:
+        self._inner = inner
+        self._backend = backend
+        self._uow_depth = 0
+        self._dirty: set[Hashable] = set()
+        # نشانگرهای خوانده‌شده در همین درخواست (هر نوشتن پاکشان می‌کند)
+        self._markers: dict[Hashable, ChangeMarker] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # متدهای دیگر storage (export، existing_titles، ...) بدون cache
+        return getattr(self._inner, name)
+
+    # --- keys ----------------------------------------------------------
+    @staticmethod
+    def _projects_marker_key(query: ProjectQuery | None) -> Hashable:
+        return ("projects", query or ProjectQuery())
+
+    @staticmethod
+    def _tasks_marker_key(project_id: int) -> Hashable:
+        return ("tasks", project_id)
+
+    def _project_cache_key(self, project_id: int) -> Hashable:
+        return ("get_project", project_id, self._backend.version(_project_key(project_id)))
+
+    # --- lookups / invalidation ----------------------------------------
+    def _lookup(self, key: Hashable) -> Any:
+        if self._dirty:
+            return MISS
+        return self._backend.get(key)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if not self._dirty:
+            self._backend.set(key, value)
+
+    def _touch(self, *keys: Hashable) -> None:
+        self._markers.clear()
+        for key in keys:
+            self._backend.bump(key)
+        if self._uow_depth:
+            self._dirty.update(keys)
+
+    def _touch_project(self, project_id: int) -> None:
+        self._touch(_project_key(project_id))
+
+    def _touch_tasks(self, project_id: int) -> None:
+        self._touch(_tasks_key(project_id))
+
+    def _enter_uow(self) -> None:
+        self._uow_depth += 1
+
+    def _exit_uow(self) -> None:
+        self._uow_depth -= 1
+        if self._uow_depth == 0 and self._dirty:
+            for key in self._dirty:
+                self._backend.bump(key)
+            self._dirty.clear()
+
+
+class CachedStorage(_CacheLayer):
+    """Read-through cache در برابر ProjectStoragePort/TaskStoragePort (sync).
+
+    list_projects، get_project، list_tasks و نسخه‌های ردیفی لیست‌ها
+    (list_project_rows/list_task_rows) از cache خوانده می‌شوند؛ متدهای نوشتنی به
+    storage اصلی می‌روند و نسخه‌ی پروژه/تسک‌های مربوط را بالا می‌برند. لیست‌ها
+    قبل از cache یک بار change marker را از storage اصلی می‌خوانند.
+    """
+
+    def __init__(self, inner: Any, backend: CacheBackend = default_cache) -> None:
+        super().__init__(inner, backend)
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        self._enter_uow()
+        try:
+            with self._inner.unit_of_work():
+                yield
+        finally:
+            self._exit_uow()
+
+    def _cached(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        value = self._lookup(key)
+        if value is MISS:
+            value = load()
+            self._store(key, value)
+        return value
+
+    def _marker(self, key: Hashable, load: Callable[[], ChangeMarker]) -> ChangeMarker:
+        marker = self._markers.get(key)
+        if marker is None:
+            marker = self._markers[key] = load()
+        return marker
+
+    # --- markers (ETag) --------------------------------------------------
+    def project_list_marker(self, query: ProjectQuery | None = None) -> ChangeMarker:
+        return self._marker(
+            self._projects_marker_key(query),
+            lambda: self._inner.project_list_marker(query),
+        )
+
+    def task_list_marker(self, project_id: int) -> ChangeMarker:
+        return self._marker(
+            self._tasks_marker_key(project_id),
+            lambda: self._inner.task_list_marker(project_id),
+        )
+
+    # --- reads -----------------------------------------------------------
+    def list_projects(self, query: ProjectQuery | None = None) -> list[Project]:
+        marker = self.project_list_marker(query)
+        key = ("list_projects", marker, query or ProjectQuery())
+        return list(self._cached(key, lambda: list(self._inner.list_projects(query))))
+
+    def list_project_rows(self, query: ProjectQuery | None = None) -> list[ProjectRow]:
+        marker = self.project_list_marker(query)
+        key = ("list_project_rows", marker, query or ProjectQuery())
+        return list(self._cached(key, lambda: self._inner.list_project_rows(query)))
+
+    def get_project(self, project_id: int) -> Project:
+        key = self._project_cache_key(project_id)
+        return self._cached(key, lambda: self._inner.get_project(project_id))
+
+    def list_tasks(self, project_id: int, query: TaskQuery | None = None) -> list[Task]:
+        marker = self.task_list_marker(project_id)
+        key = ("list_tasks", project_id, marker, query or TaskQuery())
+        return list(
+            self._cached(key, lambda: list(self._inner.list_tasks(project_id, query)))
+        )
+
+    def list_task_rows(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[TaskRow]:
+        marker = self.task_list_marker(project_id)
+        key = ("list_task_rows", project_id, marker, query or TaskQuery())
+        return list(
+            self._cached(key, lambda: self._inner.list_task_rows(project_id, query))
+        )
+
+    # --- project writes --------------------------------------------------
+    def add_project(self, name: str, description: str) -> Project:
+        project = self._inner.add_project(name, description)
+        self._touch_project(project.id)
+        return project
+
+    def update_project(
+        self,
+        project_id: int,
+        name: str | None = None,
+        description: str | None = None,
+    ) -> Project:
+        project = self._inner.update_project(project_id, name, description)
+        self._touch_project(project_id)
+        return project
+
+    def remove_project(self, project_id: int) -> None:
+        self._inner.remove_project(project_id)
+        self._touch_project(project_id)
+        self._touch_tasks(project_id)
+
+    # --- task writes -----------------------------------------------------
+    def add_task(
+        self,
+        project_id: int,
+        title: str,
+        description: str,
+        deadline: str | None,
+    ) -> Task:
+        task = self._inner.add_task(project_id, title, description, deadline)
+        self._touch_tasks(project_id)
+        return task
+
+    def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]:
+        tasks = self._inner.add_tasks(project_id, drafts)
+        self._touch_tasks(project_id)
+        return tasks
+
+    def existing_titles(self, project_id: int, titles: Iterable[str]) -> set[str]:
+        # تصمیم نوشتنی است؛ همیشه از منبع اصلی
+        return self._inner.existing_titles(project_id, titles)
+
+    def edit_task(
+        self,
+        project_id: int,
+        task_id: int,
+        title: str | None = None,
+        description: str | None = None,
+        status: str | None = None,
+        deadline: str | None = None,
+    ) -> Task:
+        task = self._inner.edit_task(
+            project_id,
+            task_id,
+            title=title,
+            description=description,
+            status=status,
+            deadline=deadline,
+        )
+        self._touch_tasks(project_id)
+        return task
+
+    def change_task_status(self, project_id: int, task_id: int, status: str) -> Task:
+        task = self._inner.change_task_status(project_id, task_id, status)
+        self._touch_tasks(project_id)
+        return task
+
+    def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        result = self._inner.update_tasks(project_id, query, changes, returning=returning)
+        self._touch_tasks(project_id)
+        return result
+
+    def remove_task(self, project_id: int, task_id: int) -> None:
+        self._inner.remove_task(project_id, task_id)
+        self._touch_tasks(project_id)
+
+
+class AsyncCachedStorage(_CacheLayer):
+    """نسخه‌ی async از CachedStorage روی AsyncProjectStoragePort/AsyncTaskStoragePort."""
+
+    def __init__(self, inner: Any, backend: CacheBackend = default_cache) -> None:
+        super().__init__(inner, backend)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[None]:
+        self._enter_uow()
+        try:
+            async with self._inner.unit_of_work():
+                yield
+        finally:
+            self._exit_uow()
+
+    async def _cached(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        value = self._lookup(key)
+        if value is MISS:
+            value = await load()
+            self._store(key, value)
+        return value
+
+    async def _marker(self, key: Hashable, load: Callable[[], Any]) -> ChangeMarker:
+        marker = self._markers.get(key)
+        if marker is None:
+            marker = self._markers[key] = await load()
+        return marker
+
+    # --- markers (ETag) --------------------------------------------------
+    async def project_list_marker(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> ChangeMarker:
+        return await self._marker(
+            self._projects_marker_key(query),
+            lambda: self._inner.project_list_marker(query),
+        )
+
+    async def task_list_marker(self, project_id: int) -> ChangeMarker:
+        return await self._marker(
+            self._tasks_marker_key(project_id),
+            lambda: self._inner.task_list_marker(project_id),
+        )
+
+    # --- reads -----------------------------------------------------------
+    async def list_projects(self, query: ProjectQuery | None = None) -> list[Project]:
+        marker = await self.project_list_marker(query)
+        key = ("list_projects", marker, query or ProjectQuery())
+        return list(await self._cached(key, lambda: self._inner.list_projects(query)))
+
+    async def list_project_rows(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> list[ProjectRow]:
+        marker = await self.project_list_marker(query)
+        key = ("list_project_rows", marker, query or ProjectQuery())
+        return list(
+            await self._cached(key, lambda: self._inner.list_project_rows(query))
+        )
+
+    async def get_project(self, project_id: int) -> Project:
+        key = self._project_cache_key(project_id)
+        return await self._cached(key, lambda: self._inner.get_project(project_id))
+
+    async def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[Task]:
+        marker = await self.task_list_marker(project_id)
+        key = ("list_tasks", project_id, marker, query or TaskQuery())
+        return list(
+            await self._cached(key, lambda: self._inner.list_tasks(project_id, query))
+        )
+
+    async def list_task_rows(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[TaskRow]:
+        marker = await self.task_list_marker(project_id)
+        key = ("list_task_rows", project_id, marker, query or TaskQuery())
+        return list(
+            await self._cached(
+                key,
+                lambda: self._inner.list_task_rows(project_id, query),
+            )
+        )
+
+    # --- project writes --------------------------------------------------
+    async def add_project(self, name: str, description: str) -> Project:
+        project = await self._inner.add_project(name, description)
+        self._touch_project(project.id)
+        return project
+
+    async def update_project(
+        self,
+        project_id: int,
+        name: str | None = None,
+        description: str | None = None,
+    ) -> Project:
+        project = await self._inner.update_project(project_id, name, description)
+        self._touch_project(project_id)
+        return project
+
+    async def remove_project(self, project_id: int) -> None:
+        await self._inner.remove_project(project_id)
+        self._touch_project(project_id)
+        self._touch_tasks(project_id)
+
+    # --- task writes -----------------------------------------------------
+    async def add_task(
+        self,
+        project_id: int,
+        title: str,
+        description: str,
+        deadline: str | None,
+    ) -> Task:
+        task = await self._inner.add_task(project_id, title, description, deadline)
+        self._touch_tasks(project_id)
+        return task
+
+    async def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]:
+        tasks = await self._inner.add_tasks(project_id, drafts)
+        self._touch_tasks(project_id)
+        return tasks
+
+    async def existing_titles(self, project_id: int, titles: Iterable[str]) -> set[str]:
+        return await self._inner.existing_titles(project_id, titles)
+
+    async def edit_task(
+        self,
+        project_id: int,
+        task_id: int,
+        title: str | None = None,
+        description: str | None = None,
+        status: str | None = None,
+        deadline: str | None = None,
+    ) -> Task:
+        task = await self._inner.edit_task(
+            project_id,
+            task_id,
+            title=title,
+            description=description,
+            status=status,
+            deadline=deadline,
+        )
+        self._touch_tasks(project_id)
+        return task
+
+    async def change_task_status(
+        self,
+        project_id: int,
+        task_id: int,
+        status: str,
+    ) -> Task:
+        task = await self._inner.change_task_status(project_id, task_id, status)
+        self._touch_tasks(project_id)
+        return task
+
+    async def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        result = await self._inner.update_tasks(
+            project_id,
+            query,
+            changes,
+            returning=returning,
+        )
+        self._touch_tasks(project_id)
+        return result
+
+    async def remove_task(self, project_id: int, task_id: int) -> None:
+        await self._inner.remove_task(project_id, task_id)
+        self._touch_tasks(project_id)
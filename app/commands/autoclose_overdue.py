@@ -1,42 +1,108 @@
 from __future__ import annotations
 
+import os
+import time
+from dataclasses import dataclass
 from datetime import date, datetime
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.db.session import SessionLocal
 from app.models.orm import TaskORM
 
 
-def run() -> int:
-    """بستن خودکار تسک‌های دیرکرددار در دیتابیس.
-    همه تسک‌هایی که deadline < today و status != 'done' هستند را
-    به حالت 'done' می‌برد و at_closed را تنظیم می‌کند.
-    تعداد تسک‌های بسته شده را برمی‌گرداند.
+# تعداد ردیف‌هایی که در هر UPDATE بسته می‌شوند؛ قفل‌ها فقط روی همین تعداد نگه داشته می‌شوند.
+BATCH_SIZE = int(os.getenv("AUTOCLOSE_BATCH_SIZE", "1000"))
+# مکث اختیاری بین دو batch (ثانیه) تا بار دیتابیس پخش شود.
+THROTTLE_SECONDS = float(os.getenv("AUTOCLOSE_THROTTLE_SECONDS", "0"))
+
+
+@dataclass(slots=True)
+class AutoCloseReport:
+    """Per-run summary of the overdue auto-close job."""
+
+    closed: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.closed} overdue tasks closed in {self.batches} batch(es), "
+            f"{self.elapsed:.3f}s"
+        )
+
+
+def close_overdue(
+    *,
+    today: date | None = None,
+    batch_size: int = BATCH_SIZE,
+    throttle: float = THROTTLE_SECONDS,
+) -> AutoCloseReport:
+    """بستن تسک‌های دیرکرددار با UPDATE ... RETURNING به صورت batch.
+
+    هر batch حداکثر ``batch_size`` تسک با deadline < today و status != 'done'
+    را در یک UPDATE به 'done' می‌برد و جداگانه commit می‌شود، پس هیچ ORM
+    object‌ای در session بار نمی‌شود و قفل ردیف‌ها کوتاه می‌ماند.
+
+    :param today: تاریخ مرجع (پیش‌فرض: امروز)
+    :param batch_size: حداکثر تعداد ردیف در هر UPDATE
+    :param throttle: مکث (ثانیه) بین batchها؛ 0 یعنی بدون مکث
+    :return: گزارش تعداد ردیف‌ها، batchها و زمان صرف‌شده
+    :raises ValueError: اگر batch_size مثبت نباشد
     """
-    today = date.today()
-    closed_count = 0
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    today = today or date.today()
+    report = AutoCloseReport()
+    started = time.perf_counter()
+
+    overdue_ids = (
+        select(TaskORM.id)
+        .where(
+            TaskORM.deadline < today,
+            TaskORM.status != "done",
+        )
+        .order_by(TaskORM.id)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
 
-    # SessionLocal را از app/db/session.py می‌گیریم
     with SessionLocal() as session:
-        stmt = (
-            select(TaskORM)
-            .where(
-                TaskORM.deadline < today,
-                TaskORM.status != "done",
+        while True:
+            stmt = (
+                update(TaskORM)
+                .where(TaskORM.id.in_(overdue_ids))
+                .values(status="done", at_closed=datetime.utcnow())
+                .returning(TaskORM.id)
+                .execution_options(synchronize_session=False)
             )
-        )
+            closed_ids = session.scalars(stmt).all()
+            session.commit()
+
+            if not closed_ids:
+                break
+
+            report.closed += len(closed_ids)
+            report.batches += 1
+
+            if len(closed_ids) < batch_size:
+                break
+            if throttle > 0:
+                time.sleep(throttle)
 
-        for task in session.scalars(stmt):
-            task.status = "done"
-            task.at_closed = datetime.utcnow()
-            closed_count += 1
+    report.elapsed = time.perf_counter() - started
+    return report
 
-        session.commit()
 
-    return closed_count
+def run() -> int:
+    """بستن خودکار تسک‌های دیرکرددار در دیتابیس.
+    همه تسک‌هایی که deadline < today و status != 'done' هستند را
+    به حالت 'done' می‌برد و at_closed را تنظیم می‌کند.
+    تعداد تسک‌های بسته شده را برمی‌گرداند.
+    """
+    return close_overdue().closed
 
 
 if __name__ == "__main__":
-    count = run()
-    print(f"{count} overdue tasks closed.")
+    print(close_overdue())
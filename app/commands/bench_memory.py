@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable
+
+from app.models.task import Status
+from todo.storage.memory_storage import InMemoryStorage
+
+
+def _timed(label: str, count: int, run: Callable[[], None]) -> None:
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(f"[bench] {count} {label}: {elapsed * 1000:.0f} ms")
+
+
+def run_benchmark(*, tasks: int, projects: int, operations: int, seed: int) -> None:
+    """عملیات تک‌تسکی InMemoryStorage روی پروژه‌های بزرگ، مثل بنچمارک ایندکس‌ها."""
+    rng = random.Random(seed)
+    storage = InMemoryStorage(project_max=projects, task_max=tasks)
+    project_ids = [storage.add_project(f"p{i}", "bench").id for i in range(projects)]
+    task_ids: dict[int, list[int]] = {project_id: [] for project_id in project_ids}
+
+    def add() -> None:
+        for i in range(tasks):
+            project_id = project_ids[i % projects]
+            task = storage.add_task(project_id, f"task {i}", "bench", None)
+            task_ids[project_id].append(task.id)
+
+    def picks(n: int) -> list[tuple[int, int]]:
+        chosen = []
+        for _ in range(n):
+            project_id = rng.choice(project_ids)
+            chosen.append((project_id, rng.choice(task_ids[project_id])))
+        return chosen
+
+    def change_status() -> None:
+        for project_id, task_id in picks(operations):
+            storage.change_task_status(project_id, task_id, Status.DOING.value)
+
+    def edit_titles() -> None:
+        for n, (project_id, task_id) in enumerate(picks(operations)):
+            storage.edit_task(project_id, task_id, title=f"edited {n}")
+
+    def existing_titles() -> None:
+        for _ in range(operations // 10):
+            project_id = rng.choice(project_ids)
+            titles = [f"task {rng.randrange(tasks)}" for _ in range(50)]
+            storage.existing_titles(project_id, titles)
+
+    def remove() -> None:
+        # distinct tasks, so every call removes one
+        for project_id in project_ids:
+            rng.shuffle(task_ids[project_id])
+        for n in range(operations):
+            project_id = project_ids[n % projects]
+            storage.remove_task(project_id, task_ids[project_id].pop())
+
+    print(f"[bench] {tasks} tasks over {projects} projects")
+    _timed("add_task", tasks, add)
+    _timed("change_task_status", operations, change_status)
+    _timed("title edits", operations, edit_titles)
+    _timed("existing_titles(50)", operations // 10, existing_titles)
+    _timed("remove_task", operations, remove)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.commands.bench_memory",
+        description=(
+            "Time InMemoryStorage add/status/edit/title-check/remove calls on "
+            "large projects (the id and title indexes)."
+        ),
+    )
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument(
+        "--operations", type=int, default=2000,
+        help="status changes, title edits and removals (existing_titles: a tenth)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    run_benchmark(
+        tasks=args.tasks,
+        projects=args.projects,
+        operations=args.operations,
+        seed=args.seed,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from app.models.bulk import TaskDraft
+from todo.storage.memory_storage import InMemoryStorage
+from todo.storage.persistence import MemoryPersistence
+from todo.storage.wal import list_segments
+
+
+@dataclass(slots=True)
+class WriteResult:
+    """Throughput of one write phase."""
+
+    tasks: int
+    elapsed: float
+    fsyncs: int = 0
+    log_bytes: int = 0
+
+    def __str__(self) -> str:
+        rate = self.tasks / self.elapsed if self.elapsed else 0.0
+        text = f"{self.tasks} tasks in {self.elapsed:.2f}s ({rate / 1000:.1f}k/s)"
+        if self.fsyncs:
+            text += f", {self.fsyncs} fsyncs, {self.log_bytes / 1e6:.1f} MB log"
+        return text
+
+
+def _run_threads(threads: int, work: Callable[[int], None]) -> float:
+    """``work(n)`` for n in range(threads), all started together; seconds taken."""
+    barrier = threading.Barrier(threads + 1)
+
+    def run(n: int) -> None:
+        barrier.wait()
+        work(n)
+
+    workers = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def _batch_writes(
+    storage: InMemoryStorage,
+    project_ids: list[int],
+    *,
+    tasks: int,
+    threads: int,
+    batch: int,
+) -> float:
+    """``tasks`` tasks through add_tasks in batches of ``batch``, spread over the projects."""
+    batches = tasks // batch
+
+    def work(n: int) -> None:
+        for b in range(n, batches, threads):
+            project_id = project_ids[b % len(project_ids)]
+            storage.add_tasks(
+                project_id,
+                [TaskDraft(f"b{b}-{i}", "benchmark task", None) for i in range(batch)],
+            )
+
+    return _run_threads(threads, work)
+
+
+def _single_writes(
+    storage: InMemoryStorage,
+    project_ids: list[int],
+    *,
+    writes: int,
+    threads: int,
+) -> float:
+    def work(n: int) -> None:
+        for i in range(n, writes, threads):
+            project_id = project_ids[i % len(project_ids)]
+            storage.add_task(project_id, f"s{i}", "benchmark task", None)
+
+    return _run_threads(threads, work)
+
+
+def _log_bytes(directory: Path) -> int:
+    return sum(path.stat().st_size for _, path in list_segments(directory))
+
+
+def run_benchmark(
+    *,
+    tasks: int,
+    projects: int,
+    threads: int,
+    batch: int,
+    writes: int,
+    fsync: bool,
+    directory: Path,
+) -> None:
+    options = {"project_max": projects, "task_max": tasks + writes}
+
+    def new_projects(storage: InMemoryStorage) -> list[int]:
+        return [storage.add_project(f"p{i}", "bench").id for i in range(projects)]
+
+    # 1. add_tasks, without and with the log
+    storage = InMemoryStorage(**options)
+    ids = new_projects(storage)
+    plain = WriteResult(
+        tasks, _batch_writes(storage, ids, tasks=tasks, threads=threads, batch=batch)
+    )
+    print(f"[bench] add_tasks x{batch}, no log:   {plain}")
+    del storage
+
+    bulk_dir = directory / "bulk"
+    persistence = MemoryPersistence(bulk_dir, fsync=fsync, snapshot_seconds=0)
+    storage = persistence.open(**options)
+    ids = new_projects(storage)
+    elapsed = _batch_writes(storage, ids, tasks=tasks, threads=threads, batch=batch)
+    logged = WriteResult(tasks, elapsed, storage._wal.fsyncs, _log_bytes(bulk_dir))
+    print(f"[bench] add_tasks x{batch}, with log: {logged}")
+    persistence.close(checkpoint=False)
+    del storage
+
+    # 2. restart: the log alone, then the snapshot written after that replay
+    persistence = MemoryPersistence(bulk_dir, fsync=fsync, snapshot_seconds=0)
+    persistence.open(**options)
+    print(f"[bench] restart from the log: {persistence.recovery}")
+    print(f"[bench] snapshot: {persistence.last_checkpoint}")
+    persistence.close(checkpoint=False)
+
+    persistence = MemoryPersistence(bulk_dir, fsync=fsync, snapshot_seconds=0)
+    persistence.open(**options)
+    print(f"[bench] restart from the snapshot: {persistence.recovery}")
+    persistence.close(checkpoint=False)
+    del persistence
+
+    # 3. single add_task, without and with the log (group commit)
+    storage = InMemoryStorage(**options)
+    ids = new_projects(storage)
+    single = WriteResult(
+        writes, _single_writes(storage, ids, writes=writes, threads=threads)
+    )
+    print(f"[bench] add_task, no log:   {single}")
+    del storage
+
+    single_dir = directory / "single"
+    persistence = MemoryPersistence(single_dir, fsync=fsync, snapshot_seconds=0)
+    storage = persistence.open(**options)
+    ids = new_projects(storage)
+    elapsed = _single_writes(storage, ids, writes=writes, threads=threads)
+    single_logged = WriteResult(
+        writes, elapsed, storage._wal.fsyncs, _log_bytes(single_dir)
+    )
+    print(f"[bench] add_task, with log: {single_logged}")
+    persistence.close(checkpoint=False)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.commands.bench_persistence",
+        description=(
+            "Measure InMemoryStorage write throughput with and without the "
+            "write-ahead log, restart time from the log and from a snapshot, "
+            "and snapshot time."
+        ),
+    )
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="via add_tasks")
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=100, help="tasks per add_tasks")
+    parser.add_argument("--writes", type=int, default=20_000, help="single add_task calls")
+    parser.add_argument(
+        "--no-fsync",
+        action="store_true",
+        help="like MEMORY_WAL_FSYNC=0 (survives process crashes only)",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="where to write the log and snapshots (default: a temp directory, removed)",
+    )
+    args = parser.parse_args(argv)
+
+    directory = args.data_dir or Path(tempfile.mkdtemp(prefix="todolist-bench-"))
+    try:
+        run_benchmark(
+            tasks=args.tasks,
+            projects=args.projects,
+            threads=args.threads,
+            batch=args.batch,
+            writes=args.writes,
+            fsync=not args.no_fsync,
+            directory=directory,
+        )
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Iterable
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api.schemas.response.task_response_schema import (
+    TaskResponse,
+    dump_task_rows,
+)
+from app.db.base import Base
+from app.models import orm  # noqa: F401  (registers the tables)
+from app.models.bulk import TaskChanges, TaskDraft
+from app.models.query import (
+    TaskQuery,
+    TaskSort,
+    task_row_sort_key,
+    task_sort_key,
+)
+from app.models.task import Status, Task
+from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
+
+
+# مسیر قبلی route: Task → TaskResponse، اعتبارسنجی response_model، JSONResponse
+_TASK_LIST_ADAPTER = TypeAdapter(list[TaskResponse])
+
+PAGE_SIZE = 100
+
+
+def pydantic_body(tasks: Iterable[Task]) -> bytes:
+    """بدنه‌ی JSON همان‌طور که route پیش از مسیر سریع می‌ساخت."""
+    models = [TaskResponse.model_validate(task) for task in tasks]
+    content = _TASK_LIST_ADAPTER.dump_python(
+        _TASK_LIST_ADAPTER.validate_python(models), mode="json"
+    )
+    return JSONResponse(content).render(content)
+
+
+def seed(storage: SqlAlchemyStorage, rows: int) -> int:
+    """یک پروژه با ``rows`` تسک: یونیکد، کاراکتر کنترلی، نقل‌قول، done و بدون deadline."""
+    project = storage.add_project(f"bench-{time.time_ns()}", "bench")
+    first_day = date.today() + timedelta(days=1)
+    drafts = [
+        TaskDraft(
+            title=f"تسک {i} \"quoted\" ✓",
+            description=f"line\u0001{i}\n\ttab \\ back\\slash   😀",
+            deadline=(
+                None if i % 3 == 0
+                else (first_day + timedelta(days=i % 90)).isoformat()
+            ),
+        )
+        for i in range(rows)
+    ]
+    ids = []
+    for start in range(0, rows, 1000):
+        ids += [t.id for t in storage.add_tasks(project.id, drafts[start:start + 1000])]
+    for status, picked in ((Status.DONE, ids[::4]), (Status.DOING, ids[1::4])):
+        for start in range(0, len(picked), 1000):
+            storage.update_tasks(
+                project.id,
+                TaskQuery(ids=tuple(picked[start:start + 1000])),
+                TaskChanges(status=status),
+            )
+    return project.id
+
+
+def check_identical(storage: SqlAlchemyStorage, project_id: int) -> list[str]:
+    """هر صفحه‌ی هر ترکیب sort/status در دو مسیر باید بایت‌به‌بایت برابر باشد."""
+    errors = []
+    for sort in TaskSort:
+        for status in (None, Status.DONE, Status.TODO):
+            after = None
+            page = 0
+            while True:
+                query = TaskQuery(limit=PAGE_SIZE, after=after, sort=sort, status=status)
+                tasks = list(storage.list_tasks(project_id, query))
+                rows = storage.list_task_rows(project_id, query)
+                if pydantic_body(tasks) != dump_task_rows(rows):
+                    errors.append(f"sort={sort.value} status={status} page {page} differs")
+                if len(tasks) < PAGE_SIZE:
+                    break
+                after = task_sort_key(tasks[-1], sort)
+                if task_row_sort_key(rows[-1], sort) != after:
+                    errors.append(f"sort={sort.value} status={status}: cursors differ")
+                    break
+                page += 1
+    return errors
+
+
+def _best_of(repeat: int, run: Callable[[], bytes]) -> tuple[float, bytes]:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = run()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def run_benchmark(database_url: str, *, rows: int, repeat: int) -> int:
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        storage = SqlAlchemyStorage(session)
+        project_id = seed(storage, rows)
+        try:
+            errors = check_identical(storage, project_id)
+            for error in errors:
+                print(f"[bench] {error}", file=sys.stderr)
+            print(f"[bench] paged bodies identical: {'no' if errors else 'yes'}")
+
+            query = TaskQuery()
+            before, old = _best_of(
+                repeat, lambda: pydantic_body(storage.list_tasks(project_id, query))
+            )
+            after, new = _best_of(
+                repeat,
+                lambda: dump_task_rows(storage.list_task_rows(project_id, query)),
+            )
+            if old != new:
+                errors.append("full listing differs")
+                print("[bench] full listing differs", file=sys.stderr)
+            print(
+                f"[bench] {rows} rows, {len(new)} bytes, best of {repeat}: "
+                f"pydantic {before * 1000:.0f} ms, rows {after * 1000:.0f} ms "
+                f"({before / after:.1f}x)"
+            )
+        finally:
+            storage.remove_project(project_id)
+    engine.dispose()
+    return 1 if errors else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.commands.bench_serialization",
+        description=(
+            "Compare the task listing's row/TypeAdapter serialization with the "
+            "Task/TaskResponse path: check the JSON bodies are byte-identical "
+            "and time both end to end."
+        ),
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument(
+        "--database-url",
+        help="sync SQLAlchemy URL (default: a temporary SQLite file); "
+        "a scratch project is created and removed",
+    )
+    args = parser.parse_args(argv)
+
+    directory = None
+    url = args.database_url
+    if url is None:
+        directory = Path(tempfile.mkdtemp(prefix="todolist-bench-"))
+        url = f"sqlite:///{directory / 'bench.db'}"
+    try:
+        return run_benchmark(url, rows=args.rows, repeat=args.repeat)
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator, Mapping, TextIO
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.exceptions.base import TaskError, ValidationError
+from app.models.orm import ProjectORM, TaskORM
+from app.models.task import Status, Task, normalize_title
+from app.services.export_service import ExportFormat
+
+
+# تعداد ردیف‌هایی که با هم validate، چک یکتایی و COPY می‌شوند (هر chunk یک commit)
+CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+# تعداد processهای validate (پیش‌فرض: تعداد هسته‌ها)
+WORKERS = int(os.getenv("IMPORT_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# ستون‌هایی که در staging و سپس tasks نوشته می‌شوند (ترتیب tupleهای Record)
+_COLUMNS = (
+    "project_id",
+    "title",
+    "description",
+    "status",
+    "deadline",
+    "at_closed",
+    "created_at",
+)
+_STAGING_TABLE = "tasks_import"
+
+# (project_id, title, description, status, deadline, at_closed, created_at)
+Record = tuple[Any, ...]
+
+
+@dataclass(slots=True)
+class Rejected:
+    """One input row that was not imported (``row``: the raw line if it did not parse)."""
+
+    line: int
+    reason: str
+    row: dict[str, Any] | str
+
+
+@dataclass(slots=True)
+class _Malformed:
+    """An NDJSON line that is not valid JSON; it keeps its place in the row order."""
+
+    reason: str
+    raw: str
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """Per-run summary of a bulk task import."""
+
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.imported}/{self.read} tasks imported, {self.rejected} rejected, "
+            f"{self.chunks} chunk(s) in {self.elapsed:.3f}s "
+            f"({self.rows_per_second:.0f} rows/s)"
+        )
+
+
+@dataclass(slots=True)
+class _ChunkResult:
+    records: list[tuple[int, Record]] = field(default_factory=list)
+    rejected: list[Rejected] = field(default_factory=list)
+
+
+# --------------------------
+# Reading (stream)
+# --------------------------
+def _read_rows(src: TextIO, fmt: ExportFormat) -> Iterator[Any]:
+    """ردیف‌های ورودی؛ خط JSON خراب به جای توقف import به صورت _Malformed می‌آید."""
+    if fmt is ExportFormat.CSV:
+        yield from csv.DictReader(src)
+        return
+    for raw in src:
+        if not raw.strip():
+            continue
+        try:
+            yield json.loads(raw)
+        except json.JSONDecodeError as exc:
+            yield _Malformed(reason=f"invalid JSON: {exc}", raw=raw.rstrip("\r\n"))
+
+
+def _chunks(
+    rows: Iterable[Any],
+    size: int,
+) -> Iterator[tuple[int, list[Any]]]:
+    """(شماره‌ی اولین ردیف، ردیف‌ها) برای هر chunk؛ شماره‌ها از 1."""
+    iterator = iter(rows)
+    first = 1
+    while chunk := list(islice(iterator, size)):
+        yield first, chunk
+        first += len(chunk)
+
+
+# --------------------------
+# Validation (worker processes)
+# --------------------------
+def _parse_datetime(raw: Any) -> datetime | None:
+    if raw in (None, ""):
+        return None
+    return datetime.fromisoformat(raw)
+
+
+def _validate_row(row: Mapping[str, Any]) -> Record:
+    """قوانین دامنه‌ی Task روی یک ردیف ورودی؛ در صورت خطا ValueError/ValidationError."""
+    try:
+        project_id = int(row["project_id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValidationError("project_id must be an integer") from exc
+
+    deadline = row.get("deadline") or None
+    if deadline is not None:
+        try:
+            deadline = datetime.strptime(deadline, "%Y-%m-%d").date()
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(
+                "deadline must be in YYYY-MM-DD format and a valid date"
+            ) from exc
+
+    task = Task(
+        id=0,
+        title=row.get("title") or "",
+        description=row.get("description") or "",
+        status=row.get("status") or Status.TODO,
+        deadline=deadline,
+        at_closed=_parse_datetime(row.get("at_closed")),
+    )
+    # همان منطق at_closed دامنه: done بدون at_closed → الان
+    task.change_status(task.status)
+
+    created_at = _parse_datetime(row.get("created_at")) or datetime.utcnow()
+    return (
+        project_id,
+        task.title,
+        task.description,
+        task.status.value,
+        task.deadline,
+        task.at_closed,
+        created_at,
+    )
+
+
+def _validate_chunk(first_line: int, rows: list[Any]) -> _ChunkResult:
+    """هر ردیف یا Record می‌شود یا Rejected؛ هیچ ردیفی کل import را متوقف نمی‌کند."""
+    result = _ChunkResult()
+    for line, row in enumerate(rows, start=first_line):
+        if isinstance(row, _Malformed):
+            result.rejected.append(Rejected(line=line, reason=row.reason, row=row.raw))
+            continue
+        if not isinstance(row, dict):
+            result.rejected.append(
+                Rejected(line=line, reason="row must be a JSON object", row=str(row))
+            )
+            continue
+        try:
+            result.records.append((line, _validate_row(row)))
+        # TaskError: ValidationError/InvalidStatusError؛ Type/AttributeError:
+        # مقدار با نوع اشتباه (مثلاً title عددی یا at_closed غیر رشته‌ای)
+        except (TaskError, ValueError, TypeError, AttributeError) as exc:
+            result.rejected.append(Rejected(line=line, reason=str(exc), row=row))
+    return result
+
+
+def _validated(
+    chunks: Iterable[tuple[int, list[Any]]],
+    workers: int,
+) -> Iterator[_ChunkResult]:
+    """validate موازی chunkها با حفظ ترتیب.
+
+    حداکثر ``2 * workers`` chunk در صف است تا خواندن ورودی از validate جلو
+    نزند و حافظه ثابت بماند (executor.map کل ورودی را یک‌جا submit می‌کند).
+    """
+    if workers <= 1:
+        for first, rows in chunks:
+            yield _validate_chunk(first, rows)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[_ChunkResult]] = deque()
+        for first, rows in chunks:
+            pending.append(pool.submit(_validate_chunk, first, rows))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# --------------------------
+# Duplicate index
+# --------------------------
+class _TitleIndex:
+    """ایندکس (project_id → عنوان‌های نرمال‌شده) برای چک یکتایی بدون اسکن.
+
+    عنوان‌های هر پروژه فقط بار اولی که در ورودی دیده می‌شود با یک کوئری
+    خوانده می‌شوند؛ ردیف‌های پذیرفته‌شده‌ی همین import هم به آن اضافه می‌شوند.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+        self._titles: dict[int, set[str]] = {}
+        self._missing: set[int] = set()
+
+    def _load(self, project_ids: set[int]) -> None:
+        new_ids = project_ids - self._titles.keys() - self._missing
+        if not new_ids:
+            return
+        found = set(
+            self._session.scalars(
+                select(ProjectORM.id).where(ProjectORM.id.in_(new_ids))
+            )
+        )
+        self._missing |= new_ids - found
+        for project_id in found:
+            self._titles[project_id] = set()
+        rows = self._session.execute(
+            select(TaskORM.project_id, func.lower(func.trim(TaskORM.title))).where(
+                TaskORM.project_id.in_(found)
+            )
+        )
+        for project_id, key in rows:
+            self._titles[project_id].add(key)
+
+    def admit(
+        self,
+        records: list[tuple[int, Record]],
+        rejected: list[Rejected],
+    ) -> list[tuple[int, Record]]:
+        self._load({record[0] for _, record in records})
+        accepted: list[tuple[int, Record]] = []
+        for line, record in records:
+            project_id, title = record[0], record[1]
+            if project_id in self._missing:
+                reason = f"project {project_id} not found"
+            elif (key := normalize_title(title)) in self._titles[project_id]:
+                reason = f"task title '{title}' already exists in project {project_id}"
+            else:
+                self._titles[project_id].add(key)
+                accepted.append((line, record))
+                continue
+            rejected.append(_rejected_record(line, reason, record))
+        return accepted
+
+
+def _rejected_record(line: int, reason: str, record: Record) -> Rejected:
+    return Rejected(line=line, reason=reason, row=dict(zip(_COLUMNS, record)))
+
+
+# --------------------------
+# Loading
+# --------------------------
+def _create_staging(session: Session) -> None:
+    session.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} "
+            "ON COMMIT DELETE ROWS "
+            f"AS SELECT {', '.join(_COLUMNS)} FROM tasks WITH NO DATA"
+        )
+    )
+
+
+def _copy_and_insert(
+    session: Session, records: list[tuple[int, Record]]
+) -> list[tuple[int, Record]]:
+    """COPY به staging و سپس یک INSERT ... SELECT به tasks (PostgreSQL).
+
+    ON CONFLICT DO NOTHING ردیف‌هایی را که هم‌زمان (بعد از ساخت ایندکس) در
+    دیتابیس ساخته شده‌اند رد می‌کند؛ RETURNING ردیف‌های درج‌شده را می‌دهد و
+    خروجی ردیف‌هایی است که درج نشدند (تا در rejects هم نوشته شوند).
+    """
+    columns = ", ".join(_COLUMNS)
+    dbapi_conn = session.connection().connection.driver_connection
+    with dbapi_conn.cursor() as cursor:
+        with cursor.copy(f"COPY {_STAGING_TABLE} ({columns}) FROM STDIN") as copy:
+            for _, record in records:
+                copy.write_row(record)
+
+    # updated_at (مبنای ETag) مقدار پیش‌فرض سمت دیتابیس ندارد؛ مثل default در ORM
+    inserted = set(
+        session.execute(
+            text(
+                f"INSERT INTO tasks ({columns}, updated_at) "
+                f"SELECT {columns}, :now FROM {_STAGING_TABLE} "
+                "ON CONFLICT DO NOTHING "
+                "RETURNING project_id, title"
+            ),
+            {"now": datetime.utcnow()},
+        ).tuples()
+    )
+    # (project_id, title) در یک chunk یکتاست (_TitleIndex تکراری‌ها را رد کرده)
+    return [(line, r) for line, r in records if (r[0], r[1]) not in inserted]
+
+
+def _insert_many(
+    session: Session, records: list[tuple[int, Record]]
+) -> list[tuple[int, Record]]:
+    """جایگزین COPY برای دیتابیس‌های غیر PostgreSQL (مثلاً sqlite محلی)."""
+    session.execute(insert(TaskORM), [dict(zip(_COLUMNS, r)) for _, r in records])
+    return []
+
+
+def import_tasks(
+    src: TextIO,
+    *,
+    fmt: ExportFormat = ExportFormat.NDJSON,
+    chunk_size: int = CHUNK_SIZE,
+    workers: int = WORKERS,
+    rejects: TextIO | None = None,
+) -> ImportReport:
+    """وارد کردن تسک‌ها از CSV/NDJSON (همان قالب export) به صورت stream.
+
+    ورودی chunk به chunk خوانده می‌شود، هر chunk در یک process pool با قوانین
+    Task ولیدیت می‌شود، یکتایی عنوان با یک ایندکس در حافظه چک می‌شود و
+    ردیف‌های سالم با COPY + INSERT ... SELECT در یک تراکنش برای هر chunk
+    درج می‌شوند.
+
+    :param rejects: اگر داده شود، ردیف‌های ردشده به صورت NDJSON
+        (``line``، ``reason``، ``row``) در آن نوشته می‌شوند
+    :raises ValueError: اگر chunk_size یا workers مثبت نباشد
+    """
+    if chunk_size <= 0 or workers <= 0:
+        raise ValueError("chunk_size and workers must be positive")
+
+    report = ImportReport()
+    started = time.perf_counter()
+
+    with SessionLocal() as session:
+        use_copy = session.get_bind().dialect.name == "postgresql"
+        if use_copy:
+            _create_staging(session)
+        index = _TitleIndex(session)
+
+        def chunks() -> Iterator[tuple[int, list[Any]]]:
+            for first, rows in _chunks(_read_rows(src, fmt), chunk_size):
+                report.read += len(rows)
+                yield first, rows
+
+        for result in _validated(chunks(), workers):
+            rejected = list(result.rejected)
+            accepted = index.admit(result.records, rejected)
+
+            if accepted:
+                load = _copy_and_insert if use_copy else _insert_many
+                skipped = load(session, accepted)
+                session.commit()
+                report.imported += len(accepted) - len(skipped)
+                rejected.extend(
+                    _rejected_record(
+                        line,
+                        f"task title '{record[1]}' was created concurrently "
+                        f"in project {record[0]}",
+                        record,
+                    )
+                    for line, record in skipped
+                )
+
+            report.rejected += len(rejected)
+            report.chunks += 1
+            if rejects is not None:
+                for item in rejected:
+                    rejects.write(
+                        json.dumps(
+                            {"line": item.line, "reason": item.reason, "row": item.row},
+                            default=str,
+                            ensure_ascii=False,
+                        )
+                        + "\n"
+                    )
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.commands.import_tasks",
+        description="Bulk-import tasks from CSV or NDJSON (the export format).",
+    )
+    parser.add_argument("input", help="input file ('-' for stdin)")
+    parser.add_argument(
+        "--format",
+        choices=[f.value for f in ExportFormat],
+        help="input format (default: from the file extension, else ndjson)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--rejects", help="write rejected rows (NDJSON) to this file")
+    args = parser.parse_args(argv)
+
+    if args.format:
+        fmt = ExportFormat(args.format)
+    else:
+        fmt = ExportFormat.CSV if args.input.endswith(".csv") else ExportFormat.NDJSON
+
+    src = (
+        sys.stdin
+        if args.input == "-"
+        else open(args.input, encoding="utf-8", newline="")
+    )
+    rejects = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+    try:
+        report = import_tasks(
+            src,
+            fmt=fmt,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            rejects=rejects,
+        )
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if rejects is not None:
+            rejects.close()
+
+    print(f"[import] {report}", file=sys.stderr)
+    return 0 if report.rejected == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,259 @@
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
 import time
-import schedule
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import ContextManager, Iterator, Protocol
+
+from sqlalchemy import Engine, func, select
+
+from app.commands.autoclose_overdue import AutoCloseReport, close_overdue
+from app.db.session import SessionLocal, engine
+from app.models.orm import SchedulerRunORM
+
+try:  # POSIX only; the file lock is the stand-in for non-PostgreSQL databases
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+JOB = "autoclose_overdue"
+# کلید advisory lock در PostgreSQL (bigint)؛ از نام job ساخته می‌شود تا ثابت بماند
+LOCK_KEY = zlib.crc32(f"todolist:{JOB}".encode())
+# وقتی دیتابیس PostgreSQL نیست: قفل فایل محلی (همه‌ی نمونه‌ها روی یک میزبان)
+LOCK_FILE = os.getenv(
+    "SCHEDULER_LOCK_FILE",
+    os.path.join(tempfile.gettempdir(), f"todolist-{JOB}.lock"),
+)
+# چند ثانیه بعد از نیمه‌شب بیدار شود (ساعت‌ها/تایمرها دقیق نیستند)
+GRACE_SECONDS = float(os.getenv("SCHEDULER_GRACE_SECONDS", "1"))
+# اگر یک دور خطا بدهد (مثلاً دیتابیس در دسترس نیست) بعد از این مدت دوباره، نه فردا
+RETRY_SECONDS = float(os.getenv("SCHEDULER_RETRY_SECONDS", "60"))
+# خواب طولانی تکه‌تکه است تا جابه‌جایی ساعت سیستم (NTP، suspend) دیده شود
+MAX_NAP_SECONDS = 3600.0
+
+
+class RunLock(Protocol):
+    """Held by the one instance that runs a cycle; the others skip it."""
+
+    def hold(self) -> ContextManager[bool]:
+        """Try to take the lock without waiting; yields whether it was taken."""
+        ...
+
+
+class AdvisoryLock:
+    """PostgreSQL session-level advisory lock on a dedicated connection.
+
+    The server drops it if the holder dies (connection closed), so a crashed
+    instance never blocks the others.
+    """
+
+    def __init__(self, bind: Engine, key: int = LOCK_KEY) -> None:
+        self._engine = bind
+        self._key = key
+
+    @contextmanager
+    def hold(self) -> Iterator[bool]:
+        with self._engine.connect() as conn:
+            acquired = bool(conn.scalar(select(func.pg_try_advisory_lock(self._key))))
+            # don't sit "idle in transaction" while the job runs
+            conn.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(select(func.pg_advisory_unlock(self._key)))
+                    conn.commit()
+
+
+class FileLock:
+    """Local-file stand-in for the advisory lock (flock, same host only)."""
+
+    def __init__(self, path: str | Path = LOCK_FILE) -> None:
+        self._path = Path(path)
+
+    @contextmanager
+    def hold(self) -> Iterator[bool]:
+        if fcntl is None:
+            raise RuntimeError("file locks need fcntl (POSIX); use PostgreSQL")
+        with open(self._path, "a+") as file:
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                # only for whoever looks at the file: which instance holds it
+                file.truncate(0)
+                file.write(f"{_instance()}\n")
+                file.flush()
+                yield True
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def default_lock(bind: Engine = engine) -> RunLock:
+    """Advisory lock on PostgreSQL, the local file lock on anything else."""
+    if bind.dialect.name == "postgresql":
+        return AdvisoryLock(bind)
+    return FileLock()
+
+
+def _instance() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass(slots=True)
+class CycleResult:
+    """What one cycle did: ran the job (with its report) or why it skipped."""
+
+    cycle: date
+    report: AutoCloseReport | None = None
+    skipped: str | None = None
+
+    def __str__(self) -> str:
+        if self.report is None:
+            return f"cycle {self.cycle}: skipped ({self.skipped})"
+        return f"cycle {self.cycle}: {self.report}"
+
+
+def next_crossing(now: datetime) -> datetime:
+    """اولین لحظه بعد از ``now`` که تسکی می‌تواند overdue شود: نیمه‌شب بعدی.
+
+    deadline یک تاریخ است و تسک باز وقتی overdue می‌شود که deadline < today
+    برقرار شود. ایجاد/ویرایش تک‌تسکی با deadline گذشته رد می‌شود، ولی دو مسیر
+    نوشتن در طول روز هم تسک باز overdue می‌سازند:
+
+    - باز کردن دوباره‌ی (todo/doing) تسک done‌ای که deadline آن گذشته است؛
+    - update دسته‌ای با ``shift_deadline_days`` منفی.
+
+    این تسک‌ها همان لحظه بسته نمی‌شوند و تا اجرای نیمه‌شب بعدی باز می‌مانند؛
+    scheduler عمداً برای آن‌ها poll نمی‌کند.
+
+    :param now: زمان فعلی با timezone محلی (``datetime.now().astimezone()``)
+    :return: نیمه‌شب روز بعد به وقت محلی (DST در نظر گرفته می‌شود)
+    """
+    tomorrow = now.date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).astimezone()
+
+
+def sleep_until(moment: datetime, *, grace: float = GRACE_SECONDS) -> None:
+    """تا ``moment`` (+ grace) می‌خوابد؛ بعد از هر تکه زمان دوباره حساب می‌شود."""
+    while True:
+        remaining = (moment - datetime.now().astimezone()).total_seconds() + grace
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, MAX_NAP_SECONDS))
+
+
+def run_cycle(*, today: date | None = None, lock: RunLock | None = None) -> CycleResult:
+    """یک دور autoclose، فقط در یک نمونه و فقط یک بار برای هر روز.
 
-from app.commands.autoclose_overdue import run
+    قفل نشان می‌دهد چه کسی الان اجرا می‌کند؛ جدول scheduler_runs نشان
+    می‌دهد این cycle قبلاً (توسط هر نمونه‌ای) اجرا شده یا نه. هر اجرا
+    با مدت زمان و تعداد ردیف‌های بسته‌شده در همان جدول ثبت می‌شود.
+    """
+    cycle = today or date.today()
+    with (lock or default_lock()).hold() as acquired:
+        if not acquired:
+            return CycleResult(cycle, skipped="another instance is running it")
+        with SessionLocal() as session:
+            done = session.scalar(
+                select(SchedulerRunORM.id).where(
+                    SchedulerRunORM.job == JOB,
+                    SchedulerRunORM.cycle == cycle,
+                )
+            )
+        if done is not None:
+            return CycleResult(cycle, skipped="already ran")
 
+        started_at = datetime.utcnow()
+        report = close_overdue(today=cycle)
+        with SessionLocal() as session:
+            session.add(
+                SchedulerRunORM(
+                    job=JOB,
+                    cycle=cycle,
+                    started_at=started_at,
+                    elapsed=report.elapsed,
+                    closed=report.closed,
+                    batches=report.batches,
+                    instance=_instance(),
+                )
+            )
+            session.commit()
+    return CycleResult(cycle, report=report)
 
-def job():
-    count = run()
-    print(f"[scheduler] closed {count} overdue tasks")
 
+def recent_runs(limit: int = 10) -> list[SchedulerRunORM]:
+    """آخرین اجراهای ثبت‌شده، جدیدترین اول."""
+    with SessionLocal() as session:
+        return list(
+            session.scalars(
+                select(SchedulerRunORM)
+                .where(SchedulerRunORM.job == JOB)
+                .order_by(SchedulerRunORM.cycle.desc())
+                .limit(limit)
+            )
+        )
 
-def main():
-    print("Scheduler started...")
 
-    # هر ۱۵ دقیقه یک‌بار
-    schedule.every(15).minutes.do(job)
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.commands.scheduler",
+        description=(
+            "Close overdue tasks once per day, right after midnight, in one "
+            "instance only (PostgreSQL advisory lock or a local lock file)."
+        ),
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="run (or skip) the current cycle and exit, e.g. from cron",
+    )
+    parser.add_argument(
+        "--history",
+        type=int,
+        metavar="N",
+        help="print the last N recorded runs and exit",
+    )
+    args = parser.parse_args(argv)
 
-    # اگر مثلاً فقط روزی یک‌بار ساعت ۲ شب بخواهی:
-    # schedule.every().day.at("02:00").do(job)
+    if args.history is not None:
+        for run in recent_runs(args.history):
+            print(
+                f"[scheduler] {run.cycle} {run.closed} closed in {run.batches} "
+                f"batch(es), {run.elapsed:.3f}s by {run.instance} "
+                f"(started {run.started_at:%Y-%m-%d %H:%M:%S} UTC)"
+            )
+        return 0
 
+    lock = default_lock()
+    print(f"[scheduler] started ({type(lock).__name__})")
     while True:
-        schedule.run_pending()
-        time.sleep(1)
+        # اول یک دور (جبران روزهایی که scheduler خاموش بوده)، بعد خواب تا نیمه‌شب
+        try:
+            print(f"[scheduler] {run_cycle(lock=lock)}")
+        except Exception as exc:  # noqa: BLE001 - keep the daemon alive
+            print(f"[scheduler] cycle failed: {exc}", file=sys.stderr)
+            if args.once:
+                return 1
+            time.sleep(RETRY_SECONDS)
+            continue
+        if args.once:
+            return 0
+        wake_at = next_crossing(datetime.now().astimezone())
+        print(f"[scheduler] next cycle at {wake_at:%Y-%m-%d %H:%M:%S %Z}")
+        sleep_until(wake_at)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+from app.exceptions.base import NotFoundError, ValidationError
+from app.models.bulk import TaskChanges, TaskDraft
+from app.models.query import ProjectQuery, TaskQuery, TaskSort, task_deadline
+from app.models.search import SearchQuery
+from app.models.task import Status, normalize_title
+from todo.storage.memory_storage import InMemoryStorage
+from todo.storage.persistence import MemoryPersistence
+
+
+# سهم هر نوع عملیات از ترافیک (مثل API: بیشتر خواندن، بعد ویرایش)
+OPERATION_WEIGHTS = {
+    "list_tasks": 30,
+    "list_task_rows": 10,
+    "list_projects": 10,
+    "search": 5,
+    "overdue": 2,
+    "add_task": 15,
+    "add_tasks": 3,
+    "edit_task": 10,
+    "change_status": 10,
+    "update_tasks": 2,
+    "remove_task": 3,
+}
+
+
+@dataclass(slots=True)
+class StressReport:
+    """Outcome of one stress run: operations done and invariants broken."""
+
+    operations: Counter[str] = field(default_factory=Counter)
+    # ValidationError/NotFoundError are expected (threads race on the same tasks)
+    rejected: int = 0
+    errors: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        total = sum(self.operations.values())
+        return (
+            f"{total} operations ({self.rejected} rejected) in {self.elapsed:.3f}s, "
+            f"{total / self.elapsed if self.elapsed else 0:.0f} ops/s, "
+            f"{len(self.errors)} error(s)"
+        )
+
+
+def _check_snapshot(tasks: list, errors: list[str], where: str) -> None:
+    """هر لیستی که یک خواننده می‌بیند باید یک snapshot سالم باشد."""
+    ids = [t.id for t in tasks]
+    if ids != sorted(set(ids)):
+        errors.append(f"{where}: ids not unique/ascending")
+    titles = [normalize_title(t.title) for t in tasks]
+    if len(titles) != len(set(titles)):
+        errors.append(f"{where}: duplicate titles in one snapshot")
+
+
+def _worker(
+    storage: InMemoryStorage,
+    project_ids: list[int],
+    operations: int,
+    seed: int,
+    report: StressReport,
+    lock: threading.Lock,
+) -> None:
+    rng = random.Random(seed)
+    names = list(OPERATION_WEIGHTS)
+    weights = list(OPERATION_WEIGHTS.values())
+    first_day = date.today() + timedelta(days=1)
+    done: Counter[str] = Counter()
+    rejected = 0
+    errors: list[str] = []
+
+    def some_task(project_id: int) -> int | None:
+        tasks = storage.list_tasks(project_id, TaskQuery(limit=50))
+        return rng.choice(tasks).id if tasks else None
+
+    for i in range(operations):
+        op = rng.choices(names, weights)[0]
+        project_id = rng.choice(project_ids)
+        title = f"t{seed}-{i}-{rng.randrange(50)}"
+        deadline = (first_day + timedelta(days=rng.randrange(60))).isoformat()
+        try:
+            if op == "list_tasks":
+                sort = rng.choice(list(TaskSort))
+                tasks = storage.list_tasks(project_id, TaskQuery(sort=sort))
+                _check_snapshot(sorted(tasks, key=lambda t: t.id), errors, op)
+            elif op == "list_task_rows":
+                rows = storage.list_task_rows(project_id, TaskQuery(limit=100))
+                if [r["id"] for r in rows] != sorted({r["id"] for r in rows}):
+                    errors.append(f"{op}: ids not unique/ascending")
+            elif op == "list_projects":
+                for project in storage.list_projects(
+                    ProjectQuery(with_counts=True, tasks_limit=3)
+                ):
+                    if project.task_counts is None or len(project.tasks) > 3:
+                        errors.append(f"{op}: bad embedded counts/tasks")
+            elif op == "search":
+                storage.search_tasks(SearchQuery(text=str(rng.randrange(50)), limit=20))
+            elif op == "overdue":
+                day = first_day + timedelta(days=rng.randrange(60))
+                for task in storage.iter_overdue(day):
+                    if task.status is Status.DONE or task_deadline(task) >= day:
+                        errors.append(f"{op}: task {task.id} is not overdue")
+            elif op == "add_task":
+                storage.add_task(project_id, title, "stress", deadline)
+            elif op == "add_tasks":
+                drafts = [TaskDraft(f"{title}-{k}", "stress", deadline) for k in range(5)]
+                storage.add_tasks(project_id, drafts)
+            elif op == "edit_task":
+                task_id = some_task(project_id)
+                if task_id is not None:
+                    storage.edit_task(project_id, task_id, title=title, deadline=deadline)
+            elif op == "change_status":
+                task_id = some_task(project_id)
+                if task_id is not None:
+                    storage.change_task_status(
+                        project_id, task_id, rng.choice(list(Status)).value
+                    )
+            elif op == "update_tasks":
+                storage.update_tasks(
+                    project_id,
+                    TaskQuery(status=Status.DOING),
+                    TaskChanges(shift_deadline_days=1),
+                )
+            elif op == "remove_task":
+                task_id = some_task(project_id)
+                if task_id is not None:
+                    storage.remove_task(project_id, task_id)
+        except (ValidationError, NotFoundError):
+            rejected += 1
+        except Exception as exc:  # noqa: BLE001 - everything else is a bug
+            errors.append(f"{op}: {type(exc).__name__}: {exc}")
+        done[op] += 1
+
+    with lock:
+        report.operations.update(done)
+        report.rejected += rejected
+        report.errors.extend(errors)
+
+
+def check_invariants(storage: InMemoryStorage) -> list[str]:
+    """بعد از تمام شدن threadها: نماها، شمارنده‌ها و ایندکس‌ها باید با داده یکی باشند."""
+    errors: list[str] = []
+    all_tasks = []
+    for project_id, project in storage.projects.items():
+        snapshot = storage.get_project(project_id).tasks
+        if [id(t) for t in snapshot] != [id(t) for t in project.tasks]:
+            errors.append(f"project {project_id}: published view is stale")
+        _check_snapshot(snapshot, errors, f"project {project_id}")
+        all_tasks.extend(snapshot)
+
+    if storage._task_count != len(all_tasks):
+        errors.append(f"task count {storage._task_count} != {len(all_tasks)} tasks")
+    if set(storage._task_owner) != {t.id for t in all_tasks}:
+        errors.append("search owners out of sync")
+
+    day = date.max
+    expected = sorted(
+        (t for t in all_tasks if t.status is not Status.DONE and t.deadline),
+        key=lambda t: (task_deadline(t), t.id),
+    )
+    if [t.id for t in storage.iter_overdue(day)] != [t.id for t in expected]:
+        errors.append("deadline index out of sync")
+
+    for task in all_tasks:
+        hits = storage.search_tasks(SearchQuery(text=task.title))
+        if task.id not in {hit.task.id for hit in hits}:
+            errors.append(f"task {task.id} missing from the search index")
+            break
+    return errors
+
+
+def _state(storage: InMemoryStorage) -> dict[int, tuple]:
+    return {
+        project_id: (
+            storage.get_project(project_id).name,
+            [
+                (t.id, t.title, t.description, t.status, task_deadline(t),
+                 t.at_closed, t.created_at)
+                for t in storage.get_project(project_id).tasks
+            ],
+        )
+        for project_id in storage.projects
+    }
+
+
+def check_recovery(persistence: MemoryPersistence, task_max: int) -> list[str]:
+    """«crash» بعد از آخرین نوشتن: storage بازیابی‌شده باید همان داده را داشته باشد."""
+    storage = persistence.storage
+    expected = _state(storage)
+    persistence.close(checkpoint=False)
+    recovered = MemoryPersistence(persistence.directory, snapshot_seconds=0)
+    restored = recovered.open(project_max=len(expected), task_max=task_max)
+    try:
+        errors = []
+        if _state(restored) != expected:
+            errors.append("recovered data differs from the data before the crash")
+        if restored._task_counter < storage._task_counter:
+            errors.append("recovered task counter went back")
+        errors.extend(f"recovered: {e}" for e in check_invariants(restored))
+        print(f"[stress] recovery: {recovered.recovery}")
+        return errors
+    finally:
+        recovered.close()
+
+
+def run_stress(
+    *,
+    threads: int = 16,
+    operations: int = 2000,
+    projects: int = 8,
+    seed: int = 0,
+    data_dir: Path | None = None,
+) -> StressReport:
+    """ترافیک مخلوط خواندن/نوشتن از ``threads`` thread روی یک InMemoryStorage.
+
+    با ``data_dir`` همان storage با WAL اجرا می‌شود و هم‌زمان با نوشتن‌ها مدام
+    snapshot گرفته می‌شود؛ در آخر بازیابی بعد از crash هم بررسی می‌شود.
+    """
+    task_max = threads * operations * 5
+    persistence = None
+    if data_dir is None:
+        storage = InMemoryStorage(project_max=projects, task_max=task_max)
+    else:
+        persistence = MemoryPersistence(data_dir, snapshot_seconds=0.05)
+        storage = persistence.open(project_max=projects, task_max=task_max)
+        persistence.start()
+    project_ids = [storage.add_project(f"p{i}", "stress").id for i in range(projects)]
+    report = StressReport()
+    lock = threading.Lock()
+    workers = [
+        threading.Thread(
+            target=_worker,
+            args=(storage, project_ids, operations, seed + n, report, lock),
+        )
+        for n in range(threads)
+    ]
+
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    report.elapsed = time.perf_counter() - started
+
+    if persistence is not None:
+        # right away, so the log has writes the last snapshot does not cover
+        report.errors.extend(check_recovery(persistence, task_max))
+    report.errors.extend(check_invariants(storage))
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.commands.stress_memory",
+        description=(
+            "Run mixed read/write traffic from many threads against one "
+            "InMemoryStorage and check its snapshots, counters and indexes."
+        ),
+    )
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--operations", type=int, default=2000, help="per thread")
+    parser.add_argument("--projects", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="persist to this (empty) directory: WAL + snapshots, then check recovery",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_stress(
+        threads=args.threads,
+        operations=args.operations,
+        projects=args.projects,
+        seed=args.seed,
+        data_dir=args.data_dir,
+    )
+    print(f"[stress] {report}")
+    for error in report.errors[:20]:
+        print(f"[stress] {error}", file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass(slots=True)
+class StatementCounter:
+    """SQL statements sent to the database while a counter is active."""
+
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[StatementCounter]:
+    """Record every statement executed on ``engine`` inside the block.
+
+    Meant for catching round-trip regressions in storage operations::
+
+        with count_statements(engine) as counter:
+            storage.add_task(project_id, "title", "description", None)
+        assert counter.count == 1
+
+    COMMIT/ROLLBACK are not cursor executions and are not counted.
+    """
+    counter = StatementCounter()
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(slots=True, frozen=True)
+class PoolSettings:
+    """Connection pool configuration (one set per engine).
+
+    - size: connections kept open (DB_POOL_SIZE)
+    - max_overflow: extra connections opened under load (DB_MAX_OVERFLOW)
+    - timeout: seconds to wait for a free connection before failing (DB_POOL_TIMEOUT)
+    - recycle: reconnect connections older than this many seconds (DB_POOL_RECYCLE)
+    - pre_ping: test a connection before handing it out (DB_POOL_PRE_PING)
+    """
+
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: int = 1800
+    pre_ping: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+        )
+
+    def engine_kwargs(self, url: str, *, is_async: bool = False) -> dict[str, Any]:
+        """Keyword arguments for create_engine/create_async_engine."""
+        if ":memory:" in url:
+            # in-memory sqlite uses a single-connection pool; sizes don't apply
+            return {"pool_pre_ping": self.pre_ping}
+        return {
+            "poolclass": MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+            "pool_size": self.size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": self.recycle,
+            "pool_pre_ping": self.pre_ping,
+        }
+
+
+class PoolMetrics:
+    """Counters fed by pool events (and checkout wait time by the pool class).
+
+    Thread-safe; one instance per pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def record_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": (self.wait_total / self.waits * 1000) if self.waits else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+class _MeteredPoolMixin:
+    """Times how long ``_do_get`` (waiting for a free connection) blocks.
+
+    SQLAlchemy has no event for "checkout requested", so the wait is measured
+    around the queue get itself; everything else comes from pool events. Only
+    the pool's own TimeoutError counts as a timeout: a failed connect (e.g.
+    the server is down) propagates without touching the wait metrics.
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return conn
+
+    def recreate(self):  # type: ignore[no-untyped-def]
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(engine: Engine) -> PoolMetrics:
+    """Attach PoolMetrics to ``engine.pool`` through pool events."""
+    pool = engine.pool
+    metrics = getattr(pool, "metrics", None) or PoolMetrics()
+    pool.metrics = metrics  # type: ignore[attr-defined]
+
+    event.listen(pool, "connect", lambda *_: metrics.add("connects"))
+    event.listen(pool, "checkout", lambda *_: metrics.add("checkouts"))
+    event.listen(pool, "checkin", lambda *_: metrics.add("checkins"))
+    event.listen(pool, "invalidate", lambda *_: metrics.add("invalidations"))
+    return metrics
+
+
+@dataclass(slots=True)
+class PoolStatus:
+    """Point-in-time view of one pool for the diagnostics endpoint."""
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    metrics: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def pool_status(pool: Pool, settings: PoolSettings) -> PoolStatus:
+    metrics: PoolMetrics | None = getattr(pool, "metrics", None)
+    is_queue = isinstance(pool, QueuePool)
+    return PoolStatus(
+        size=settings.size,
+        max_overflow=settings.max_overflow,
+        checked_out=pool.checkedout() if is_queue else 0,
+        checked_in=pool.checkedin() if is_queue else 0,
+        # QueuePool.overflow() starts at -size; only positive values are real overflow
+        overflow=max(pool.overflow(), 0) if is_queue else 0,
+        metrics=metrics.snapshot() if metrics else {},
+    )
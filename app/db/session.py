@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import os
-from typing import Generator
+import threading
+from typing import Any, Callable, Generator, Iterator, TypeVar
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, Session
 
+from app.db.pool import PoolSettings, instrument_pool
+
 
 # --------------------------
 # Load .env from project root
@@ -22,37 +33,110 @@ load_dotenv(env_path)
 # Read DATABASE_URL
 # --------------------------
 
+# Nothing connects (or even loads a DB driver) at import: the engines below are
+# built on first use, so STORAGE_BACKEND=memory runs without DATABASE_URL and
+# without psycopg installed.
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if not DATABASE_URL:
-    raise RuntimeError(f"DATABASE_URL is not set. Tried to load: {env_path}")
+# URL for the asyncio engine used by the API. postgresql+psycopg works for both
+# (SQLAlchemy picks psycopg's async connection); other drivers need their own
+# async variant, e.g. sqlite+aiosqlite.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or DATABASE_URL
+
+
+def _url_list(raw: str | None) -> list[str]:
+    return [url.strip() for url in (raw or "").split(",") if url.strip()]
+
+
+# Optional read replicas (comma-separated). Read-only storage calls are spread
+# over them round-robin; writes always go to DATABASE_URL.
+REPLICA_URLS = _url_list(os.getenv("DATABASE_REPLICA_URLS"))
+ASYNC_REPLICA_URLS = _url_list(os.getenv("ASYNC_DATABASE_REPLICA_URLS")) or REPLICA_URLS
+
+# Pool sizes/timeouts from DB_POOL_* (see app/db/pool.py).
+POOL_SETTINGS = PoolSettings.from_env()
+
+
+def _require_url(url: str | None) -> str:
+    if not url:
+        raise RuntimeError(f"DATABASE_URL is not set. Tried to load: {env_path}")
+    return url
+
+
+T = TypeVar("T")
+
+
+def _once(build: Callable[[], T]) -> Callable[[], T]:
+    """Call ``build`` on first use only (thread-safe) and keep its result."""
+    lock = threading.Lock()
+    built: list[T] = []
+
+    @functools.wraps(build)
+    def get() -> T:
+        if not built:
+            with lock:
+                if not built:
+                    built.append(build())
+        return built[0]
+
+    return get
 
 
 # --------------------------
 # SQLAlchemy engine & session
 # --------------------------
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    future=True,
-)
+@_once
+def get_engine() -> Engine:
+    url = _require_url(DATABASE_URL)
+    bind = create_engine(url, echo=False, future=True, **POOL_SETTINGS.engine_kwargs(url))
+    instrument_pool(bind)
+    return bind
 
-SessionLocal = sessionmaker(
-    bind=engine,
-    autoflush=False,
-    autocommit=False,
-    expire_on_commit=False,
-    class_=Session,
-)
+
+@_once
+def _session_factory() -> sessionmaker[Session]:
+    return sessionmaker(
+        bind=get_engine(),
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
+        class_=Session,
+    )
+
+
+# --------------------------
+# Async engine & session (API)
+# --------------------------
+
+@_once
+def get_async_engine() -> AsyncEngine:
+    url = _require_url(ASYNC_DATABASE_URL)
+    bind = create_async_engine(
+        url,
+        echo=False,
+        **POOL_SETTINGS.engine_kwargs(url, is_async=True),
+    )
+    instrument_pool(bind.sync_engine)
+    return bind
+
+
+@_once
+def _async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
 
 
 def get_session() -> Session:
-    return SessionLocal()
+    return _session_factory()()
 
 
 def session_scope() -> Generator[Session, None, None]:
-    session = SessionLocal()
+    session = get_session()
     try:
         yield session
         session.commit()
@@ -61,3 +145,96 @@ def session_scope() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+
+
+def get_async_session() -> AsyncSession:
+    return _async_session_factory()()
+
+
+# --------------------------
+# Read replicas (optional)
+# --------------------------
+
+E = TypeVar("E")
+
+
+class _RoundRobin(Iterator[E]):
+    """Thread-safe endless cycle over replica engines."""
+
+    def __init__(self, items: list[E]) -> None:
+        self._cycle = itertools.cycle(items)
+        self._lock = threading.Lock()
+
+    def __next__(self) -> E:
+        with self._lock:
+            return next(self._cycle)
+
+
+@_once
+def get_replica_engines() -> list[Engine]:
+    engines = [
+        create_engine(url, echo=False, future=True, **POOL_SETTINGS.engine_kwargs(url))
+        for url in REPLICA_URLS
+    ]
+    for replica in engines:
+        instrument_pool(replica)
+    return engines
+
+
+@_once
+def get_async_replica_engines() -> list[AsyncEngine]:
+    engines = [
+        create_async_engine(
+            url,
+            echo=False,
+            **POOL_SETTINGS.engine_kwargs(url, is_async=True),
+        )
+        for url in ASYNC_REPLICA_URLS
+    ]
+    for replica in engines:
+        instrument_pool(replica.sync_engine)
+    return engines
+
+
+@_once
+def _next_replica() -> _RoundRobin[Engine]:
+    return _RoundRobin(get_replica_engines())
+
+
+@_once
+def _next_async_replica() -> _RoundRobin[AsyncEngine]:
+    return _RoundRobin(get_async_replica_engines())
+
+
+def get_replica_session() -> Session | None:
+    """Session on the next replica, or None when no replica is configured."""
+    if not REPLICA_URLS:
+        return None
+    return _session_factory()(bind=next(_next_replica()))
+
+
+def get_async_replica_session() -> AsyncSession | None:
+    """AsyncSession on the next replica, or None when no replica is configured."""
+    if not ASYNC_REPLICA_URLS:
+        return None
+    return _async_session_factory()(bind=next(_next_async_replica()))
+
+
+# The module-level names commands and migrations import
+# (``from app.db.session import SessionLocal, engine``), built on first access.
+_LAZY: dict[str, Callable[[], Any]] = {
+    "engine": get_engine,
+    "SessionLocal": _session_factory,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": _async_session_factory,
+    "replica_engines": get_replica_engines,
+    "async_replica_engines": get_async_replica_engines,
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        build = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return build()
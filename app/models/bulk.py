@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+
+from app.models.task import Status, Task
+
+
+@dataclass(slots=True, frozen=True)
+class TaskDraft:
+    """One not-yet-validated task of a bulk create."""
+
+    title: str
+    description: str
+    deadline: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BulkItemResult:
+    """Outcome of one item of a bulk operation (by position in the batch)."""
+
+    index: int
+    task: Optional[Task] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True, frozen=True)
+class TaskChanges:
+    """Changes applied to every task matched by a mass update.
+
+    - status: new status (at_closed follows the same rule as change_status)
+    - deadline: new absolute deadline
+    - shift_deadline_days: move existing deadlines by N days (tasks without a
+      deadline are left alone); mutually exclusive with ``deadline``
+    """
+
+    status: Optional[Status] = None
+    deadline: Optional[date] = None
+    shift_deadline_days: Optional[int] = None
+
+
+@dataclass(slots=True)
+class BulkUpdateResult:
+    """Number of tasks changed by a mass update and, if asked, the rows."""
+
+    updated: int
+    tasks: Optional[list[Task]] = field(default=None)
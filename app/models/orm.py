@@ -3,7 +3,18 @@ from __future__ import annotations
 from datetime import datetime, date
 from typing import List, Optional
 
-from sqlalchemy import String, Text, DateTime, Date, ForeignKey, Integer
+from sqlalchemy import (
+    String,
+    Text,
+    DateTime,
+    Date,
+    Float,
+    ForeignKey,
+    Integer,
+    Index,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -18,6 +29,10 @@ class ProjectORM(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.utcnow
     )
+    # با هر UPDATE (ORM یا Core) به‌روز می‌شود؛ مبنای ETag لیست پروژه‌ها
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     # رابطه یک‌به‌چند با TaskORM
     tasks: Mapped[List["TaskORM"]] = relationship(
@@ -25,6 +40,15 @@ class ProjectORM(Base):
         cascade="all, delete-orphan",
     )
 
+    # یکتایی نام پروژه بدون حساسیت به حروف/فاصله‌ها، توسط خود دیتابیس
+    __table_args__ = (
+        Index(
+            "uq_projects_name_ci",
+            func.lower(func.trim(name)),
+            unique=True,
+        ),
+    )
+
 
 class TaskORM(Base):
     __tablename__ = "tasks"
@@ -39,8 +63,9 @@ class TaskORM(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.utcnow
     )
+    # با هر UPDATE (ORM یا Core) به‌روز می‌شود؛ مبنای ETag لیست تسک‌ها
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.utcnow
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
     project_id: Mapped[int] = mapped_column(
@@ -57,3 +82,58 @@ class TaskORM(Base):
         DateTime,
         nullable=True,
     )
+
+    # ستون search_vector (tsvector تولیدشده + GIN index) فقط در migration
+    # c3f7a9d1b6e2 تعریف شده و عمداً این‌جا map نشده؛ SqlAlchemyStorage با
+    # column("search_vector") به آن ارجاع می‌دهد. include_object در
+    # migrations/env.py هر دو را از autogenerate/``alembic check`` کنار می‌گذارد.
+
+    __table_args__ = (
+        # عنوان تسک داخل هر پروژه یکتاست (case-insensitive، بدون فاصله‌های دو طرف)
+        Index(
+            "uq_tasks_project_title_ci",
+            project_id,
+            func.lower(func.trim(title)),
+            unique=True,
+        ),
+        # فیلتر status/بازه‌ی deadline/overdue داخل یک پروژه؛ id در انتها تا
+        # ترتیب (deadline, id) و keyset آن مستقیم از index بیاید
+        Index(
+            "ix_tasks_project_status_deadline", project_id, status, deadline, id
+        ),
+        # مرتب‌سازی تسک‌های پروژه بر اساس deadline بدون فیلتر status
+        Index("ix_tasks_project_deadline", project_id, deadline, id),
+        # count + max(updated_at) هر پروژه برای ETag، بدون خواندن ردیف‌ها
+        Index("ix_tasks_project_updated_at", project_id, updated_at),
+        # overdue / «موعد قبل از X» در همه‌ی پروژه‌ها: partial index فقط روی
+        # تسک‌های باز، به ترتیب (deadline, id) که خروجی iter_overdue است
+        Index(
+            "ix_tasks_open_deadline",
+            deadline,
+            id,
+            postgresql_where=status != "done",
+        ),
+    )
+
+
+class SchedulerRunORM(Base):
+    """One completed cycle of a scheduled job (see app/commands/scheduler.py)."""
+
+    __tablename__ = "scheduler_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job: Mapped[str] = mapped_column(String(50), nullable=False)
+    # روزی که اجرا برای آن بود (autoclose: deadline < cycle بسته شد)
+    cycle: Mapped[date] = mapped_column(Date, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    elapsed: Mapped[float] = mapped_column(Float, nullable=False)
+    closed: Mapped[int] = mapped_column(Integer, nullable=False)
+    batches: Mapped[int] = mapped_column(Integer, nullable=False)
+    # host:pid نمونه‌ای که اجرا کرد
+    instance: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    __table_args__ = (
+        # هر job در هر cycle فقط یک بار (replicaها همین را چک می‌کنند)؛
+        # همین index تاریخچه‌ی یک job را هم به ترتیب cycle می‌دهد
+        UniqueConstraint("job", "cycle", name="uq_scheduler_runs_job_cycle"),
+    )
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Iterable, Optional
 
-from app.models.task import MAX_DESC_LEN, MAX_TITLE_LEN, Task
+from app.models.task import (
+    MAX_DESC_LEN,
+    MAX_TITLE_LEN,
+    Task,
+    normalize_title,
+    parse_deadline_string,
+)
 from app.exceptions.base import ValidationError, NotFoundError
 
 
+@dataclass(slots=True)
+class TaskCounts:
+    """Number of tasks of a project per status."""
+
+    todo: int = 0
+    doing: int = 0
+    done: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.todo + self.doing + self.done
+
+
 @dataclass(slots=True)
 class Project:
     """Container for a collection of tasks."""
@@ -17,6 +37,17 @@ class Project:
     description: str
     created_at: datetime = field(default_factory=datetime.utcnow)
     tasks: list[Task] = field(default_factory=list)
+    # Filled only when a listing asks for counts (see ProjectQuery.with_counts)
+    task_counts: Optional[TaskCounts] = None
+    # id -> task and normalized title -> task, built on first use (copies made
+    # with dataclasses.replace don't pay for them) and kept in sync by
+    # add_task/remove_task/replace_task. Change ``tasks`` only through those.
+    _by_id: Optional[dict[int, Task]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _by_title: Optional[dict[str, Task]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if not self.name.strip():
@@ -31,51 +62,97 @@ class Project:
             )
 
     # --- Task management ----------------------------------------------
+    def _lookups(self) -> tuple[dict[int, Task], dict[str, Task]]:
+        if self._by_id is None or self._by_title is None:
+            self._by_id = {t.id: t for t in self.tasks}
+            self._by_title = {normalize_title(t.title): t for t in self.tasks}
+        return self._by_id, self._by_title
+
     def add_task(self, task: Task) -> None:
         """Append a task to this project."""
+        by_id, by_title = self._lookups()
         # 1️⃣ Check duplicate ID
-        if any(t.id == task.id for t in self.tasks):
+        if task.id in by_id:
             raise ValidationError(f"task id {task.id} already exists in project")
-        
+
         # 2️⃣ Check duplicate title
-        if any(t.title.strip().lower() == task.title.strip().lower() for t in self.tasks):
+        title_key = normalize_title(task.title)
+        if title_key in by_title:
             raise ValidationError(f"task title '{task.title}' already exists in this project")
 
-
         # 3️⃣ Validate deadline if provided
         if task.deadline:
-            try:
-                deadline_dt = datetime.strptime(task.deadline, "%Y-%m-%d")
-            except ValueError:
-                raise ValidationError(
-                    f"Deadline '{task.deadline}' is invalid. Use YYYY-MM-DD format."
-                )
+            if isinstance(task.deadline, date):
+                deadline = task.deadline
+            else:
+                try:
+                    deadline = parse_deadline_string(task.deadline)
+                except ValueError:
+                    raise ValidationError(
+                        f"Deadline '{task.deadline}' is invalid. Use YYYY-MM-DD format."
+                    )
 
             # 4️⃣ Check if deadline is in the past
-            if deadline_dt.date() < datetime.now().date():
+            if deadline < date.today():
                 raise ValidationError("Deadline cannot be in the past.")
 
-            # Optional: if you have a project start date
-            if hasattr(self, 'start_date') and deadline_dt.date() < self.start_date:
-                raise ValidationError("Deadline cannot be before project start date.")
-
-            ## Store the parsed datetime if you want consistent type
-            #task.deadline = deadline_dt
-
         self.tasks.append(task)
+        by_id[task.id] = task
+        by_title[title_key] = task
 
     def remove_task(self, task_id: int) -> None:
         """Remove task by id, raise if not present."""
-        before = len(self.tasks)
-        self.tasks = [t for t in self.tasks if t.id != task_id]
-        if len(self.tasks) == before:
+        by_id, by_title = self._lookups()
+        task = by_id.pop(task_id, None)
+        if task is None:
             raise NotFoundError(f"task {task_id} not found in project {self.id}")
+        by_title.pop(normalize_title(task.title), None)
+
+        # tasks are appended in id order, so the position is found by bisect
+        i = bisect_left(self.tasks, task_id, key=lambda t: t.id)
+        if i < len(self.tasks) and self.tasks[i] is task:
+            del self.tasks[i]
+        else:
+            self.tasks.remove(task)
 
     def get_task(self, task_id: int) -> Task:
-        for t in self.tasks:
-            if t.id == task_id:
-                return t
-        raise NotFoundError(f"task {task_id} not found in project {self.id}")
+        by_id, _ = self._lookups()
+        try:
+            return by_id[task_id]
+        except KeyError:
+            raise NotFoundError(
+                f"task {task_id} not found in project {self.id}"
+            ) from None
+
+    def task_with_title(self, title: str) -> Optional[Task]:
+        """The task whose title equals ``title`` case-insensitively, if any."""
+        _, by_title = self._lookups()
+        return by_title.get(normalize_title(title))
+
+    def replace_task(self, task: Task) -> Task:
+        """Put ``task`` in place of the stored task with the same id (index included).
+
+        Lets a caller edit a copy and swap it in at once, so the old object is
+        never seen half-updated. Title uniqueness is the caller's job.
+
+        :return: the task that was replaced
+        """
+        by_id, by_title = self._lookups()
+        old = by_id.get(task.id)
+        if old is None:
+            raise NotFoundError(f"task {task.id} not found in project {self.id}")
+        by_id[task.id] = task
+        old_key = normalize_title(old.title)
+        if by_title.get(old_key) is old:
+            del by_title[old_key]
+        by_title[normalize_title(task.title)] = task
+
+        i = bisect_left(self.tasks, task.id, key=lambda t: t.id)
+        if i < len(self.tasks) and self.tasks[i] is old:
+            self.tasks[i] = task
+        else:
+            self.tasks[self.tasks.index(old)] = task
+        return old
 
     # --- Editing -------------------------------------------------------
     def rename(self, *, name: Optional[str] = None, description: Optional[str] = None) -> None:
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from app.exceptions.base import ValidationError
+from app.models.task import Status, Task
+
+
+T = TypeVar("T")
+
+# Keyset of a row in the current sort order; the row id is always the last item
+# so the key is unique even when the leading sort column has duplicates.
+SortKey = tuple[Any, ...]
+
+# Cheap summary of a listing's underlying rows (row count, last update, ...):
+# it changes whenever any row in the listing is inserted, updated or deleted.
+ChangeMarker = tuple[Any, ...]
+
+# One task of a listing as plain column values (id, title, description, status,
+# deadline, at_closed, plus created_at when sorting by it); no Task is built.
+TaskRow = dict[str, Any]
+
+# One project of a listing as plain values (id, name, description, created_at,
+# task_counts as a dict, tasks as a list of TaskRow; None when not loaded).
+ProjectRow = dict[str, Any]
+
+
+@dataclass(slots=True, frozen=True)
+class PageQuery:
+    """Keyset page request shared by project and task listings.
+
+    - limit: maximum number of rows (None = no limit)
+    - after: sort key of the last row of the previous page (None = first page)
+    """
+
+    limit: int | None = None
+    after: SortKey | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class ProjectQuery(PageQuery):
+    """Listing options for projects (ordered by id).
+
+    - with_counts: also fill ``Project.task_counts`` (one GROUP BY, no N+1)
+    - tasks_limit: also fill ``Project.tasks`` with the first N tasks by
+      deadline (None = don't embed tasks)
+    - fields: only load these fields in ``list_project_rows``; counts and
+      embedded tasks are skipped unless listed (None = all fields)
+    """
+
+    with_counts: bool = False
+    tasks_limit: Optional[int] = None
+    fields: Optional[tuple[str, ...]] = None
+
+
+class TaskSort(str, Enum):
+    """Allowed sort orders for task listings (always ascending, id breaks ties)."""
+
+    ID = "id"
+    DEADLINE = "deadline"
+    CREATED_AT = "created_at"
+
+
+@dataclass(slots=True, frozen=True)
+class TaskQuery(PageQuery):
+    """Filtering, sorting and paging options for the tasks of one project.
+
+    - ids: only tasks with these ids
+    - status: only tasks with this status
+    - deadline_from / deadline_to: inclusive deadline range
+    - overdue_on: only tasks with deadline < overdue_on that are not done
+    - sort: order of the listing; tasks without deadline sort last
+    - fields: only select these columns in ``list_task_rows`` (None = all)
+    """
+
+    ids: Optional[tuple[int, ...]] = None
+    status: Optional[Status] = None
+    deadline_from: Optional[date] = None
+    deadline_to: Optional[date] = None
+    overdue_on: Optional[date] = None
+    sort: TaskSort = TaskSort.ID
+    fields: Optional[tuple[str, ...]] = None
+
+    @property
+    def has_filters(self) -> bool:
+        return any(
+            value is not None
+            for value in (
+                self.ids,
+                self.status,
+                self.deadline_from,
+                self.deadline_to,
+                self.overdue_on,
+            )
+        )
+
+    def matches(self, task: Task) -> bool:
+        """Python equivalent of the WHERE clause built by SqlAlchemyStorage."""
+        deadline = task_deadline(task)
+        if self.ids is not None and task.id not in self.ids:
+            return False
+        if self.status is not None and task.status != self.status:
+            return False
+        if self.deadline_from is not None and (
+            deadline is None or deadline < self.deadline_from
+        ):
+            return False
+        if self.deadline_to is not None and (
+            deadline is None or deadline > self.deadline_to
+        ):
+            return False
+        if self.overdue_on is not None and (
+            deadline is None
+            or deadline >= self.overdue_on
+            or task.status == Status.DONE
+        ):
+            return False
+        return True
+
+
+def task_deadline(task: Task) -> date | None:
+    """Deadline of a task as ``date`` (in-memory tasks may still hold the raw string)."""
+    if isinstance(task.deadline, str):
+        return date.fromisoformat(task.deadline) if task.deadline else None
+    return task.deadline
+
+
+def task_sort_key(task: Task, sort: TaskSort) -> SortKey:
+    """Keyset of ``task`` for the given sort order (id is always last)."""
+    if sort is TaskSort.DEADLINE:
+        return (task_deadline(task), task.id)
+    if sort is TaskSort.CREATED_AT:
+        return (task.created_at, task.id)
+    return (task.id,)
+
+
+def task_row_sort_key(row: TaskRow, sort: TaskSort) -> SortKey:
+    """``task_sort_key`` for a ``TaskRow``."""
+    if sort is TaskSort.DEADLINE:
+        return (row["deadline"], row["id"])
+    if sort is TaskSort.CREATED_AT:
+        return (row["created_at"], row["id"])
+    return (row["id"],)
+
+
+def order_key(key: SortKey, sort: TaskSort) -> tuple[Any, ...]:
+    """Comparable form of a keyset matching ``ORDER BY`` in SQL.
+
+    ``None`` deadlines can't be compared with dates, so they are mapped to a
+    leading flag that puts them last.
+    """
+    if sort is TaskSort.DEADLINE:
+        deadline, task_id = key
+        return (deadline is None, deadline or date.min, task_id)
+    return key
+
+
+def task_order_key(task: Task, sort: TaskSort) -> tuple[Any, ...]:
+    return order_key(task_sort_key(task, sort), sort)
+
+
+def parse_task_sort_key(raw: SortKey, sort: TaskSort) -> SortKey:
+    """Turn a decoded (JSON) keyset back into typed values for ``sort``.
+
+    :raises ValidationError: if the keyset does not fit the sort order
+    """
+    try:
+        if sort is TaskSort.DEADLINE:
+            deadline, task_id = raw
+            return (date.fromisoformat(deadline) if deadline else None, task_id)
+        if sort is TaskSort.CREATED_AT:
+            created_at, task_id = raw
+            return (datetime.fromisoformat(created_at), task_id)
+        (task_id,) = raw
+        return (task_id,)
+    except (TypeError, ValueError) as exc:
+        raise ValidationError("invalid cursor") from exc
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    """One page of results plus the key to continue after it."""
+
+    items: list[T] = field(default_factory=list)
+    next_after: SortKey | None = None
+
+
+def build_page(
+    rows: list[T],
+    limit: int | None,
+    key: Callable[[T], SortKey],
+) -> Page[T]:
+    """Cut ``rows`` (fetched with ``limit + 1``) into a page.
+
+    The extra row only signals that another page exists; it is never returned,
+    so clients don't get an empty trailing page.
+    """
+    if limit is None or len(rows) <= limit:
+        return Page(items=rows)
+    items = rows[:limit]
+    return Page(items=items, next_after=key(items[-1]))
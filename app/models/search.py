@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from app.exceptions.base import ValidationError
+from app.models.query import PageQuery, SortKey
+from app.models.task import Task
+
+
+# Same text search configuration in PostgreSQL and in memory: 'simple' only
+# lower-cases words (no stemming, no stop words), so Persian and English text
+# are treated alike.
+SEARCH_CONFIG = "simple"
+
+# Weights of ts_rank's default {D, C, B, A} labels: titles are labelled A,
+# descriptions B.
+TITLE_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Words of ``text`` as the 'simple' configuration sees them."""
+    return _WORD.findall(text.lower())
+
+
+@dataclass(slots=True, frozen=True)
+class SearchQuery(PageQuery):
+    """Full-text search over task titles and descriptions of all projects.
+
+    - text: words that must all appear (in the title or the description)
+
+    Results are ordered by rank (best first), then by id; ``after`` is the
+    ``(rank, id)`` of the last hit of the previous page.
+    """
+
+    text: str = ""
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """One search result: the task, its project and its relevance."""
+
+    task: Task
+    project_id: int
+    rank: float
+
+
+def search_sort_key(hit: SearchHit) -> SortKey:
+    return (hit.rank, hit.task.id)
+
+
+def search_order_key(key: SortKey) -> tuple[float, int]:
+    """Ascending-comparable form of a search keyset (rank descending, id ascending)."""
+    rank, task_id = key
+    return (-rank, task_id)
+
+
+def parse_search_key(raw: SortKey) -> SortKey:
+    """Turn a decoded (JSON) search keyset back into ``(rank, id)``.
+
+    :raises ValidationError: if the keyset is not a (number, int) pair
+    """
+    try:
+        rank, task_id = raw
+    except (TypeError, ValueError) as exc:
+        raise ValidationError("invalid cursor") from exc
+    if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+        raise ValidationError("invalid cursor")
+    return (float(rank), task_id)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 from app.exceptions.base import ValidationError, InvalidStatusError
@@ -27,6 +28,23 @@ MAX_TITLE_LEN = 30
 MAX_DESC_LEN = 150
 
 
+def normalize_title(value: str) -> str:
+    """Key for case-insensitive uniqueness of titles/names.
+
+    Same as ``lower(trim(...))`` used by the database unique indexes.
+    """
+    return value.strip().lower()
+
+
+@lru_cache(maxsize=1024)
+def parse_deadline_string(raw: str) -> date:
+    """``strptime(raw, "%Y-%m-%d").date()``, memoized (many tasks share a deadline).
+
+    :raises ValueError: if ``raw`` is not a valid YYYY-MM-DD date
+    """
+    return datetime.strptime(raw, "%Y-%m-%d").date()
+
+
 def _parse_deadline(raw: Optional[str]) -> Optional[date]:
     if raw is None or raw == "":
         return None
@@ -55,6 +73,7 @@ class Task:
     status: Status = field(default=Status.TODO)
     deadline: Optional[date] = field(default=None)
     at_closed: Optional[datetime] = field(default=None)
+    created_at: datetime = field(default_factory=datetime.utcnow)
 
     def __post_init__(self) -> None:
         if not self.title.strip():
@@ -67,10 +86,13 @@ class Task:
             raise ValidationError(
                 f"description must be maximum {MAX_DESC_LEN} characters"
             )
-        # Ensure status is a Status enum (accept string for convenience)
-        if isinstance(self.status, str):
+        # Ensure status is a Status enum (accept string for convenience).
+        # Status is itself a str, so test it first: no lookup for enum values.
+        if isinstance(self.status, Status):
+            pass
+        elif isinstance(self.status, str):
             self.status = Status.from_string(self.status)
-        elif not isinstance(self.status, Status):
+        else:
             raise InvalidStatusError("status must be a Status or valid string")
 
     # --- Mutators -----------------------------------------------------
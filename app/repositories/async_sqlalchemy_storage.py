@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Iterable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bulk import BulkUpdateResult, TaskChanges, TaskDraft
+from app.models.project import Project
+from app.models.query import (
+    ChangeMarker,
+    ProjectQuery,
+    ProjectRow,
+    TaskQuery,
+    TaskRow,
+)
+from app.models.search import SearchHit, SearchQuery
+from app.models.task import Task
+from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
+from app.services.async_project_service import AsyncProjectStoragePort
+from app.services.async_task_service import AsyncTaskStoragePort
+
+
+R = TypeVar("R")
+
+
+class AsyncSqlAlchemyStorage(AsyncProjectStoragePort, AsyncTaskStoragePort):
+    """نسخه‌ی async از SqlAlchemyStorage روی AsyncSession (SQLAlchemy asyncio + psycopg async).
+
+    کوئری‌ها دوباره نوشته نشده‌اند: هر متد همان متد SqlAlchemyStorage را روی
+    ``AsyncSession.sync_session`` با ``run_sync`` اجرا می‌کند. run_sync کد sync
+    را داخل greenlet اجرا می‌کند و هر I/O دیتابیس به await روی درایور async
+    تبدیل می‌شود؛ پس هیچ threadی در طول انتظار برای دیتابیس اشغال نمی‌شود و
+    منطق statementها، ترجمه‌ی IntegrityError و commit/rollback یک‌جا می‌ماند.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        read_session: AsyncSession | None = None,
+    ) -> None:
+        # ⛔ این‌جا Session ساخته نمی‌شود، از بیرون تزریق می‌شود (DI)
+        self.session = session
+        # greenlet ساخته‌شده با run_sync هر درایور async را پوشش می‌دهد، پس
+        # sync_session مربوط به replica هم داخل همان run_sync قابل استفاده است.
+        self._sync = SqlAlchemyStorage(
+            session.sync_session,
+            read_session=read_session.sync_session if read_session else None,
+        )
+
+    async def _run(self, fn: Callable[[], R]) -> R:
+        return await self.session.run_sync(lambda _: fn())
+
+    # ------------- Unit of Work  ------------------------------------
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[None]:
+        """همان قرارداد SqlAlchemyStorage.unit_of_work (تودرتو، یک commit در انتها)."""
+        self._sync._uow_depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._sync._uow_depth == 1:
+                await self.session.rollback()
+            raise
+        else:
+            if self._sync._uow_depth == 1:
+                await self.session.commit()
+        finally:
+            self._sync._uow_depth -= 1
+
+    # ------------- Project متدهای  ---------------------------------
+
+    async def add_project(self, name: str, description: str) -> Project:
+        return await self._run(lambda: self._sync.add_project(name, description))
+
+    async def list_projects(self, query: ProjectQuery | None = None) -> list[Project]:
+        return await self._run(lambda: list(self._sync.list_projects(query)))
+
+    async def list_project_rows(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> list[ProjectRow]:
+        return await self._run(lambda: self._sync.list_project_rows(query))
+
+    async def project_list_marker(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> ChangeMarker:
+        return await self._run(lambda: self._sync.project_list_marker(query))
+
+    async def get_project(self, project_id: int) -> Project:
+        return await self._run(lambda: self._sync.get_project(project_id))
+
+    async def update_project(
+        self,
+        project_id: int,
+        name: str | None = None,
+        description: str | None = None,
+    ) -> Project:
+        return await self._run(
+            lambda: self._sync.update_project(project_id, name, description)
+        )
+
+    async def remove_project(self, project_id: int) -> None:
+        await self._run(lambda: self._sync.remove_project(project_id))
+
+    # ------------- Task متدهای  ------------------------------------
+
+    async def add_task(
+        self,
+        project_id: int,
+        title: str,
+        description: str,
+        deadline: str | None,
+    ) -> Task:
+        return await self._run(
+            lambda: self._sync.add_task(project_id, title, description, deadline)
+        )
+
+    async def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]:
+        return await self._run(lambda: self._sync.add_tasks(project_id, drafts))
+
+    async def existing_titles(
+        self,
+        project_id: int,
+        titles: Iterable[str],
+    ) -> set[str]:
+        titles = list(titles)
+        return await self._run(lambda: self._sync.existing_titles(project_id, titles))
+
+    async def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[Task]:
+        return await self._run(lambda: list(self._sync.list_tasks(project_id, query)))
+
+    async def list_task_rows(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[TaskRow]:
+        return await self._run(lambda: self._sync.list_task_rows(project_id, query))
+
+    async def task_list_marker(self, project_id: int) -> ChangeMarker:
+        return await self._run(lambda: self._sync.task_list_marker(project_id))
+
+    async def search_tasks(self, query: SearchQuery) -> list[SearchHit]:
+        return await self._run(lambda: self._sync.search_tasks(query))
+
+    async def edit_task(
+        self,
+        project_id: int,
+        task_id: int,
+        title: str | None = None,
+        description: str | None = None,
+        status: str | None = None,
+        deadline: str | None = None,
+    ) -> Task:
+        return await self._run(
+            lambda: self._sync.edit_task(
+                project_id,
+                task_id,
+                title=title,
+                description=description,
+                status=status,
+                deadline=deadline,
+            )
+        )
+
+    async def change_task_status(
+        self,
+        project_id: int,
+        task_id: int,
+        status: str,
+    ) -> Task:
+        return await self._run(
+            lambda: self._sync.change_task_status(project_id, task_id, status)
+        )
+
+    async def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        return await self._run(
+            lambda: self._sync.update_tasks(
+                project_id,
+                query,
+                changes,
+                returning=returning,
+            )
+        )
+
+    async def remove_task(self, project_id: int, task_id: int) -> None:
+        await self._run(lambda: self._sync.remove_task(project_id, task_id))
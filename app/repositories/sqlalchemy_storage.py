@@ -1,20 +1,282 @@
 from __future__ import annotations
 
-from typing import Iterable
+from contextlib import contextmanager
+from typing import Iterable, Iterator
 from datetime import date, datetime, timezone
 
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
-from app.models.project import Project
+from sqlalchemy import (
+    Double,
+    Row,
+    Select,
+    and_,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from app.models.bulk import BulkUpdateResult, TaskChanges, TaskDraft
+from app.models.project import Project, TaskCounts
 from app.models.task import Task, Status
 from app.models.orm import ProjectORM, TaskORM
+from app.models.query import (
+    ChangeMarker,
+    ProjectQuery,
+    ProjectRow,
+    TaskQuery,
+    TaskRow,
+    TaskSort,
+)
+from app.models.search import SEARCH_CONFIG, SearchHit, SearchQuery
 from app.exceptions.base import NotFoundError, ValidationError
 from app.services.project_service import ProjectStoragePort
 from app.services.task_service import TaskStoragePort
 
 
+# SQLSTATEهای PostgreSQL برای نقض unique و foreign key
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+# ستون‌هایی که INSERT/UPDATE ... RETURNING برمی‌گردانند (بدون refresh بعد از commit)
+_PROJECT_COLUMNS = tuple(ProjectORM.__table__.c)
+_TASK_COLUMNS = tuple(TaskORM.__table__.c)
+# ستون tsvector تولیدشده (migration c3f7a9d1b6e2)؛ در TaskORM map نشده تا
+# INSERT/UPDATE ... RETURNING و create_all روی دیتابیس‌های دیگر درگیرش نشوند.
+_SEARCH_VECTOR = column("search_vector", TSVECTOR)
+# شرط partial index ``ix_tasks_open_deadline``؛ 'done' داخل SQL نوشته می‌شود
+# (نه به صورت پارامتر) تا planner حتی با plan عمومی هم index را قابل استفاده ببیند.
+_OPEN_TASK = TaskORM.status != literal(Status.DONE.value, literal_execute=True)
+
+# ستون‌های نمایشی برای مسیر سریع لیست‌ها (list_task_rows / list_project_rows)،
+# به ترتیب فیلدهای پاسخ API؛ با ?fields= فقط زیرمجموعه‌ای از آن‌ها select می‌شود.
+_TASK_ROW_COLUMNS = {
+    column.key: column
+    for column in (
+        TaskORM.id,
+        TaskORM.title,
+        TaskORM.description,
+        TaskORM.status,
+        TaskORM.deadline,
+        TaskORM.at_closed,
+    )
+}
+_PROJECT_ROW_COLUMNS = {
+    column.key: column
+    for column in (
+        ProjectORM.id,
+        ProjectORM.name,
+        ProjectORM.description,
+        ProjectORM.created_at,
+    )
+}
+
+
+def _violation(exc: IntegrityError, sqlstate: str, fallback: str) -> bool:
+    """آیا IntegrityError از نوع SQLSTATE داده‌شده است؟
+
+    psycopg کد SQLSTATE را روی ``orig.sqlstate`` می‌گذارد؛ برای درایورهای دیگر
+    (مثل sqlite) به متن پیام خطا بسنده می‌کنیم.
+    """
+    actual = getattr(exc.orig, "sqlstate", None)
+    if actual is not None:
+        return actual == sqlstate
+    return fallback in str(exc.orig).upper()
+
+
+def _is_unique_violation(exc: IntegrityError) -> bool:
+    return _violation(exc, UNIQUE_VIOLATION, "UNIQUE")
+
+
+def _is_foreign_key_violation(exc: IntegrityError) -> bool:
+    return _violation(exc, FOREIGN_KEY_VIOLATION, "FOREIGN KEY")
+
+
+def _to_project(orm: ProjectORM | Row) -> Project:
+    return Project(
+        id=orm.id,
+        name=orm.name,
+        description=orm.description,
+        created_at=orm.created_at,
+        tasks=[],  # اگر خواستیم، بعداً می‌تونیم taskها رو هم map کنیم
+    )
+
+
+def _to_task(orm: TaskORM | Row) -> Task:
+    return Task(
+        id=orm.id,
+        title=orm.title,
+        description=orm.description,
+        status=orm.status,
+        deadline=orm.deadline,
+        at_closed=orm.at_closed,
+        created_at=orm.created_at,
+    )
+
+
+def _row_columns(
+    columns: dict[str, ColumnElement],
+    fields: tuple[str, ...] | None,
+    *,
+    always: Iterable[str] = ("id",),
+) -> list[ColumnElement]:
+    """ستون‌های لازم برای ``fields`` (به ترتیب ``columns``) به علاوه‌ی ``always``.
+
+    ستون‌های ``always`` (id و ستون مرتب‌سازی) برای keyset لازم‌اند و در خروجی
+    API دوباره حذف می‌شوند؛ نام‌هایی که ستون نیستند (مثل task_counts) نادیده
+    گرفته می‌شوند.
+    """
+    if fields is None:
+        return list(columns.values())
+    wanted = {*fields, *always}
+    return [column for name, column in columns.items() if name in wanted]
+
+
+def _wants(fields: tuple[str, ...] | None, name: str) -> bool:
+    return fields is None or name in fields
+
+
+def _status_counts() -> list:
+    """ستون‌های count(...) FILTER (WHERE status = ...) برای هر status."""
+    return [
+        func.count(TaskORM.id).filter(TaskORM.status == s.value).label(s.value)
+        for s in Status
+    ]
+
+
+def _top_tasks(project_ids: list[int], limit: int):
+    """زیرکوئری تسک‌ها با rank هر تسک در پروژه‌اش (بر اساس deadline)."""
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=TaskORM.project_id,
+            order_by=_task_order_by(TaskSort.DEADLINE),
+        )
+        .label("rank")
+    )
+    return (
+        select(TaskORM, rank)
+        .where(TaskORM.project_id.in_(project_ids))
+        .subquery()
+    )
+
+
+def _task_conditions(query: TaskQuery) -> list:
+    """شرط‌های WHERE فیلترها؛ همه روی index (project_id, status, deadline) می‌نشینند."""
+    conditions = []
+    if query.ids is not None:
+        conditions.append(TaskORM.id.in_(query.ids))
+    if query.status is not None:
+        conditions.append(TaskORM.status == query.status.value)
+    if query.deadline_from is not None:
+        conditions.append(TaskORM.deadline >= query.deadline_from)
+    if query.deadline_to is not None:
+        conditions.append(TaskORM.deadline <= query.deadline_to)
+    if query.overdue_on is not None:
+        conditions.append(TaskORM.deadline < query.overdue_on)
+        conditions.append(TaskORM.status != Status.DONE.value)
+    return conditions
+
+
+def _status_values(status: str) -> dict:
+    """مقادیر SET برای تغییر status با همان منطق at_closed دامنه.
+
+    اگر به DONE رفت و at_closed خالی بود → الان مقدار بده (coalesce)؛
+    اگر وضعیت جدید غیر DONE است → at_closed را خالی کن.
+    """
+    if status == Status.DONE.value:
+        at_closed = func.coalesce(TaskORM.at_closed, datetime.now(timezone.utc))
+    else:
+        at_closed = None
+    return {"status": status, "at_closed": at_closed}
+
+
+def _task_order_by(sort: TaskSort) -> list:
+    if sort is TaskSort.DEADLINE:
+        # تسک‌های بدون deadline آخر می‌آیند (مثل InMemoryStorage)؛ در PostgreSQL
+        # ASC خودش NULLS LAST است، پس index (project_id, deadline, id) مستقیم
+        # همین ترتیب را می‌دهد و sort لازم نیست
+        return [TaskORM.deadline.asc().nulls_last(), TaskORM.id]
+    if sort is TaskSort.CREATED_AT:
+        return [TaskORM.created_at, TaskORM.id]
+    return [TaskORM.id]
+
+
+def _task_keyset(query: TaskQuery):
+    """شرط «بعد از آخرین ردیف صفحه‌ی قبل» متناسب با ترتیب مرتب‌سازی.
+
+    همه‌ی شرط‌ها sargable هستند (مقایسه‌ی row روی ستون‌های index)؛ ادامه‌ی
+    ترتیب deadline بعد از یک تاریخ (که دم NULL را هم لازم دارد) در
+    _deadline_page_after جدا ساخته می‌شود، نه با OR.
+    """
+    *leading, last_id = query.after
+    if query.sort is TaskSort.DEADLINE:
+        (deadline,) = leading
+        if deadline is None:
+            return and_(TaskORM.deadline.is_(None), TaskORM.id > last_id)
+        return tuple_(TaskORM.deadline, TaskORM.id) > tuple_(deadline, last_id)
+    if query.sort is TaskSort.CREATED_AT:
+        (created_at,) = leading
+        return tuple_(TaskORM.created_at, TaskORM.id) > tuple_(created_at, last_id)
+    return TaskORM.id > last_id
+
+
+def _task_list_stmt(stmt: Select, project_id: int, query: TaskQuery) -> Select:
+    """فیلتر، ترتیب، keyset و limit لیست تسک‌های یک پروژه روی ``stmt``."""
+    stmt = stmt.where(
+        TaskORM.project_id == project_id,
+        *_task_conditions(query),
+    )
+    if (
+        query.sort is TaskSort.DEADLINE
+        and query.after is not None
+        and query.after[0] is not None
+    ):
+        return _deadline_page_after(stmt, query)
+    stmt = stmt.order_by(*_task_order_by(query.sort))
+    if query.after is not None:
+        stmt = stmt.where(_task_keyset(query))
+    if query.limit is not None:
+        stmt = stmt.limit(query.limit)
+    return stmt
+
+
+def _deadline_page_after(stmt: Select, query: TaskQuery) -> Select:
+    """صفحه‌ی بعد از یک تسک دارای deadline در ترتیب (deadline NULLS LAST, id).
+
+    دو شاخه، هر کدام یک range scan مرتب روی index با limit خودش: تسک‌های
+    بعد از (deadline, id) و دم NULL (به ترتیب id). UNION ALL آن‌ها حداکثر
+    2 × limit ردیف است و فقط همین‌ها برای ترتیب نهایی sort می‌شوند. با
+    ``OR deadline IS NULL`` در یک شرط، PostgreSQL کل پروژه را sort می‌کرد.
+    """
+    dated = stmt.where(_task_keyset(query)).order_by(TaskORM.deadline, TaskORM.id)
+    undated = stmt.where(TaskORM.deadline.is_(None)).order_by(TaskORM.id)
+    if query.limit is not None:
+        dated = dated.limit(query.limit)
+        undated = undated.limit(query.limit)
+    # هر شاخه داخل subquery، چون sqlite در UNION ORDER BY/LIMIT عضوها را نمی‌پذیرد
+    page = union_all(
+        select(dated.subquery()),
+        select(undated.subquery()),
+    ).subquery()
+    stmt = select(*page.c).order_by(page.c.deadline.asc().nulls_last(), page.c.id)
+    if query.limit is not None:
+        stmt = stmt.limit(query.limit)
+    return stmt
+
+
 class SqlAlchemyStorage(ProjectStoragePort, TaskStoragePort):
     """پیاده‌سازی دیتابیسی Storage با استفاده از SQLAlchemy.
 
@@ -22,9 +284,58 @@ class SqlAlchemyStorage(ProjectStoragePort, TaskStoragePort):
     مثل InMemoryStorage، اما داده‌ها را در PostgreSQL نگه می‌دارد.
     """
 
-    def __init__(self, session: Session) -> None:
+    def __init__(
+        self,
+        session: Session,
+        *,
+        read_session: Session | None = None,
+    ) -> None:
         # ⛔ این‌جا Session ساخته نمی‌شود، از بیرون تزریق می‌شود (DI)
         self.session = session
+        # Session روی replica برای list/get (اختیاری)؛ None یعنی همه‌چیز روی primary
+        self.read_session = read_session
+        self._uow_depth = 0
+        self._has_written = False
+
+    @property
+    def _reader(self) -> Session:
+        """Session خواندنی‌ها: replica، مگر این‌که همین storage قبلاً نوشته باشد.
+
+        بعد از اولین نوشتن همه‌ی خواندن‌ها به primary می‌روند تا درخواست
+        نوشته‌ی خودش را ببیند (read-your-writes) و lag replica دیده نشود.
+        """
+        if self.read_session is None or self._has_written:
+            return self.session
+        return self.read_session
+
+    # ------------- Unit of Work  ------------------------------------
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        """همه‌ی نوشتن‌های داخل بلوک در یک تراکنش و با یک commit.
+
+        بیرون از unit_of_work هر متد نوشتنی خودش commit می‌کند؛ داخل آن، commit
+        به انتهای بیرونی‌ترین بلوک موکول می‌شود (بلوک‌های تودرتو مجازند). اگر
+        استثنایی از بلوک بیرون برود کل تراکنش rollback می‌شود؛ خطای یک عملیات
+        داخل بلوک هم تراکنش را باطل می‌کند، پس نباید آن را بلعید و ادامه داد.
+        """
+        self._uow_depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._uow_depth == 1:
+                self.session.rollback()
+            raise
+        else:
+            if self._uow_depth == 1:
+                self.session.commit()
+        finally:
+            self._uow_depth -= 1
+
+    def _commit(self) -> None:
+        self._has_written = True
+        if self._uow_depth == 0:
+            self.session.commit()
 
     # ------------- Project متدهای  ---------------------------------
 
@@ -43,41 +354,218 @@ class SqlAlchemyStorage(ProjectStoragePort, TaskStoragePort):
                 f"invalid deadline format: '{deadline}'. Expected YYYY-MM-DD (e.g. 2025-12-31)"
             )
 
+    @contextmanager
+    def _integrity_errors(
+        self,
+        *,
+        duplicate_message: str | None = None,
+        missing_message: str | None = None,
+    ) -> Iterator[None]:
+        """ترجمه‌ی IntegrityError به خطای دامنه (بعد از rollback)."""
+        try:
+            yield
+        except IntegrityError as exc:
+            self.session.rollback()
+            if duplicate_message is not None and _is_unique_violation(exc):
+                raise ValidationError(duplicate_message) from exc
+            if missing_message is not None and _is_foreign_key_violation(exc):
+                raise NotFoundError(missing_message) from exc
+            raise
+
+    def _write(
+        self,
+        stmt,
+        *,
+        duplicate_message: str | None = None,
+        missing_message: str | None = None,
+    ):
+        """اجرای یک INSERT/UPDATE ... RETURNING و commit، در یک رفت‌وبرگشت.
+
+        خطاهای IntegrityError به خطاهای دامنه ترجمه می‌شوند:
+        - نقض unique index (lower(trim(...))) → ValidationError؛ یکتایی را خود
+          دیتابیس تضمین می‌کند، پس نیازی به اسکن جدول و check-then-insert نیست.
+        - نقض foreign key (پروژه‌ی ناموجود) → NotFoundError؛ به جای یک
+          session.get جداگانه قبل از INSERT.
+        اگر هیچ ردیفی برنگردد (UPDATE روی ردیف ناموجود) → NotFoundError.
+        """
+        with self._integrity_errors(
+            duplicate_message=duplicate_message,
+            missing_message=missing_message,
+        ):
+            row = self.session.execute(
+                stmt.execution_options(synchronize_session=False)
+            ).one_or_none()
+
+        if row is None:
+            self.session.rollback()
+            raise NotFoundError(missing_message)
+
+        self._commit()
+        return row
+
     def add_project(self, name: str, description: str) -> Project:
-        orm = ProjectORM(name=name, description=description)
-        self.session.add(orm)
-        self.session.commit()
-        self.session.refresh(orm)
-        return Project(
-            id=orm.id,
-            name=orm.name,
-            description=orm.description,
-            tasks=[],
-        )
-
-    def list_projects(self) -> Iterable[Project]:
-        stmt = select(ProjectORM).order_by(ProjectORM.id)
-        result = self.session.execute(stmt)
-        for row in result.scalars():
-            yield Project(
-                id=row.id,
-                name=row.name,
-                description=row.description,
-                tasks=[],  # اگر خواستیم، بعداً می‌تونیم taskها رو هم map کنیم
+        stmt = (
+            insert(ProjectORM)
+            .values(name=name, description=description)
+            .returning(*_PROJECT_COLUMNS)
+        )
+        row = self._write(
+            stmt,
+            duplicate_message=f"project name '{name}' already exists",
+        )
+        return _to_project(row)
+
+    def list_projects(self, query: ProjectQuery | None = None) -> Iterable[Project]:
+        query = query or ProjectQuery()
+        if query.with_counts:
+            projects = self._list_projects_with_counts(query)
+        else:
+            stmt = self._paginate_projects(select(ProjectORM), query)
+            projects = (_to_project(row) for row in self._reader.scalars(stmt))
+
+        if query.tasks_limit is not None:
+            projects = self._attach_top_tasks(list(projects), query.tasks_limit)
+        yield from projects
+
+    def _attach_top_tasks(self, projects: list[Project], limit: int) -> list[Project]:
+        """N تسک اول (بر اساس deadline) هر پروژه‌ی صفحه را در یک کوئری بار می‌کند.
+
+        با row_number() OVER (PARTITION BY project_id ...) به جای یک list_tasks
+        برای هر پروژه (1+N درخواست)؛ روی index (project_id, deadline) می‌نشیند.
+        """
+        if not projects:
+            return projects
+
+        ranked = _top_tasks([p.id for p in projects], limit)
+        task = aliased(TaskORM, ranked)
+        stmt = (
+            select(task)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.project_id, ranked.c.rank)
+        )
+
+        by_id = {p.id: p for p in projects}
+        for orm in self._reader.scalars(stmt):
+            by_id[orm.project_id].tasks.append(_to_task(orm))
+        return projects
+
+    def list_project_rows(self, query: ProjectQuery | None = None) -> list[ProjectRow]:
+        """همان list_projects به شکل dictهای ساده، فقط با فیلدهای ``query.fields``.
+
+        ستون‌های نخواسته select نمی‌شوند و اگر task_counts یا tasks در fields
+        نباشند، GROUP BY شمارش‌ها و کوئری تسک‌های embed هم اجرا نمی‌شوند.
+        """
+        query = query or ProjectQuery()
+        columns = _row_columns(_PROJECT_ROW_COLUMNS, query.fields)
+        with_counts = query.with_counts and _wants(query.fields, "task_counts")
+        stmt = select(*columns)
+        if with_counts:
+            stmt = (
+                stmt.add_columns(*_status_counts())
+                .outerjoin(TaskORM, TaskORM.project_id == ProjectORM.id)
+                .group_by(ProjectORM.id)
+            )
+        stmt = self._paginate_projects(stmt, query)
+
+        names = [column.key for column in columns]
+        rows = []
+        for row in self._reader.execute(stmt).mappings():
+            item = {name: row[name] for name in names}
+            item["task_counts"] = (
+                {
+                    "todo": row["todo"],
+                    "doing": row["doing"],
+                    "done": row["done"],
+                    "total": row["todo"] + row["doing"] + row["done"],
+                }
+                if with_counts
+                else None
+            )
+            item["tasks"] = None
+            rows.append(item)
+
+        if query.tasks_limit is not None and _wants(query.fields, "tasks"):
+            self._attach_top_task_rows(rows, query.tasks_limit)
+        return rows
+
+    def _attach_top_task_rows(self, rows: list[ProjectRow], limit: int) -> None:
+        """نسخه‌ی ردیفی _attach_top_tasks (همان یک کوئری row_number)."""
+        if not rows:
+            return
+        ranked = _top_tasks([row["id"] for row in rows], limit)
+        stmt = (
+            select(ranked.c.project_id, *(ranked.c[name] for name in _TASK_ROW_COLUMNS))
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.project_id, ranked.c.rank)
+        )
+        by_id = {row["id"]: row for row in rows}
+        for row in rows:
+            row["tasks"] = []
+        for task in self._reader.execute(stmt).mappings():
+            by_id[task["project_id"]]["tasks"].append(
+                {name: task[name] for name in _TASK_ROW_COLUMNS}
+            )
+
+    def _paginate_projects(self, stmt, query: ProjectQuery):
+        stmt = stmt.order_by(ProjectORM.id)
+        # keyset pagination: هزینه‌ی صفحه N مثل صفحه ۱ است (index روی PK)
+        if query.after is not None:
+            stmt = stmt.where(ProjectORM.id > query.after[-1])
+        if query.limit is not None:
+            stmt = stmt.limit(query.limit)
+        return stmt
+
+    def _list_projects_with_counts(self, query: ProjectQuery) -> Iterable[Project]:
+        """پروژه‌ها به همراه تعداد تسک‌ها به تفکیک status در یک کوئری GROUP BY."""
+        stmt = self._paginate_projects(
+            select(ProjectORM, *_status_counts())
+            .outerjoin(TaskORM, TaskORM.project_id == ProjectORM.id)
+            .group_by(ProjectORM.id),
+            query,
+        )
+        for row in self._reader.execute(stmt):
+            project = _to_project(row[0])
+            project.task_counts = TaskCounts(
+                todo=row.todo,
+                doing=row.doing,
+                done=row.done,
             )
+            yield project
+
+    def project_list_marker(self, query: ProjectQuery | None = None) -> ChangeMarker:
+        """(id، updated_at) پروژه‌های همان صفحه‌ی ``query``؛ مبنای ETag لیست پروژه‌ها.
+
+        اگر لیست تسک‌ها را embed کند (counts یا tasks)، (تعداد، آخرین updated_at)
+        تسک‌های همین پروژه‌ها هم اضافه می‌شود. فقط صفحه‌ی درخواستی خوانده
+        می‌شود (keyset روی PK) و تسک‌ها از روی index (project_id, updated_at)،
+        پس هزینه‌اش با بزرگ شدن جدول‌ها بیشتر نمی‌شود.
+        """
+        query = query or ProjectQuery()
+        page = self._reader.execute(
+            self._paginate_projects(
+                select(ProjectORM.id, ProjectORM.updated_at),
+                query,
+            )
+        ).all()
+        marker: ChangeMarker = tuple(tuple(row) for row in page)
+        if query.with_counts or query.tasks_limit is not None:
+            ids = [row.id for row in page]
+            marker += tuple(
+                self._reader.execute(
+                    select(func.count(TaskORM.id), func.max(TaskORM.updated_at)).where(
+                        TaskORM.project_id.in_(ids)
+                    )
+                ).one()
+            )
+        return marker
 
     def get_project(self, project_id: int) -> Project:
-        orm = self.session.get(ProjectORM, project_id)
+        orm = self._reader.get(ProjectORM, project_id)
         if orm is None:
             raise NotFoundError(f"project with id={project_id} not found")
 
         # اگر خواستی taskها رو هم اضافه کنی، این‌جا می‌تونی map کنی.
-        return Project(
-            id=orm.id,
-            name=orm.name,
-            description=orm.description,
-            tasks=[],
-        )
+        return _to_project(orm)
 
     def update_project(
         self,
@@ -85,32 +573,38 @@ class SqlAlchemyStorage(ProjectStoragePort, TaskStoragePort):
         name: str | None = None,
         description: str | None = None,
     ) -> Project:
-        orm = self.session.get(ProjectORM, project_id)
-        if orm is None:
-            raise NotFoundError(f"project with id={project_id} not found")
-
+        changes = {}
         if name is not None:
-            orm.name = name
+            changes["name"] = name
         if description is not None:
-            orm.description = description
-
-        self.session.commit()
-        self.session.refresh(orm)
+            changes["description"] = description
+        if not changes:
+            return self.get_project(project_id)
 
-        return Project(
-            id=orm.id,
-            name=orm.name,
-            description=orm.description,
-            tasks=[],
+        stmt = (
+            update(ProjectORM)
+            .where(ProjectORM.id == project_id)
+            .values(**changes)
+            .returning(*_PROJECT_COLUMNS)
+        )
+        row = self._write(
+            stmt,
+            duplicate_message=f"project name '{name}' already exists",
+            missing_message=f"project with id={project_id} not found",
         )
+        return _to_project(row)
 
     def remove_project(self, project_id: int) -> None:
-        orm = self.session.get(ProjectORM, project_id)
-        if orm is None:
-            raise NotFoundError(f"project with id={project_id} not found")
-
-        self.session.delete(orm)
-        self.session.commit()
+        # تسک‌ها با ON DELETE CASCADE خود دیتابیس حذف می‌شوند
+        stmt = (
+            delete(ProjectORM)
+            .where(ProjectORM.id == project_id)
+            .returning(ProjectORM.id)
+        )
+        self._write(
+            stmt,
+            missing_message=f"project with id={project_id} not found",
+        )
 
     # ------------- Task متدهای  ------------------------------------
 
@@ -123,61 +617,147 @@ class SqlAlchemyStorage(ProjectStoragePort, TaskStoragePort):
     ) -> Task:
         deadline_date = self._parse_deadline(deadline)
 
-        project = self.session.get(ProjectORM, project_id)
-        if project is None:
-            raise NotFoundError(f"project {project_id} not found")
+        # وجود پروژه از روی نقض foreign key تشخیص داده می‌شود (بدون session.get)
+        stmt = (
+            insert(TaskORM)
+            .values(
+                project_id=project_id,
+                title=title,
+                description=description,
+                status="todo",
+                deadline=deadline_date,
+            )
+            .returning(*_TASK_COLUMNS)
+        )
+        row = self._write(
+            stmt,
+            duplicate_message=(
+                f"task title '{title}' already exists in project {project_id}"
+            ),
+            missing_message=f"project {project_id} not found",
+        )
+        return _to_task(row)
 
-        orm = TaskORM(
-            project_id=project_id,
-            title=title,
-            description=description,
-            status="todo",
-            deadline=deadline_date,
-        )
-        self.session.add(orm)
-        self.session.commit()
-        self.session.refresh(orm)
-
-        return Task(
-            id=orm.id,
-            title=orm.title,
-            description=orm.description,
-            status=orm.status,
-            deadline=orm.deadline,
-            at_closed=orm.at_closed,
-        )
-
-    def list_tasks(self, project_id: int) -> Iterable[Task]:
-        # اول مطمئن شویم پروژه وجود دارد؛ اگر نبود → NotFoundError
-        project = self.session.get(ProjectORM, project_id)
-        if project is None:
-            raise NotFoundError(f"project with id={project_id} not found")
+    def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]:
+        """درج گروهی تسک‌ها با یک INSERT چندردیفی (insertmanyvalues) و یک commit.
 
+        ترتیب خروجی همان ترتیب drafts است. ولیدیشن دامنه و چک یکتایی در سرویس
+        انجام شده؛ اگر در این فاصله عنوان تکراری درج شده باشد، unique index کل
+        batch را رد می‌کند (ValidationError).
+        """
+        if not drafts:
+            if not self._project_exists(project_id):
+                raise NotFoundError(f"project {project_id} not found")
+            return []
+
+        stmt = insert(TaskORM).returning(*_TASK_COLUMNS, sort_by_parameter_order=True)
+        params = [
+            {
+                "project_id": project_id,
+                "title": d.title,
+                "description": d.description,
+                "status": Status.TODO.value,
+                "deadline": self._parse_deadline(d.deadline),
+            }
+            for d in drafts
+        ]
+        with self._integrity_errors(
+            duplicate_message=f"a task title already exists in project {project_id}",
+            missing_message=f"project {project_id} not found",
+        ):
+            rows = self.session.execute(stmt, params).all()
+        self._commit()
+        return [_to_task(row) for row in rows]
+
+    def existing_titles(self, project_id: int, titles: Iterable[str]) -> set[str]:
+        """از بین عنوان‌های نرمال‌شده، آن‌هایی که در پروژه وجود دارند (یک کوئری).
+
+        LEFT JOIN از projects باعث می‌شود نبودن پروژه هم در همین کوئری معلوم
+        شود؛ شرط روی lower(trim(title)) از unique index تابعی استفاده می‌کند.
+        """
+        normalized = func.lower(func.trim(TaskORM.title))
         stmt = (
-            select(TaskORM)
-            .where(TaskORM.project_id == project_id)
-            .order_by(TaskORM.id)
-        )
-        result = self.session.execute(stmt)
-        for orm in result.scalars():
-            yield Task(
-                id=orm.id,
-                title=orm.title,
-                description=orm.description,
-                status=orm.status,
-                deadline=orm.deadline,
-                at_closed=orm.at_closed,
+            select(ProjectORM.id, normalized)
+            .outerjoin(
+                TaskORM,
+                and_(
+                    TaskORM.project_id == ProjectORM.id,
+                    normalized.in_(list(titles)),
+                ),
             )
+            .where(ProjectORM.id == project_id)
+        )
+        rows = self.session.execute(stmt).all()
+        if not rows:
+            raise NotFoundError(f"project {project_id} not found")
+        return {title for _, title in rows if title is not None}
+
+    def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> Iterable[Task]:
+        query = query or TaskQuery()
+        stmt = _task_list_stmt(select(*_TASK_COLUMNS), project_id, query)
+        reader = self._reader
+        found = False
+        for row in reader.execute(stmt):
+            found = True
+            yield _to_task(row)
+
+        # وجود پروژه فقط وقتی چک می‌شود که نتیجه خالی باشد؛ در حالت عادی
+        # لیست‌کردن یک کوئری است، نه دو تا.
+        if not found and not self._project_exists(project_id, session=reader):
+            raise NotFoundError(f"project with id={project_id} not found")
+
+    def list_task_rows(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[TaskRow]:
+        """همان list_tasks ولی به شکل dictهای ساده‌ی ستون‌ها، بدون ساختن Task.
 
-    def _get_task_orm(self, project_id: int, task_id: int) -> TaskORM:
-        stmt = select(TaskORM).where(
-            TaskORM.id == task_id,
-            TaskORM.project_id == project_id,
+        فقط ستون‌های نمایشی خواسته‌شده در ``query.fields`` (به علاوه‌ی id و ستون
+        مرتب‌سازی برای cursor) انتخاب می‌شوند؛ مقدارها همان‌هایی هستند که دیتابیس برگردانده و
+        اعتبارسنجی ``Task.__post_init__`` رویشان اجرا نمی‌شود.
+        """
+        query = query or TaskQuery()
+        columns = _row_columns(
+            _TASK_ROW_COLUMNS,
+            query.fields,
+            always=("id", "deadline") if query.sort is TaskSort.DEADLINE else ("id",),
         )
-        result = self.session.execute(stmt).scalar_one_or_none()
-        if result is None:
-            raise NotFoundError(f"task with id={task_id} in project {project_id} not found")
-        return result
+        if query.sort is TaskSort.CREATED_AT:
+            columns.append(TaskORM.created_at)
+        stmt = _task_list_stmt(select(*columns), project_id, query)
+        reader = self._reader
+        rows = [dict(row) for row in reader.execute(stmt).mappings()]
+        if not rows and not self._project_exists(project_id, session=reader):
+            raise NotFoundError(f"project with id={project_id} not found")
+        return rows
+
+    def task_list_marker(self, project_id: int) -> ChangeMarker:
+        """(تعداد، آخرین updated_at) تسک‌های پروژه از روی index (project_id, updated_at).
+
+        :raises NotFoundError: اگر پروژه وجود نداشته باشد
+        """
+        reader = self._reader
+        stmt = select(func.count(TaskORM.id), func.max(TaskORM.updated_at)).where(
+            TaskORM.project_id == project_id
+        )
+        count, last_updated = reader.execute(stmt).one()
+        if count == 0 and not self._project_exists(project_id, session=reader):
+            raise NotFoundError(f"project with id={project_id} not found")
+        return (count, last_updated)
+
+    def _project_exists(
+        self,
+        project_id: int,
+        *,
+        session: Session | None = None,
+    ) -> bool:
+        stmt = select(ProjectORM.id).where(ProjectORM.id == project_id)
+        return (session or self.session).scalar(stmt) is not None
 
     def edit_task(
         self,
@@ -188,52 +768,188 @@ class SqlAlchemyStorage(ProjectStoragePort, TaskStoragePort):
         status: str | None = None,
         deadline: str | None = None,
     ) -> Task:
-        orm = self._get_task_orm(project_id, task_id)
-
-        # اینجا ORM را آپدیت می‌کنیم، منطق اعتبارسنجی را می‌گذاریم گردن دامنه (Task)
+        # منطق اعتبارسنجی را می‌گذاریم گردن دامنه/سرویس؛ اینجا فقط یک UPDATE
+        changes = {}
         if title is not None:
-            orm.title = title
+            changes["title"] = title
         if description is not None:
-            orm.description = description
+            changes["description"] = description
         if status is not None:
-            orm.status = status
+            changes["status"] = status
         if deadline is not None:
-            orm.deadline = self._parse_deadline(deadline)
+            changes["deadline"] = self._parse_deadline(deadline)
 
-        self.session.commit()
-        self.session.refresh(orm)
+        missing_message = f"task with id={task_id} in project {project_id} not found"
+        if not changes:
+            stmt = select(*_TASK_COLUMNS).where(*self._task_where(project_id, task_id))
+            row = self.session.execute(stmt).one_or_none()
+            if row is None:
+                raise NotFoundError(missing_message)
+            return _to_task(row)
 
-        return Task(
-            id=orm.id,
-            title=orm.title,
-            description=orm.description,
-            status=orm.status,
-            deadline=orm.deadline,
-            at_closed=orm.at_closed,
+        stmt = (
+            update(TaskORM)
+            .where(*self._task_where(project_id, task_id))
+            .values(**changes)
+            .returning(*_TASK_COLUMNS)
+        )
+        row = self._write(
+            stmt,
+            duplicate_message=(
+                f"task title '{title}' already exists in project {project_id}"
+            ),
+            missing_message=missing_message,
         )
+        return _to_task(row)
 
     def change_task_status(
         self,
         project_id: int,
         task_id: int,
         status: str,
-    ) -> None:
-        orm = self._get_task_orm(project_id, task_id)
+    ) -> Task:
+        # منطق at_closed مطابق Domain، داخل همان یک UPDATE
+        stmt = (
+            update(TaskORM)
+            .where(*self._task_where(project_id, task_id))
+            .values(**_status_values(status))
+            .returning(*_TASK_COLUMNS)
+        )
+        row = self._write(
+            stmt,
+            missing_message=(
+                f"task with id={task_id} in project {project_id} not found"
+            ),
+        )
+        return _to_task(row)
 
-        old_status = orm.status
-        orm.status = status
+    def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        """اعمال تغییر status/deadline روی همه‌ی تسک‌های منطبق با فیلتر در یک UPDATE."""
+        values = {}
+        if changes.status is not None:
+            values.update(_status_values(changes.status.value))
+        if changes.deadline is not None:
+            values["deadline"] = changes.deadline
+        if changes.shift_deadline_days is not None:
+            # date + integer در PostgreSQL؛ deadline خالی (NULL) خالی می‌ماند
+            values["deadline"] = TaskORM.deadline + changes.shift_deadline_days
 
-        # منطق at_closed مطابق Domain:
-        # اگر از غیر DONE → به DONE رفت و at_closed خالی بود → الان مقدار بده
-        if status == Status.DONE.value and orm.at_closed is None:
-            orm.at_closed = datetime.now(timezone.utc)
-        # اگر وضعیت جدید غیر DONE است → at_closed را خالی کن
-        elif status != Status.DONE.value:
-            orm.at_closed = None
+        stmt = (
+            update(TaskORM)
+            .where(TaskORM.project_id == project_id, *_task_conditions(query))
+            .values(**values)
+            .returning(*(_TASK_COLUMNS if returning else (TaskORM.id,)))
+            .execution_options(synchronize_session=False)
+        )
+        rows = self.session.execute(stmt).all()
+        if not rows and not self._project_exists(project_id):
+            self.session.rollback()
+            raise NotFoundError(f"project with id={project_id} not found")
+        self._commit()
 
-        self.session.commit()
+        return BulkUpdateResult(
+            updated=len(rows),
+            tasks=[_to_task(row) for row in rows] if returning else None,
+        )
 
     def remove_task(self, project_id: int, task_id: int) -> None:
-        orm = self._get_task_orm(project_id, task_id)
-        self.session.delete(orm)
-        self.session.commit()
+        stmt = (
+            delete(TaskORM)
+            .where(*self._task_where(project_id, task_id))
+            .returning(TaskORM.id)
+        )
+        self._write(
+            stmt,
+            missing_message=(
+                f"task with id={task_id} in project {project_id} not found"
+            ),
+        )
+
+    def _task_where(self, project_id: int, task_id: int) -> tuple:
+        return (TaskORM.id == task_id, TaskORM.project_id == project_id)
+
+    # --- Search -------------------------------------------------------
+    def search_tasks(self, query: SearchQuery) -> list[SearchHit]:
+        """جستجوی متن کامل در عنوان/توضیح تسک‌های همه‌ی پروژه‌ها (PostgreSQL).
+
+        شرط ``search_vector @@ plainto_tsquery(...)`` روی GIN index می‌نشیند؛
+        مرتب‌سازی بر اساس ts_rank نزولی و بعد id است و keyset روی (rank, id)
+        صفحه‌بندی می‌کند. rank به double تبدیل می‌شود تا مقداری که در cursor
+        برمی‌گردد دقیقاً با همان مقدار در دیتابیس برابر باشد.
+        """
+        tsquery = func.plainto_tsquery(SEARCH_CONFIG, query.text)
+        rank = cast(func.ts_rank(_SEARCH_VECTOR, tsquery), Double)
+        stmt = (
+            select(*_TASK_COLUMNS, rank.label("rank"))
+            .where(_SEARCH_VECTOR.op("@@")(tsquery))
+            .order_by(rank.desc(), TaskORM.id)
+        )
+        if query.after is not None:
+            after_rank, after_id = query.after
+            stmt = stmt.where(
+                or_(
+                    rank < after_rank,
+                    and_(rank == after_rank, TaskORM.id > after_id),
+                )
+            )
+        if query.limit is not None:
+            stmt = stmt.limit(query.limit)
+        return [
+            SearchHit(task=_to_task(row), project_id=row.project_id, rank=row.rank)
+            for row in self._reader.execute(stmt)
+        ]
+
+    # --- Overdue ------------------------------------------------------
+    def iter_overdue(
+        self,
+        today: date | None = None,
+        *,
+        batch_size: int = 1000,
+    ) -> Iterator[Task]:
+        """تسک‌های باز با deadline < today در همه‌ی پروژه‌ها، به ترتیب (deadline, id).
+
+        کوئری دقیقاً روی partial index ``ix_tasks_open_deadline`` می‌نشیند: فقط
+        بازه‌ی ابتدای index تا today خوانده می‌شود و مرتب‌سازی جداگانه لازم نیست.
+        ردیف‌ها مثل iter_task_rows با yield_per دسته‌دسته خوانده می‌شوند.
+        """
+        if today is None:
+            today = date.today()
+        stmt = (
+            select(*_TASK_COLUMNS)
+            .where(TaskORM.deadline < today, _OPEN_TASK)
+            .order_by(TaskORM.deadline, TaskORM.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = self._reader.execute(stmt)
+        try:
+            for partition in result.partitions():
+                for row in partition:
+                    yield _to_task(row)
+        finally:
+            result.close()
+
+    # --- Export -------------------------------------------------------
+    def iter_task_rows(self, *, batch_size: int = 1000) -> Iterator[RowMapping]:
+        """همه‌ی تسک‌ها به ترتیب (project_id, id) از یک cursor سمت سرور.
+
+        با yield_per (که stream_results را هم روشن می‌کند) در PostgreSQL یک
+        named cursor باز می‌شود و هر بار فقط ``batch_size`` ردیف در حافظه است.
+        """
+        stmt = (
+            select(*_TASK_COLUMNS)
+            .order_by(TaskORM.project_id, TaskORM.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = self._reader.execute(stmt).mappings()
+        try:
+            for partition in result.partitions():
+                yield from partition
+        finally:
+            result.close()
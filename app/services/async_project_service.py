@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import AsyncContextManager, Protocol
+
+from app.models.project import Project
+from app.models.query import ChangeMarker, Page, ProjectQuery, ProjectRow, build_page
+
+
+class AsyncProjectStoragePort(Protocol):
+    """نسخه‌ی async از ProjectStoragePort (همان قراردادها، متدها awaitable)."""
+
+    def unit_of_work(self) -> AsyncContextManager[None]:
+        """یک تراکنش (و یک commit) برای همه‌ی عملیات داخل بلوک."""
+        ...
+    async def add_project(self, name: str, description: str) -> Project: ...
+    async def list_projects(self, query: ProjectQuery | None = None) -> list[Project]: ...
+    async def list_project_rows(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> list[ProjectRow]:
+        """مثل list_projects ولی dictهای ساده با فیلدهای ``query.fields``."""
+        ...
+    async def project_list_marker(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> ChangeMarker:
+        """خلاصه‌ی ارزانی که با هر تغییر پروژه‌های صفحه‌ی ``query`` (و اگر تسک‌ها
+        را embed کند، تسک‌هایشان) عوض می‌شود."""
+        ...
+    async def get_project(self, project_id: int) -> Project: ...
+    async def remove_project(self, project_id: int) -> None: ...
+    async def update_project(
+        self,
+        project_id: int,
+        name: str | None = None,
+        description: str | None = None,
+    ) -> Project: ...
+
+
+class AsyncProjectService:
+    """نسخه‌ی async از ProjectService برای routerهای async."""
+
+    def __init__(self, storage: AsyncProjectStoragePort) -> None:
+        self._storage = storage
+
+    async def create_project(self, name: str, description: str) -> Project:
+        return await self._storage.add_project(name, description)
+
+    async def list_projects(self, query: ProjectQuery | None = None) -> list[Project]:
+        return list(await self._storage.list_projects(query))
+
+    async def list_projects_page(self, query: ProjectQuery) -> Page[Project]:
+        """یک صفحه از پروژه‌ها (keyset روی id) به همراه کلید صفحه‌ی بعد."""
+        projects = list(await self._storage.list_projects(self._page_probe(query)))
+        return build_page(projects, query.limit, key=lambda p: (p.id,))
+
+    async def list_project_rows_page(self, query: ProjectQuery) -> Page[ProjectRow]:
+        """مسیر سریع list_projects_page برای لیست API: ردیف خام به جای Project."""
+        rows = await self._storage.list_project_rows(self._page_probe(query))
+        return build_page(rows, query.limit, key=lambda row: (row["id"],))
+
+    def _page_probe(self, query: ProjectQuery) -> ProjectQuery:
+        # یک ردیف بیشتر از limit تا بدون COUNT بفهمیم صفحه‌ی بعدی هست
+        return query if query.limit is None else replace(query, limit=query.limit + 1)
+
+    async def list_marker(self, query: ProjectQuery) -> ChangeMarker:
+        """نشانگر تغییر یک صفحه از پروژه‌ها (برای ETag) بدون hydrate کردن ردیف‌ها.
+
+        همان query صفحه‌ای (با ردیف اضافه) که list_project_rows_page می‌فرستد،
+        تا نشانگر بودن/نبودن صفحه‌ی بعد را هم پوشش دهد.
+        """
+        return await self._storage.project_list_marker(self._page_probe(query))
+
+    async def rename_project(
+        self,
+        project_id: int,
+        new_name: str | None = None,
+        new_description: str | None = None,
+    ) -> Project:
+        return await self._storage.update_project(
+            project_id=project_id,
+            name=new_name,
+            description=new_description,
+        )
+
+    async def delete_project(self, project_id: int) -> None:
+        await self._storage.remove_project(project_id)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from typing import AsyncContextManager, Iterable, Protocol
+
+from app.models.bulk import BulkItemResult, BulkUpdateResult, TaskChanges, TaskDraft
+from app.models.query import (
+    ChangeMarker,
+    Page,
+    TaskQuery,
+    TaskRow,
+    build_page,
+    task_row_sort_key,
+)
+from app.models.search import SearchHit, SearchQuery, search_sort_key
+from app.models.task import Task
+from app.services.task_service import TaskServiceBase
+
+
+class AsyncTaskStoragePort(Protocol):
+    """نسخه‌ی async از TaskStoragePort (همان قراردادها، متدها awaitable)."""
+
+    def unit_of_work(self) -> AsyncContextManager[None]:
+        """یک تراکنش (و یک commit) برای همه‌ی عملیات داخل بلوک."""
+        ...
+    async def add_task(
+        self,
+        project_id: int,
+        title: str,
+        description: str,
+        deadline: str | None,
+    ) -> Task: ...
+    async def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]: ...
+    async def existing_titles(
+        self,
+        project_id: int,
+        titles: Iterable[str],
+    ) -> set[str]: ...
+    async def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[Task]: ...
+    async def list_task_rows(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[TaskRow]:
+        """مثل list_tasks ولی ستون‌های خام هر تسک، بدون ساختن Task."""
+        ...
+    async def task_list_marker(self, project_id: int) -> ChangeMarker:
+        """خلاصه‌ی ارزانی که با هر تغییر تسک‌های پروژه عوض می‌شود."""
+        ...
+    async def search_tasks(self, query: SearchQuery) -> list[SearchHit]:
+        """جستجوی متن کامل در همه‌ی پروژه‌ها؛ به ترتیب rank نزولی و بعد id."""
+        ...
+    async def edit_task(
+        self,
+        project_id: int,
+        task_id: int,
+        title: str | None = None,
+        description: str | None = None,
+        status: str | None = None,
+        deadline: str | None = None,
+    ) -> Task: ...
+    async def change_task_status(
+        self,
+        project_id: int,
+        task_id: int,
+        status: str,
+    ) -> Task: ...
+    async def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult: ...
+    async def remove_task(self, project_id: int, task_id: int) -> None: ...
+
+
+class AsyncTaskService(TaskServiceBase):
+    """نسخه‌ی async از TaskService؛ قوانین از TaskServiceBase می‌آیند.
+
+    توضیح رفتار هر متد همان docstring متد هم‌نام در TaskService است.
+    """
+
+    def __init__(self, storage: AsyncTaskStoragePort) -> None:
+        self._storage = storage
+
+    async def create_task(
+        self,
+        project_id: int,
+        title: str,
+        description: str,
+        deadline: str | None,
+    ) -> Task:
+        deadline = self._validate_deadline(deadline)
+        return await self._storage.add_task(project_id, title, description, deadline)
+
+    async def create_tasks(
+        self,
+        project_id: int,
+        drafts: list[TaskDraft],
+        *,
+        atomic: bool = True,
+    ) -> list[BulkItemResult]:
+        results, first_seen = self._check_batch(drafts)
+        existing = await self._storage.existing_titles(project_id, first_seen.keys())
+        valid = self._valid_indexes(
+            project_id, drafts, results, first_seen, existing, atomic=atomic
+        )
+        if valid is None:
+            return results
+
+        tasks = await self._storage.add_tasks(project_id, [drafts[i] for i in valid])
+        for i, task in zip(valid, tasks):
+            results[i].task = task
+        return results
+
+    async def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[Task]:
+        return list(await self._storage.list_tasks(project_id, query))
+
+    async def list_tasks_page(self, project_id: int, query: TaskQuery) -> Page[Task]:
+        tasks = await self._storage.list_tasks(project_id, self._page_probe(query))
+        return self._build_page(list(tasks), query)
+
+    async def list_task_rows_page(
+        self,
+        project_id: int,
+        query: TaskQuery,
+    ) -> Page[TaskRow]:
+        """مسیر سریع list_tasks_page برای لیست API: ردیف خام به جای Task."""
+        rows = await self._storage.list_task_rows(project_id, self._page_probe(query))
+        return build_page(
+            rows,
+            query.limit,
+            key=lambda row: task_row_sort_key(row, query.sort),
+        )
+
+    async def search_tasks_page(self, query: SearchQuery) -> Page[SearchHit]:
+        self._check_search(query)
+        hits = await self._storage.search_tasks(self._page_probe(query))
+        return build_page(hits, query.limit, key=search_sort_key)
+
+    async def list_marker(self, project_id: int) -> ChangeMarker:
+        """نشانگر تغییر تسک‌های پروژه (برای ETag) بدون خواندن ردیف‌ها."""
+        return await self._storage.task_list_marker(project_id)
+
+    async def edit_task(
+        self,
+        project_id: int,
+        task_id: int,
+        *,
+        title: str | None = None,
+        description: str | None = None,
+        status: str | None = None,
+        deadline: str | None = None,
+    ) -> Task:
+        status_enum = self._parse_status(status) if status is not None else None
+        if deadline is not None:
+            deadline = self._validate_deadline(deadline)
+
+        has_fields = any(v is not None for v in (title, description, deadline))
+
+        async with self._storage.unit_of_work():
+            if has_fields or status_enum is None:
+                task = await self._storage.edit_task(
+                    project_id,
+                    task_id,
+                    title=title,
+                    description=description,
+                    status=None,
+                    deadline=deadline,
+                )
+            if status_enum is not None:
+                task = await self._storage.change_task_status(
+                    project_id,
+                    task_id,
+                    status_enum.value,
+                )
+
+        return task
+
+    async def change_status(
+        self,
+        project_id: int,
+        task_id: int,
+        status: str,
+    ) -> Task:
+        status_enum = self._parse_status(status)
+        return await self._storage.change_task_status(
+            project_id,
+            task_id,
+            status_enum.value,
+        )
+
+    async def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        self._check_update(query, changes)
+        return await self._storage.update_tasks(
+            project_id,
+            query,
+            changes,
+            returning=returning,
+        )
+
+    async def delete_task(self, project_id: int, task_id: int) -> None:
+        await self._storage.remove_task(project_id, task_id)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterable, Iterator, Mapping, Protocol
+
+
+# ستون‌های خروجی به همین ترتیب (هدر CSV و کلیدهای NDJSON)
+EXPORT_COLUMNS = (
+    "project_id",
+    "id",
+    "title",
+    "description",
+    "status",
+    "deadline",
+    "at_closed",
+    "created_at",
+)
+
+# تعداد ردیف‌هایی که از cursor دیتابیس در هر نوبت خوانده می‌شود
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    """Supported export formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
+class TaskExportSourcePort(Protocol):
+    """منبع ردیف‌های خروجی؛ باید ردیف‌ها را تدریجی (stream) تحویل دهد."""
+
+    def iter_task_rows(
+        self,
+        *,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[Mapping[str, Any]]:
+        """همه‌ی تسک‌های همه‌ی پروژه‌ها به ترتیب (project_id, id)."""
+        ...
+
+
+def _json_default(value: object) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"cannot export {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(rows: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """هر ردیف → یک خط JSON."""
+    for row in rows:
+        record = {col: row[col] for col in EXPORT_COLUMNS}
+        yield json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+
+
+def iter_csv(rows: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """هدر + هر ردیف → یک خط CSV (بافر هر بار خالی می‌شود تا حافظه ثابت بماند)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield flush()
+    for row in rows:
+        writer.writerow([_csv_value(row[col]) for col in EXPORT_COLUMNS])
+        yield flush()
+
+
+def chunked(lines: Iterable[str], size: int) -> Iterator[str]:
+    """چسباندن خط‌ها به تکه‌های ``size`` تایی تا تعداد write/send کم شود."""
+    pending: list[str] = []
+    for line in lines:
+        pending.append(line)
+        if len(pending) >= size:
+            yield "".join(pending)
+            pending.clear()
+    if pending:
+        yield "".join(pending)
+
+
+class ExportService:
+    """سرویس خروجی گرفتن از همه‌ی تسک‌ها به صورت stream.
+
+    ردیف‌ها از یک cursor سمت سرور خوانده می‌شوند و از یک زنجیره‌ی generator
+    (ردیف → خط → تکه) مستقیم به response یا فایل می‌روند؛ در هیچ مرحله‌ای
+    کل داده در حافظه نگه داشته نمی‌شود.
+    """
+
+    def __init__(self, storage: TaskExportSourcePort) -> None:
+        self._storage = storage
+
+    def stream_tasks(
+        self,
+        fmt: ExportFormat,
+        *,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[str]:
+        """تکه‌های متنی خروجی در قالب ``fmt``."""
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        rows = self._storage.iter_task_rows(batch_size=batch_size)
+        lines = iter_ndjson(rows) if fmt is ExportFormat.NDJSON else iter_csv(rows)
+        return chunked(lines, batch_size)
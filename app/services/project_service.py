@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-from typing import Protocol, Iterable
+from dataclasses import replace
+from typing import ContextManager, Protocol, Iterable
 
 from app.models.project import Project
-from app.exceptions.base import ValidationError, NotFoundError
+from app.models.query import Page, ProjectQuery, build_page
 
 
 class ProjectStoragePort(Protocol):
-    """Interface (پورت) برای چیزهایی که پروژه‌ها را ذخیره می‌کنند."""
+    """Interface (پورت) برای چیزهایی که پروژه‌ها را ذخیره می‌کنند.
 
+    یکتایی نام پروژه (بدون حساسیت به حروف بزرگ/کوچک و فاصله‌های دو طرف)
+    بر عهده‌ی storage است: add_project/update_project در صورت تکراری بودن
+    نام ValidationError می‌اندازند.
+    """
+
+    def unit_of_work(self) -> ContextManager[None]:
+        """یک تراکنش (و یک commit) برای همه‌ی عملیات داخل بلوک."""
+        ...
     def add_project(self, name: str, description: str) -> Project: ...
-    def list_projects(self) -> Iterable[Project]: ...
+    def list_projects(self, query: ProjectQuery | None = None) -> Iterable[Project]: ...
     def get_project(self, project_id: int) -> Project: ...
     def remove_project(self, project_id: int) -> None: ...
     def update_project(
@@ -28,16 +37,17 @@ class ProjectService:
         self._storage = storage
 
     def create_project(self, name: str, description: str) -> Project:
-        # ✅ قبل از ارسال به storage، یکتا بودن اسم را چک می‌کنیم
-        normalized = name.strip().lower()
-        for p in self._storage.list_projects():
-            if p.name.strip().lower() == normalized:
-                raise ValidationError(f"project name '{name}' already exists")
-
+        # ✅ یکتا بودن اسم را storage (در دیتابیس: unique index) تضمین می‌کند
         return self._storage.add_project(name, description)
 
-    def list_projects(self) -> list[Project]:
-        return list(self._storage.list_projects())
+    def list_projects(self, query: ProjectQuery | None = None) -> list[Project]:
+        return list(self._storage.list_projects(query))
+
+    def list_projects_page(self, query: ProjectQuery) -> Page[Project]:
+        """یک صفحه از پروژه‌ها (keyset روی id) به همراه کلید صفحه‌ی بعد."""
+        probe = query if query.limit is None else replace(query, limit=query.limit + 1)
+        projects = list(self._storage.list_projects(probe))
+        return build_page(projects, query.limit, key=lambda p: (p.id,))
 
     def rename_project(
         self,
@@ -45,13 +55,7 @@ class ProjectService:
         new_name: str | None = None,
         new_description: str | None = None,
     ) -> Project:
-        if new_name is not None:
-            normalized = new_name.strip().lower()
-            for p in self._storage.list_projects():
-                if p.id != project_id and p.name.strip().lower() == normalized:
-                    raise ValidationError(f"project name '{new_name}' already exists")
-
-        # ✅ بعد، آپدیت واقعی رو به عهده‌ی storage می‌ذاریم
+        # ✅ آپدیت (و چک یکتا بودن نام جدید) رو به عهده‌ی storage می‌ذاریم
         project = self._storage.update_project(
             project_id=project_id,
             name=new_name,
@@ -1,18 +1,30 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import date, datetime
-from typing import Protocol, Iterable
+from typing import ContextManager, Protocol, Iterable, TypeVar
 
-from app.models.task import Task, Status
-from app.exceptions.base import ValidationError, NotFoundError, InvalidStatusError
+from app.models.bulk import BulkItemResult, BulkUpdateResult, TaskChanges, TaskDraft
+from app.models.task import Task, Status, normalize_title
+from app.models.query import Page, PageQuery, TaskQuery, build_page, task_sort_key
+from app.models.search import SearchHit, SearchQuery, search_sort_key, tokenize
+from app.exceptions.base import ValidationError, InvalidStatusError
+
+
+Q = TypeVar("Q", bound=PageQuery)
 
 
 class TaskStoragePort(Protocol):
     """Interface برای ذخیره/مدیریت Taskها.
 
     InMemoryStorage فعلی و Repository دیتابیسی بعدی باید این امضاها را پیاده‌سازی کنند.
+    یکتایی عنوان تسک داخل پروژه (case-insensitive) بر عهده‌ی storage است:
+    add_task/edit_task در صورت تکراری بودن عنوان ValidationError می‌اندازند.
     """
 
+    def unit_of_work(self) -> ContextManager[None]:
+        """یک تراکنش (و یک commit) برای همه‌ی عملیات داخل بلوک."""
+        ...
     def add_task(
         self,
         project_id: int,
@@ -20,7 +32,17 @@ class TaskStoragePort(Protocol):
         description: str,
         deadline: str | None,
     ) -> Task: ...
-    def list_tasks(self, project_id: int) -> Iterable[Task]: ...
+    def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]:
+        """درج گروهی (همه یا هیچ)؛ خروجی به ترتیب drafts."""
+        ...
+    def existing_titles(self, project_id: int, titles: Iterable[str]) -> set[str]:
+        """از بین عنوان‌های نرمال‌شده، آن‌هایی که در پروژه وجود دارند."""
+        ...
+    def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> Iterable[Task]: ...
     def edit_task(
         self,
         project_id: int,
@@ -35,18 +57,32 @@ class TaskStoragePort(Protocol):
         project_id: int,
         task_id: int,
         status: str,
-    ) -> None: ...
+    ) -> Task: ...
+    def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        """اعمال changes روی همه‌ی تسک‌های منطبق با فیلتر query (یک UPDATE)."""
+        ...
     def remove_task(self, project_id: int, task_id: int) -> None: ...
     def iter_overdue(self, today: date) -> Iterable[Task]:
         """همه تسک‌هایی که deadline < today و status != DONE دارند را برمی‌گرداند."""
         ...
+    def search_tasks(self, query: SearchQuery) -> list[SearchHit]:
+        """جستجوی متن کامل در همه‌ی پروژه‌ها؛ به ترتیب rank نزولی و بعد id."""
+        ...
 
 
-class TaskService:
-    """سرویس برای کار با Taskها."""
+class TaskServiceBase:
+    """قوانین مشترک TaskService و AsyncTaskService (بدون دسترسی به storage).
 
-    def __init__(self, storage: TaskStoragePort) -> None:
-        self._storage = storage
+    هرچه به I/O نیاز ندارد (ولیدیشن ددلاین/status، بررسی batch و فیلترها)
+    این‌جاست تا نسخه‌های sync و async دقیقاً یک رفتار داشته باشند.
+    """
 
     def _validate_deadline(self, deadline: str | None) -> str | None:
         """اعتبارسنجی ددلاین: فرمت و بعد از امروز بودن.
@@ -68,6 +104,109 @@ class TaskService:
 
         return deadline
 
+    def _parse_status(self, status: str) -> Status:
+        try:
+            return Status.from_string(status)
+        except InvalidStatusError as exc:
+            # برای لایه‌های بالاتر (CLI/API) به صورت ValidationError می‌فرستیم
+            raise ValidationError(str(exc)) from exc
+
+    def _validate_draft(self, draft: TaskDraft) -> None:
+        # همان قوانین دامنه‌ی Task (طول عنوان/توضیح) + قانون ددلاین سرویس
+        Task(id=0, title=draft.title, description=draft.description)
+        self._validate_deadline(draft.deadline)
+
+    def _check_batch(
+        self,
+        drafts: list[TaskDraft],
+    ) -> tuple[list[BulkItemResult], dict[str, int]]:
+        """ولیدیشن آیتم‌ها و یکتایی عنوان داخل batch.
+
+        خروجی: نتیجه‌ی هر آیتم و نگاشت عنوان نرمال‌شده → اولین اندیس.
+        """
+        results = [BulkItemResult(index=i) for i in range(len(drafts))]
+        first_seen: dict[str, int] = {}
+
+        for i, draft in enumerate(drafts):
+            try:
+                self._validate_draft(draft)
+            except ValidationError as exc:
+                results[i].error = str(exc)
+                continue
+            key = normalize_title(draft.title)
+            if key in first_seen:
+                results[i].error = (
+                    f"task title '{draft.title}' is repeated in this batch "
+                    f"(item {first_seen[key]})"
+                )
+                continue
+            first_seen[key] = i
+        return results, first_seen
+
+    def _valid_indexes(
+        self,
+        project_id: int,
+        drafts: list[TaskDraft],
+        results: list[BulkItemResult],
+        first_seen: dict[str, int],
+        existing: set[str],
+        *,
+        atomic: bool,
+    ) -> list[int] | None:
+        """اعمال عنوان‌های موجود در دیتابیس؛ None یعنی هیچ درجی انجام نشود."""
+        for key in existing:
+            i = first_seen[key]
+            results[i].error = (
+                f"task title '{drafts[i].title}' already exists in project {project_id}"
+            )
+
+        valid = [r.index for r in results if r.ok]
+        if atomic and len(valid) < len(drafts):
+            for i in valid:
+                results[i].error = "not created: another item of the batch failed"
+            return None
+        return valid
+
+    def _check_update(self, query: TaskQuery, changes: TaskChanges) -> None:
+        """قوانین update_tasks؛ توضیح کامل در TaskService.update_tasks."""
+        if not query.has_filters:
+            raise ValidationError("mass update needs at least one filter")
+        if (
+            changes.status is None
+            and changes.deadline is None
+            and changes.shift_deadline_days is None
+        ):
+            raise ValidationError("nothing to update")
+        if changes.deadline is not None and changes.shift_deadline_days is not None:
+            raise ValidationError(
+                "deadline and shift_deadline_days can not be used together"
+            )
+        if changes.deadline is not None and changes.deadline < date.today():
+            raise ValidationError("deadline can not be in the past")
+
+    def _check_search(self, query: SearchQuery) -> None:
+        """جستجو باید حداقل یک کلمه داشته باشد (علامت‌ها و فاصله‌ها حساب نیستند)."""
+        if not tokenize(query.text):
+            raise ValidationError("search text must contain at least one word")
+
+    def _page_probe(self, query: Q) -> Q:
+        # یک ردیف بیشتر از limit تا بدون COUNT بفهمیم صفحه‌ی بعدی هست
+        return query if query.limit is None else replace(query, limit=query.limit + 1)
+
+    def _build_page(self, tasks: list[Task], query: TaskQuery) -> Page[Task]:
+        return build_page(
+            tasks,
+            query.limit,
+            key=lambda t: task_sort_key(t, query.sort),
+        )
+
+
+class TaskService(TaskServiceBase):
+    """سرویس برای کار با Taskها."""
+
+    def __init__(self, storage: TaskStoragePort) -> None:
+        self._storage = storage
+
     def create_task(
         self,
         project_id: int,
@@ -75,20 +214,44 @@ class TaskService:
         description: str,
         deadline: str | None,
     ) -> Task:
-        # ✅ چک یونیک بودن عنوان داخل پروژه
-        normalized = title.strip().lower()
-        for t in self._storage.list_tasks(project_id):
-            if t.title.strip().lower() == normalized:
-                raise ValidationError(
-                    f"task title '{title}' already exists in project {project_id}"
-                )
-
-        # ✅ چک اعتبار ددلاین
+        # ✅ چک اعتبار ددلاین (یکتایی عنوان را storage تضمین می‌کند)
         deadline = self._validate_deadline(deadline)
 
         return self._storage.add_task(project_id, title, description, deadline)
 
-    def list_tasks(self, project_id: int) -> list[Task]:
+    def create_tasks(
+        self,
+        project_id: int,
+        drafts: list[TaskDraft],
+        *,
+        atomic: bool = True,
+    ) -> list[BulkItemResult]:
+        """ساخت گروهی تسک‌ها با همان قوانین create_task.
+
+        - هر آیتم با قوانین Task و ددلاین ولیدیت می‌شود.
+        - یکتایی عنوان داخل batch در حافظه و در دیتابیس با یک کوئری چک می‌شود.
+        - atomic=True: اگر حتی یک آیتم رد شود هیچ تسکی ساخته نمی‌شود.
+          atomic=False: آیتم‌های معتبر ساخته می‌شوند و بقیه خطا می‌گیرند.
+        درج آیتم‌های معتبر در یک statement انجام می‌شود.
+        """
+        results, first_seen = self._check_batch(drafts)
+        existing = self._storage.existing_titles(project_id, first_seen.keys())
+        valid = self._valid_indexes(
+            project_id, drafts, results, first_seen, existing, atomic=atomic
+        )
+        if valid is None:
+            return results
+
+        tasks = self._storage.add_tasks(project_id, [drafts[i] for i in valid])
+        for i, task in zip(valid, tasks):
+            results[i].task = task
+        return results
+
+    def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[Task]:
         """لیست تسک‌های یک پروژه را برمی‌گرداند.
 
         نکته: در حال حاضر فقط خروجی storage را wrap می‌کند.
@@ -96,7 +259,24 @@ class TaskService:
         (یا در سرویسی که پروژه را مدیریت می‌کند) NotFoundError را raise کنی
         و این متد همان را به بالا پاس بدهد.
         """
-        return list(self._storage.list_tasks(project_id))
+        return list(self._storage.list_tasks(project_id, query))
+
+    def list_tasks_page(self, project_id: int, query: TaskQuery) -> Page[Task]:
+        """یک صفحه از تسک‌های پروژه (keyset) به همراه کلید صفحه‌ی بعد.
+
+        یک ردیف بیشتر از limit خوانده می‌شود تا بدون COUNT بفهمیم صفحه‌ی بعدی هست.
+        """
+        tasks = list(self._storage.list_tasks(project_id, self._page_probe(query)))
+        return self._build_page(tasks, query)
+
+    def search_tasks_page(self, query: SearchQuery) -> Page[SearchHit]:
+        """یک صفحه از نتایج جستجوی متن کامل (keyset روی (rank, id)).
+
+        :raises ValidationError: اگر متن جستجو هیچ کلمه‌ای نداشته باشد
+        """
+        self._check_search(query)
+        hits = self._storage.search_tasks(self._page_probe(query))
+        return build_page(hits, query.limit, key=search_sort_key)
 
     def edit_task(
         self,
@@ -113,60 +293,42 @@ class TaskService:
         - title و description و deadline مستقیم از طریق edit_task استوریج آپدیت می‌شوند.
         - تغییر status از طریق change_task_status انجام می‌شود تا منطق at_closed
           در همان جای اصلی (Repository/Storage) اجرا شود.
+        - هر دو در یک unit of work هستند: یک تراکنش، یک commit و حداکثر دو
+          statement؛ خروجی change_task_status خودش نسخه‌ی به‌روز تسک است.
         """
 
-        status_enum: Status | None = None
-
         # ✅ ۱) اگر status جدید داده شده، اول معتبر بودنش را چک می‌کنیم
-        if status is not None:
-            try:
-                status_enum = Status.from_string(status)
-            except InvalidStatusError as exc:
-                # برای لایه‌های بالاتر (CLI/API) به صورت ValidationError می‌فرستیم
-                raise ValidationError(str(exc)) from exc
-
-        # ✅ ۲) اگر title جدید داده شده، یکتا بودنش را در همان پروژه چک می‌کنیم
-        if title is not None:
-            normalized = title.strip().lower()
-            for t in self._storage.list_tasks(project_id):
-                if t.id != task_id and t.title.strip().lower() == normalized:
-                    raise ValidationError(
-                        f"task title '{title}' already exists in project {project_id}"
-                    )
+        status_enum = self._parse_status(status) if status is not None else None
+
+        # ✅ ۲) یکتایی title جدید را storage هنگام edit_task چک می‌کند
 
         # ✅ ۳) ولیدیشن ددلاین (اگر مقدار جدیدی داده شده)
         if deadline is not None:
             deadline = self._validate_deadline(deadline)
 
-        # ✅ ۴) ابتدا فقط title/description/deadline را از طریق edit_task آپدیت می‌کنیم
-        #       (status را اینجا به storage نمی‌دهیم تا منطق at_closed به هم نخورد)
-        task = self._storage.edit_task(
-            project_id,
-            task_id,
-            title=title,
-            description=description,
-            status=None,
-            deadline=deadline,
-        )
+        has_fields = any(v is not None for v in (title, description, deadline))
 
-        # ✅ ۵) اگر status جدید داده شده، از مسیر رسمی change_task_status می‌رویم
-        #       تا منطق at_closed در همان‌جا (Repository) اجرا شود.
-        if status_enum is not None:
-            try:
-                self._storage.change_task_status(
+        with self._storage.unit_of_work():
+            # ✅ ۴) title/description/deadline از طریق edit_task
+            #       (status را اینجا به storage نمی‌دهیم تا منطق at_closed به هم نخورد)
+            if has_fields or status_enum is None:
+                task = self._storage.edit_task(
                     project_id,
                     task_id,
-                    status_enum.value,
+                    title=title,
+                    description=description,
+                    status=None,
+                    deadline=deadline,
                 )
-            except NotFoundError:
-                # اگر در این مرحله تسک یا پروژه پیدا نشد، همان خطا را به بالا پاس می‌دهیم
-                raise
 
-            # بعد از تغییر status، نسخه‌ی به‌روز تسک را دوباره از storage می‌خوانیم
-            for t in self._storage.list_tasks(project_id):
-                if t.id == task_id:
-                    task = t
-                    break
+            # ✅ ۵) اگر status جدید داده شده، از مسیر رسمی change_task_status می‌رویم
+            #       تا منطق at_closed در همان‌جا (Repository) اجرا شود.
+            if status_enum is not None:
+                task = self._storage.change_task_status(
+                    project_id,
+                    task_id,
+                    status_enum.value,
+                )
 
         return task
 
@@ -175,17 +337,39 @@ class TaskService:
         project_id: int,
         task_id: int,
         status: str,
-    ) -> None:
-        try:
-            status_enum = Status.from_string(status)
-        except InvalidStatusError as exc:
-            raise ValidationError(str(exc)) from exc
+    ) -> Task:
+        status_enum = self._parse_status(status)
 
-        self._storage.change_task_status(
+        return self._storage.change_task_status(
             project_id,
             task_id,
             status_enum.value,
         )
 
+    def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        """تغییر گروهی status/deadline همه‌ی تسک‌های منطبق با فیلتر.
+
+        - فیلتر (ids/status/بازه‌ی deadline) خالی قبول نمی‌شود تا یک درخواست
+          اشتباه کل پروژه را تغییر ندهد.
+        - deadline مطلق همان قانون create_task را دارد (گذشته نباشد)؛
+          shift_deadline_days با deadline مطلق قابل جمع نیست.
+        - منطق at_closed همان change_task_status است.
+        """
+        self._check_update(query, changes)
+
+        return self._storage.update_tasks(
+            project_id,
+            query,
+            changes,
+            returning=returning,
+        )
+
     def delete_task(self, project_id: int, task_id: int) -> None:
         self._storage.remove_task(project_id, task_id)
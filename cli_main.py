@@ -9,6 +9,7 @@ import os
 
 from todo.interface.cli import ToDoCLI
 from todo.storage.memory_storage import InMemoryStorage
+from todo.storage.persistence import DATA_DIR, MemoryPersistence
 
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
@@ -27,6 +28,10 @@ def build_storage():
         session = get_session()
         storage = SqlAlchemyStorage(session)
         return storage, session
+    elif DATA_DIR:
+        # حافظه‌ی ماندگار: بازیابی از snapshot + WAL، و snapshot نهایی در close()
+        persistence = MemoryPersistence(DATA_DIR)
+        return persistence.open(), persistence
     else:
         storage = InMemoryStorage()
         return storage, None
@@ -40,6 +45,7 @@ def main() -> None:
         "Please use the FastAPI Web API instead."
     )
 
+    # session: Session دیتابیس یا MemoryPersistence؛ هر دو در آخر close می‌شوند
     storage, session = build_storage()
 
     # لایه‌ی سرویس‌ها (DI: storage تزریق می‌شود)
@@ -55,7 +61,7 @@ def main() -> None:
     try:
         cli.run()
     finally:
-        # اگر با DB کار می‌کنیم، Session را ببندیم
+        # اگر با DB (یا حافظه‌ی ماندگار) کار می‌کنیم، آن را ببندیم
         if session is not None:
             session.close()
 
@@ -4,9 +4,47 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-from app.api.routers import project_router, task_router
+from anyio import to_thread
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.api.routers import (
+    diagnostics_router,
+    export_router,
+    project_router,
+    search_router,
+    task_router,
+)
+from app.api.dependencies import memory_persistence
+
+
+# Threads for sync routes/dependencies, streamed sync bodies and in-memory
+# storage calls; 0 keeps anyio's default (40). Not tied to the sync pool: the
+# project/task/search routes are async on the async engine and use no thread,
+# and the sync routes that do hold a connection (export) get a 503 after
+# DB_POOL_TIMEOUT instead of waiting on the pool forever.
+THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "0"))
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if THREADPOOL_SIZE:
+        to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if memory_persistence is None:
+        yield
+        return
+    # Durable memory backend: restore before serving, snapshot on shutdown.
+    await to_thread.run_sync(memory_persistence.open)
+    memory_persistence.start()
+    try:
+        yield
+    finally:
+        await to_thread.run_sync(memory_persistence.close)
 
 
 app = FastAPI(
@@ -16,12 +54,26 @@ app = FastAPI(
         "ToDo List Web API for the Software Engineering course "
         "(Phase 3 - FastAPI based interface)."
     ),
+    lifespan=lifespan,
 )
 
 
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(_: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """No connection became free within DB_POOL_TIMEOUT: tell clients to retry."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "database is busy, try again"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include routers
 app.include_router(project_router)
 app.include_router(task_router)
+app.include_router(search_router)
+app.include_router(export_router)
+app.include_router(diagnostics_router)
 
 
 @app.get("/", tags=["health"])
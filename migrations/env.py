@@ -30,6 +30,27 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# ستون search_vector و GIN index آن فقط در migration c3f7a9d1b6e2 تعریف
+# شده‌اند و عمداً در TaskORM نیستند؛ بدون این فیلتر autogenerate/check
+# می‌خواهد آن‌ها را drop کند.
+_UNMAPPED = {
+    ("column", "search_vector"),
+    ("index", "ix_tasks_search_vector"),
+}
+
+# index‌های یکتای case-insensitive در ORM و migration یکسان‌اند، ولی
+# PostgreSQL عبارت را به شکل lower(TRIM(BOTH FROM name)) برمی‌گرداند و alembic
+# آن را با lower(trim(name)) متفاوت می‌بیند؛ پس اصلاً مقایسه نمی‌شوند.
+_EXPRESSION_INDEXES = {"uq_projects_name_ci", "uq_tasks_project_title_ci"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None and (type_, name) in _UNMAPPED:
+        return False
+    if type_ == "index" and name in _EXPRESSION_INDEXES:
+        return False
+    return True
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -55,6 +76,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -70,6 +92,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,   # مفید برای autogenerate دقیق‌تر
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,74 @@
+"""add case-insensitive unique indexes on project name and task title
+
+Revision ID: 3b1f0c9d2e47
+Revises: f8afca6f6d7d
+Create Date: 2026-10-17 10:12:41.208533
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f0c9d2e47'
+down_revision: Union[str, Sequence[str], None] = 'f8afca6f6d7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _check_no_duplicates(table: str, key: str, what: str) -> None:
+    """Stop with a clear message if existing rows would violate the new index.
+
+    Rows that differ only in case or surrounding spaces were allowed before
+    this revision. They are not merged or renamed automatically: which one to
+    keep is a decision for whoever owns the data.
+    """
+    if context.is_offline_mode():
+        return
+    rows = op.get_bind().execute(
+        sa.text(
+            f"SELECT {key}, count(*) FROM {table} "
+            f"GROUP BY {key} HAVING count(*) > 1 ORDER BY {key} LIMIT 10"
+        )
+    ).all()
+    if not rows:
+        return
+    examples = "; ".join(
+        f"{', '.join(repr(value) for value in row[:-1])} ({row[-1]} rows)"
+        for row in rows
+    )
+    raise RuntimeError(
+        f"cannot add the case-insensitive unique index on {table}: some {what} "
+        f"differ only in case or surrounding spaces ({examples}). Rename or "
+        "merge them, then run the upgrade again."
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_no_duplicates('projects', 'lower(trim(name))', 'project names')
+    _check_no_duplicates(
+        'tasks',
+        'project_id, lower(trim(title))',
+        'task titles within a project',
+    )
+    op.create_index(
+        'uq_projects_name_ci',
+        'projects',
+        [sa.text('lower(trim(name))')],
+        unique=True,
+    )
+    op.create_index(
+        'uq_tasks_project_title_ci',
+        'tasks',
+        ['project_id', sa.text('lower(trim(title))')],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_tasks_project_title_ci', table_name='tasks')
+    op.drop_index('uq_projects_name_ci', table_name='projects')
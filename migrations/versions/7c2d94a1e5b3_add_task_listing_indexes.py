@@ -0,0 +1,40 @@
+"""add composite indexes for task listing filters
+
+Revision ID: 7c2d94a1e5b3
+Revises: 3b1f0c9d2e47
+Create Date: 2026-10-17 11:03:27.914410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d94a1e5b3'
+down_revision: Union[str, Sequence[str], None] = '3b1f0c9d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # id last: ORDER BY deadline, id and the (deadline, id) keyset are read
+    # straight off the index, without a sort
+    op.create_index(
+        'ix_tasks_project_status_deadline',
+        'tasks',
+        ['project_id', 'status', 'deadline', 'id'],
+    )
+    op.create_index(
+        'ix_tasks_project_deadline',
+        'tasks',
+        ['project_id', 'deadline', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_deadline', table_name='tasks')
+    op.drop_index('ix_tasks_project_status_deadline', table_name='tasks')
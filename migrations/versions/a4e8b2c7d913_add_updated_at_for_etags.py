@@ -0,0 +1,48 @@
+"""add projects.updated_at and task change-marker index
+
+Revision ID: a4e8b2c7d913
+Revises: 7c2d94a1e5b3
+Create Date: 2026-10-17 14:22:05.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e8b2c7d913'
+down_revision: Union[str, Sequence[str], None] = '7c2d94a1e5b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing rows get "now"; new rows get the value from the ORM default
+    op.add_column(
+        'projects',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    # SQLite has no ALTER COLUMN, and recreating the table in batch mode would
+    # lose the expression index uq_projects_name_ci; the leftover default is
+    # harmless there
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('projects', 'updated_at', server_default=None)
+    op.create_index(
+        'ix_tasks_project_updated_at',
+        'tasks',
+        ['project_id', 'updated_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_updated_at', table_name='tasks')
+    op.drop_column('projects', 'updated_at')
@@ -0,0 +1,55 @@
+"""add tasks.search_vector (generated tsvector) with a GIN index
+
+Revision ID: c3f7a9d1b6e2
+Revises: a4e8b2c7d913
+Create Date: 2026-10-17 16:40:12.531877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7a9d1b6e2'
+down_revision: Union[str, Sequence[str], None] = 'a4e8b2c7d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tsvector/GIN exist only on PostgreSQL; elsewhere search is unavailable
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # maintained by PostgreSQL on every INSERT/UPDATE of title/description;
+    # titles weigh more than descriptions in ts_rank (A vs B)
+    op.add_column(
+        'tasks',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple', title), 'A') || "
+                "setweight(to_tsvector('simple', description), 'B')",
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        'ix_tasks_search_vector',
+        'tasks',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,35 @@
+"""add a partial (deadline, id) index on open tasks for overdue queries
+
+Revision ID: d8e2b4f6a1c9
+Revises: c3f7a9d1b6e2
+Create Date: 2026-10-17 18:05:41.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2b4f6a1c9'
+down_revision: Union[str, Sequence[str], None] = 'c3f7a9d1b6e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the existing deadline indexes lead with project_id; overdue checks span
+    # all projects and only ever look at tasks that are not done
+    op.create_index(
+        'ix_tasks_open_deadline',
+        'tasks',
+        ['deadline', 'id'],
+        postgresql_where=sa.text("status <> 'done'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_open_deadline', table_name='tasks')
@@ -0,0 +1,41 @@
+"""add scheduler_runs: one row per completed scheduler cycle
+
+Revision ID: e5b9d3a7c1f4
+Revises: d8e2b4f6a1c9
+Create Date: 2026-10-17 19:12:08.533902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9d3a7c1f4'
+down_revision: Union[str, Sequence[str], None] = 'd8e2b4f6a1c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the scheduler records each run here (duration, rows closed) and replicas
+    # check it so a cycle another instance already ran is not run again
+    op.create_table('scheduler_runs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('job', sa.String(length=50), nullable=False),
+    sa.Column('cycle', sa.Date(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('elapsed', sa.Float(), nullable=False),
+    sa.Column('closed', sa.Integer(), nullable=False),
+    sa.Column('batches', sa.Integer(), nullable=False),
+    sa.Column('instance', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job', 'cycle', name='uq_scheduler_runs_job_cycle')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scheduler_runs')
@@ -0,0 +1,55 @@
+"""Shared fixtures for the database tests.
+
+The tests run against ``TEST_DATABASE_URL`` (e.g. a throwaway PostgreSQL
+database) or, when it is not set, a temporary SQLite file. The variables are
+set before anything under ``app`` is imported, because ``app.db.session``
+reads them at import time.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+_TEST_URL = os.getenv("TEST_DATABASE_URL")
+if _TEST_URL is None:
+    _TEST_URL = f"sqlite:///{Path(tempfile.mkdtemp()) / 'todolist-test.db'}"
+os.environ["DATABASE_URL"] = _TEST_URL
+os.environ["ASYNC_DATABASE_URL"] = (
+    _TEST_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if _TEST_URL.startswith("sqlite://")
+    else _TEST_URL
+)
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ.pop("ASYNC_DATABASE_REPLICA_URLS", None)
+
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models import orm  # noqa: E402,F401  (registers the tables)
+from app.repositories.sqlalchemy_storage import SqlAlchemyStorage  # noqa: E402
+
+
+@pytest.fixture
+def db() -> Iterator[None]:
+    """Empty tables for each test."""
+    Base.metadata.create_all(engine)
+    try:
+        yield
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def session(db: None) -> Iterator[Session]:
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def storage(session: Session) -> SqlAlchemyStorage:
+    return SqlAlchemyStorage(session)
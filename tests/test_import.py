@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import io
+import json
+
+from app.commands.import_tasks import import_tasks
+from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
+
+
+def _ndjson(*rows: object) -> io.StringIO:
+    return io.StringIO(
+        "".join((row if isinstance(row, str) else json.dumps(row)) + "\n" for row in rows)
+    )
+
+
+def test_import_loads_valid_rows_and_rejects_the_rest(
+    storage: SqlAlchemyStorage,
+) -> None:
+    project = storage.add_project("Work", "d")
+    storage.add_task(project.id, "Existing", "d", None)
+    rejects = io.StringIO()
+
+    report = import_tasks(
+        _ndjson(
+            {"project_id": project.id, "title": "Report", "description": "d"},
+            {"project_id": project.id, "title": "REPORT ", "description": "d"},
+            {"project_id": project.id, "title": "existing", "description": "d"},
+            "not json",
+            {"project_id": project.id, "title": "Plan", "description": "d",
+             "status": "later"},
+        ),
+        workers=1,
+        rejects=rejects,
+    )
+
+    assert (report.read, report.imported, report.rejected) == (5, 1, 4)
+    lines = sorted(json.loads(row)["line"] for row in rejects.getvalue().splitlines())
+    assert lines == [2, 3, 4, 5]
+    titles = [task.title for task in storage.list_tasks(project.id)]
+    assert titles == ["Existing", "Report"]
+    # imported rows count in the listing ETag like any other write
+    count, last_updated = storage.task_list_marker(project.id)
+    assert count == 2 and last_updated is not None
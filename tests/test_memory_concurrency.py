@@ -0,0 +1,90 @@
+"""InMemoryStorage under concurrent add/edit/remove/list traffic (a small stress_memory run)."""
+from __future__ import annotations
+
+import random
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.commands.stress_memory import check_invariants, run_stress
+from app.exceptions.base import NotFoundError, ValidationError
+from app.models.query import ProjectQuery, TaskQuery
+from app.models.task import Status, normalize_title
+from todo.storage.memory_storage import InMemoryStorage
+
+THREADS = 8
+OPERATIONS = 300
+
+
+def _traffic(storage: InMemoryStorage, project_ids: list[int], seed: int,
+             errors: list[BaseException]) -> None:
+    rng = random.Random(seed)
+    for i in range(OPERATIONS):
+        project_id = rng.choice(project_ids)
+        # few distinct titles, so threads keep colliding on them
+        title = f"task {rng.randrange(40)}"
+        op = rng.choice(["add", "add", "edit", "status", "remove", "list", "list"])
+        try:
+            if op == "add":
+                storage.add_task(project_id, title, f"{seed}-{i}", None)
+            elif op == "list":
+                tasks = storage.list_tasks(project_id, TaskQuery())
+                ids = [t.id for t in tasks]
+                assert ids == sorted(set(ids))
+                titles = [normalize_title(t.title) for t in tasks]
+                assert len(titles) == len(set(titles))
+            else:
+                tasks = storage.get_project(project_id).tasks
+                if not tasks:
+                    continue
+                task_id = rng.choice(tasks).id
+                if op == "edit":
+                    storage.edit_task(project_id, task_id, title=title)
+                elif op == "status":
+                    storage.change_task_status(
+                        project_id, task_id, rng.choice(list(Status)).value
+                    )
+                else:
+                    storage.remove_task(project_id, task_id)
+        except (ValidationError, NotFoundError):
+            pass  # duplicate title, or another thread removed the task first
+        except BaseException as exc:  # noqa: BLE001 - anything else is a bug
+            errors.append(exc)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_concurrent_writes_keep_views_consistent(seed: int) -> None:
+    storage = InMemoryStorage(project_max=3, task_max=THREADS * OPERATIONS)
+    project_ids = [storage.add_project(f"p{i}", "").id for i in range(3)]
+    errors: list[BaseException] = []
+    workers = [
+        threading.Thread(
+            target=_traffic, args=(storage, project_ids, seed * 100 + n, errors)
+        )
+        for n in range(THREADS)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    assert check_invariants(storage) == []
+    for project in storage.list_projects(ProjectQuery(with_counts=True)):
+        tasks = storage.get_project(project.id).tasks
+        counts = project.task_counts
+        assert counts is not None and counts.total == len(tasks)
+        assert (counts.todo, counts.doing, counts.done) == tuple(
+            sum(t.status is status for t in tasks)
+            for status in (Status.TODO, Status.DOING, Status.DONE)
+        )
+        titles = [normalize_title(t.title) for t in tasks]
+        assert len(titles) == len(set(titles))
+
+
+def test_stress_run_with_persistence(tmp_path: Path) -> None:
+    report = run_stress(threads=4, operations=200, projects=2, data_dir=tmp_path)
+
+    assert report.errors == []
+    assert sum(report.operations.values()) == 4 * 200
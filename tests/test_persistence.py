@@ -0,0 +1,190 @@
+"""Durable InMemoryStorage: write-ahead log, snapshots and recovery after a crash."""
+from __future__ import annotations
+
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.models.bulk import TaskDraft
+from app.models.query import task_deadline
+from todo.storage.memory_storage import InMemoryStorage
+from todo.storage.persistence import MemoryPersistence
+from todo.storage.wal import (
+    WriteAheadLog,
+    list_segments,
+    read_segment,
+    segment_path,
+)
+
+DEADLINE = (date.today() + timedelta(days=7)).isoformat()
+
+
+def _open(directory: Path) -> MemoryPersistence:
+    persistence = MemoryPersistence(directory, fsync=False, snapshot_seconds=0)
+    persistence.open(project_max=10, task_max=1000)
+    return persistence
+
+
+def _state(storage: InMemoryStorage) -> dict:
+    state = {}
+    for project in storage.list_projects():
+        tasks = storage.get_project(project.id).tasks
+        state[project.id] = (
+            project.name,
+            project.description,
+            project.created_at,
+            [
+                (t.id, t.title, t.description, t.status, task_deadline(t),
+                 t.at_closed, t.created_at)
+                for t in tasks
+            ],
+        )
+    return state
+
+
+def _counters(storage: InMemoryStorage) -> tuple[int, int]:
+    return storage._project_counter, storage._task_counter
+
+
+def _mixed_writes(persistence: MemoryPersistence) -> None:
+    """Writes on both sides of a checkpoint: some end up in the snapshot, the rest in the log."""
+    storage = persistence.storage
+    work = storage.add_project("Work", "w")
+    home = storage.add_project("Home", "h")
+    scratch = storage.add_project("Scratch", "s")
+    report = storage.add_task(work.id, "Report", "r", DEADLINE)
+    storage.add_tasks(
+        home.id, [TaskDraft(f"Chore {i}", "c", None) for i in range(3)]
+    )
+    storage.add_task(scratch.id, "Draft", "d", None)
+    persistence.checkpoint()
+
+    storage.edit_task(work.id, report.id, title="Report v2", description="r2")
+    storage.change_task_status(work.id, report.id, "done")
+    storage.update_project(home.id, name="House")
+    chores = storage.get_project(home.id).tasks
+    storage.remove_task(home.id, chores[0].id)
+    # the dropped project held the highest project id and task id so far
+    last = storage.add_project("Last", "l")
+    storage.add_task(last.id, "Gone", "g", None)
+    storage.remove_project(last.id)
+    storage.remove_project(scratch.id)
+
+
+def test_reopen_after_crash_replays_the_log(tmp_path: Path) -> None:
+    persistence = _open(tmp_path)
+    _mixed_writes(persistence)
+    expected = _state(persistence.storage)
+    counters = _counters(persistence.storage)
+
+    persistence.close(checkpoint=False)
+    recovered = _open(tmp_path)
+    try:
+        assert recovered.recovery.replayed > 0
+        assert _state(recovered.storage) == expected
+        assert _counters(recovered.storage) == counters
+        # ids of the dropped project and its task are never handed out again
+        project = recovered.storage.add_project("Next", "n")
+        task = recovered.storage.add_task(project.id, "Next", "n", None)
+        assert (project.id, task.id) == counters
+    finally:
+        recovered.close()
+
+
+def test_reopen_after_clean_close_uses_the_snapshot(tmp_path: Path) -> None:
+    persistence = _open(tmp_path)
+    _mixed_writes(persistence)
+    expected = _state(persistence.storage)
+    counters = _counters(persistence.storage)
+
+    persistence.close()
+    recovered = _open(tmp_path)
+    try:
+        assert recovered.recovery.replayed == 0
+        assert _state(recovered.storage) == expected
+        assert _counters(recovered.storage) == counters
+    finally:
+        recovered.close()
+
+
+def test_torn_last_record_is_ignored(tmp_path: Path) -> None:
+    persistence = _open(tmp_path)
+    _mixed_writes(persistence)
+    expected = _state(persistence.storage)
+    counters = _counters(persistence.storage)
+    work = next(p for p in persistence.storage.list_projects() if p.name == "Work")
+    persistence.storage.add_task(work.id, "Torn", "t", None)
+
+    persistence.close(checkpoint=False)
+    _, last_segment = list_segments(tmp_path)[-1]
+    data = last_segment.read_bytes()
+    # a crash in the middle of writing the last frame
+    last_segment.write_bytes(data[:-5])
+
+    recovered = _open(tmp_path)
+    try:
+        assert _state(recovered.storage) == expected
+        assert _counters(recovered.storage) == counters
+        # the next write goes to a fresh segment, after the torn one
+        recovered.storage.add_task(work.id, "After", "a", None)
+    finally:
+        recovered.close(checkpoint=False)
+
+    again = _open(tmp_path)
+    try:
+        titles = [t.title for t in again.storage.get_project(work.id).tasks]
+        assert titles == ["Report v2", "After"]
+    finally:
+        again.close()
+
+
+def test_group_commit_keeps_every_record(tmp_path: Path) -> None:
+    wal = WriteAheadLog(tmp_path, 1, fsync=True)
+    threads, per_thread = 8, 50
+    barrier = threading.Barrier(threads)
+
+    def write(n: int) -> None:
+        barrier.wait()
+        for i in range(per_thread):
+            wal.sync(wal.append(["drop_task", n, i]))
+
+    workers = [threading.Thread(target=write, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wal.close()
+
+    records = list(read_segment(segment_path(tmp_path, 1)))
+    assert sorted(map(tuple, records)) == sorted(
+        ("drop_task", n, i) for n in range(threads) for i in range(per_thread)
+    )
+    # each thread's records stay in its own order
+    for n in range(threads):
+        assert [r[2] for r in records if r[1] == n] == list(range(per_thread))
+    assert wal.fsyncs <= len(records)
+
+
+def test_rotate_starts_a_new_segment(tmp_path: Path) -> None:
+    wal = WriteAheadLog(tmp_path, 1, fsync=False)
+    wal.append(["drop_task", 1, 1])
+    assert wal.rotate() == 2
+    wal.sync(wal.append(["drop_task", 1, 2]))
+    wal.close()
+
+    assert [n for n, _ in list_segments(tmp_path)] == [1, 2]
+    assert list(read_segment(segment_path(tmp_path, 1))) == [["drop_task", 1, 1]]
+    assert list(read_segment(segment_path(tmp_path, 2))) == [["drop_task", 1, 2]]
+
+
+@pytest.mark.parametrize("cut", [1, 7, 9])
+def test_read_segment_stops_at_a_torn_frame(tmp_path: Path, cut: int) -> None:
+    wal = WriteAheadLog(tmp_path, 1, fsync=False)
+    wal.sync(wal.append(["drop_task", 1, 1], ["drop_task", 1, 2]))
+    wal.close()
+    path = segment_path(tmp_path, 1)
+    path.write_bytes(path.read_bytes()[:-cut])
+
+    assert list(read_segment(path)) == [["drop_task", 1, 1]]
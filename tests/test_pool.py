@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from app.db.pool import MeteredQueuePool, instrument_pool
+
+
+def test_pool_timeout_is_counted(tmp_path: Path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = instrument_pool(engine)
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    assert metrics.timeouts == 1
+
+
+def test_failed_connect_is_not_a_timeout() -> None:
+    def refuse() -> sqlite3.Connection:
+        raise sqlite3.OperationalError("connection refused")
+
+    engine = create_engine(
+        "sqlite://",
+        creator=refuse,
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    metrics = instrument_pool(engine)
+    with pytest.raises(OperationalError):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert metrics.timeouts == 0
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app.commands.scheduler import AdvisoryLock, FileLock, default_lock, run_cycle
+from app.db.session import engine
+
+postgresql_only = pytest.mark.skipif(
+    engine.dialect.name != "postgresql",
+    reason="advisory locks need PostgreSQL (set TEST_DATABASE_URL)",
+)
+
+
+def test_file_lock_is_exclusive(tmp_path: Path) -> None:
+    lock = FileLock(tmp_path / "job.lock")
+    with lock.hold() as first:
+        with FileLock(tmp_path / "job.lock").hold() as second:
+            assert (first, second) == (True, False)
+    with lock.hold() as again:
+        assert again
+
+
+@postgresql_only
+def test_advisory_lock_is_exclusive() -> None:
+    lock = AdvisoryLock(engine, key=4242)
+    with lock.hold() as first:
+        with AdvisoryLock(engine, key=4242).hold() as second:
+            assert (first, second) == (True, False)
+        # another key is an independent lock
+        with AdvisoryLock(engine, key=4243).hold() as other:
+            assert other
+    with lock.hold() as again:
+        assert again
+
+
+@postgresql_only
+def test_default_lock_on_postgresql_is_advisory() -> None:
+    assert isinstance(default_lock(engine), AdvisoryLock)
+
+
+def test_cycle_runs_once_and_skips_while_locked(db: None, tmp_path: Path) -> None:
+    lock = (
+        AdvisoryLock(engine, key=4244)
+        if engine.dialect.name == "postgresql"
+        else FileLock(tmp_path / "job.lock")
+    )
+    cycle = date(2026, 1, 2)
+    with lock.hold():
+        assert run_cycle(today=cycle, lock=lock).skipped == (
+            "another instance is running it"
+        )
+    assert run_cycle(today=cycle, lock=lock).report is not None
+    assert run_cycle(today=cycle, lock=lock).skipped == "already ran"
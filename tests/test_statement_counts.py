@@ -0,0 +1,46 @@
+"""Each single-row write is one round trip (INSERT/UPDATE/DELETE ... RETURNING)."""
+from __future__ import annotations
+
+from app.db.instrumentation import count_statements
+from app.db.session import engine
+from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
+
+
+def test_add_project_is_one_statement(storage: SqlAlchemyStorage) -> None:
+    with count_statements(engine) as counter:
+        storage.add_project("Work", "d")
+    assert counter.count == 1, counter.statements
+
+
+def test_add_task_is_one_statement(storage: SqlAlchemyStorage) -> None:
+    project = storage.add_project("Work", "d")
+    with count_statements(engine) as counter:
+        storage.add_task(project.id, "Report", "d", "2099-01-31")
+    assert counter.count == 1, counter.statements
+
+
+def test_edit_task_is_one_statement(storage: SqlAlchemyStorage) -> None:
+    project = storage.add_project("Work", "d")
+    task = storage.add_task(project.id, "Report", "d", None)
+    with count_statements(engine) as counter:
+        edited = storage.edit_task(project.id, task.id, title="Summary")
+    assert counter.count == 1, counter.statements
+    assert edited.title == "Summary"
+
+
+def test_change_task_status_is_one_statement(storage: SqlAlchemyStorage) -> None:
+    project = storage.add_project("Work", "d")
+    task = storage.add_task(project.id, "Report", "d", None)
+    with count_statements(engine) as counter:
+        changed = storage.change_task_status(project.id, task.id, "done")
+    assert counter.count == 1, counter.statements
+    assert changed.at_closed is not None
+
+
+def test_remove_task_is_one_statement(storage: SqlAlchemyStorage) -> None:
+    project = storage.add_project("Work", "d")
+    task = storage.add_task(project.id, "Report", "d", None)
+    with count_statements(engine) as counter:
+        storage.remove_task(project.id, task.id)
+    assert counter.count == 1, counter.statements
+    assert list(storage.list_tasks(project.id)) == []
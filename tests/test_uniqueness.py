@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+import pytest
+
+from app.db.session import SessionLocal
+from app.exceptions.base import ValidationError
+from app.repositories.sqlalchemy_storage import SqlAlchemyStorage
+
+
+def _race(*calls: Callable[[SqlAlchemyStorage], object]) -> list[str]:
+    """Run each call in its own thread and session, all released together."""
+    barrier = threading.Barrier(len(calls))
+    outcomes: list[str] = []
+    errors: list[BaseException] = []
+
+    def run(call: Callable[[SqlAlchemyStorage], object]) -> None:
+        with SessionLocal() as session:
+            storage = SqlAlchemyStorage(session)
+            barrier.wait()
+            try:
+                call(storage)
+            except ValidationError:
+                outcomes.append("duplicate")
+            except BaseException as exc:  # surfaced in the test thread
+                errors.append(exc)
+            else:
+                outcomes.append("ok")
+
+    threads = [threading.Thread(target=run, args=(call,)) for call in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return sorted(outcomes)
+
+
+def test_duplicate_project_name_is_rejected(storage: SqlAlchemyStorage) -> None:
+    storage.add_project("Work", "d")
+    with pytest.raises(ValidationError):
+        storage.add_project(" work ", "d")
+
+
+def test_concurrent_project_names_differing_in_case(db: None) -> None:
+    outcomes = _race(
+        lambda storage: storage.add_project("Work", "d"),
+        lambda storage: storage.add_project(" work ", "d"),
+    )
+    assert outcomes == ["duplicate", "ok"]
+
+
+def test_concurrent_task_titles_differing_in_case(
+    storage: SqlAlchemyStorage,
+) -> None:
+    project = storage.add_project("Work", "d")
+    outcomes = _race(
+        lambda other: other.add_task(project.id, "Report", "d", None),
+        lambda other: other.add_task(project.id, "REPORT ", "d", None),
+    )
+    assert outcomes == ["duplicate", "ok"]
+    assert [task.title for task in storage.list_tasks(project.id)] in (
+        ["Report"],
+        ["REPORT "],
+    )
+
+
+def test_same_task_title_in_different_projects(storage: SqlAlchemyStorage) -> None:
+    first = storage.add_project("Work", "d")
+    second = storage.add_project("Home", "d")
+    storage.add_task(first.id, "Report", "d", None)
+    storage.add_task(second.id, "report", "d", None)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from app.exceptions.base import ValidationError, NotFoundError
+from app.models.query import ProjectQuery
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
 
@@ -69,15 +70,14 @@ class ToDoCLI:
         print(f"✅ Created project #{project.id}: {project.name}")
 
     def _list_projects(self) -> None:
-        projects = self.project_service.list_projects()
+        # ✅ تعداد تسک‌ها همراه خود پروژه‌ها در یک کوئری (GROUP BY) می‌آید
+        projects = self.project_service.list_projects(ProjectQuery(with_counts=True))
         if not projects:
             print("No projects found.")
             return
 
         for p in projects:
-            # ✅ تعداد تسک‌ها را از TaskService می‌گیریم
-            tasks_count = len(self.task_service.list_tasks(p.id))
-            print(f"[{p.id}] {p.name}: {p.description} — {tasks_count} tasks")
+            print(f"[{p.id}] {p.name}: {p.description} — {p.task_counts.total} tasks")
 
     def _edit_project(self) -> None:
         pid = int(input("Project ID: "))
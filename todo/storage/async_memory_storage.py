@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from typing import AsyncContextManager, Callable, Iterable, TypeVar
+
+from anyio import to_thread
+
+from app.models.bulk import BulkUpdateResult, TaskChanges, TaskDraft
+from app.models.project import Project
+from app.models.query import (
+    ChangeMarker,
+    ProjectQuery,
+    ProjectRow,
+    TaskQuery,
+    TaskRow,
+)
+from app.models.search import SearchHit, SearchQuery
+from app.models.task import Task
+from app.services.async_project_service import AsyncProjectStoragePort
+from app.services.async_task_service import AsyncTaskStoragePort
+from todo.storage.memory_storage import InMemoryStorage
+
+
+R = TypeVar("R")
+
+
+class AsyncInMemoryStorage(AsyncProjectStoragePort, AsyncTaskStoragePort):
+    """نسخه‌ی async از InMemoryStorage برای routerهای async (STORAGE_BACKEND=memory).
+
+    هر متد همان متد InMemoryStorage را در threadpool اجرا می‌کند (مثل run_sync در
+    AsyncSqlAlchemyStorage): لیست/مرتب‌سازی پروژه‌های بزرگ event loop را
+    نگه نمی‌دارد و چند درخواست هم‌زمان واقعاً روی storage مشترک اجرا می‌شوند؛
+    thread-safe بودن با قفل‌ها و snapshotهای خود InMemoryStorage است.
+    """
+
+    def __init__(self, storage: InMemoryStorage) -> None:
+        # ⛔ storage مشترک کل process است و از بیرون تزریق می‌شود (DI)
+        self._sync = storage
+
+    async def _run(self, fn: Callable[[], R]) -> R:
+        return await to_thread.run_sync(fn)
+
+    # ------------- Unit of Work  ------------------------------------
+
+    def unit_of_work(self) -> AsyncContextManager[None]:
+        """تراکنشی در کار نیست: هر تغییر همان لحظه اعمال (و منتشر) می‌شود."""
+        return nullcontext()
+
+    # ------------- Project متدهای  ---------------------------------
+
+    async def add_project(self, name: str, description: str) -> Project:
+        return await self._run(lambda: self._sync.add_project(name, description))
+
+    async def list_projects(self, query: ProjectQuery | None = None) -> list[Project]:
+        return await self._run(lambda: self._sync.list_projects(query))
+
+    async def list_project_rows(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> list[ProjectRow]:
+        return await self._run(lambda: self._sync.list_project_rows(query))
+
+    async def project_list_marker(
+        self,
+        query: ProjectQuery | None = None,
+    ) -> ChangeMarker:
+        # فقط خواندن چند شمارنده است؛ ارزش رفتن به thread را ندارد
+        return self._sync.project_list_marker(query)
+
+    async def get_project(self, project_id: int) -> Project:
+        return await self._run(lambda: self._sync.get_project(project_id))
+
+    async def update_project(
+        self,
+        project_id: int,
+        name: str | None = None,
+        description: str | None = None,
+    ) -> Project:
+        return await self._run(
+            lambda: self._sync.update_project(project_id, name, description)
+        )
+
+    async def remove_project(self, project_id: int) -> None:
+        await self._run(lambda: self._sync.remove_project(project_id))
+
+    # ------------- Task متدهای  ------------------------------------
+
+    async def add_task(
+        self,
+        project_id: int,
+        title: str,
+        description: str,
+        deadline: str | None,
+    ) -> Task:
+        return await self._run(
+            lambda: self._sync.add_task(project_id, title, description, deadline)
+        )
+
+    async def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]:
+        return await self._run(lambda: self._sync.add_tasks(project_id, drafts))
+
+    async def existing_titles(
+        self,
+        project_id: int,
+        titles: Iterable[str],
+    ) -> set[str]:
+        titles = list(titles)
+        return await self._run(lambda: self._sync.existing_titles(project_id, titles))
+
+    async def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[Task]:
+        return await self._run(lambda: self._sync.list_tasks(project_id, query))
+
+    async def list_task_rows(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[TaskRow]:
+        return await self._run(lambda: self._sync.list_task_rows(project_id, query))
+
+    async def task_list_marker(self, project_id: int) -> ChangeMarker:
+        return self._sync.task_list_marker(project_id)
+
+    async def search_tasks(self, query: SearchQuery) -> list[SearchHit]:
+        return await self._run(lambda: self._sync.search_tasks(query))
+
+    async def edit_task(
+        self,
+        project_id: int,
+        task_id: int,
+        title: str | None = None,
+        description: str | None = None,
+        status: str | None = None,
+        deadline: str | None = None,
+    ) -> Task:
+        return await self._run(
+            lambda: self._sync.edit_task(
+                project_id,
+                task_id,
+                title=title,
+                description=description,
+                status=status,
+                deadline=deadline,
+            )
+        )
+
+    async def change_task_status(
+        self,
+        project_id: int,
+        task_id: int,
+        status: str,
+    ) -> Task:
+        return await self._run(
+            lambda: self._sync.change_task_status(project_id, task_id, status)
+        )
+
+    async def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        return await self._run(
+            lambda: self._sync.update_tasks(
+                project_id,
+                query,
+                changes,
+                returning=returning,
+            )
+        )
+
+    async def remove_task(self, project_id: int, task_id: int) -> None:
+        await self._run(lambda: self._sync.remove_task(project_id, task_id))
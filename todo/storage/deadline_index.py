@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Iterable
+
+
+class DeadlineIndex:
+    """Open tasks ordered by (deadline, id).
+
+    In-memory counterpart of the ``ix_tasks_open_deadline`` partial index:
+    only tasks that have a deadline and are not done are kept, so "due before
+    X" is the prefix of the list up to X and nothing else is touched.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[tuple[date, int]] = []
+        self._deadlines: dict[int, date] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set(self, task_id: int, deadline: date | None) -> None:
+        """Track ``task_id`` under ``deadline``; None stops tracking it."""
+        if self._deadlines.get(task_id) == deadline:
+            return
+        self.remove(task_id)
+        if deadline is not None:
+            insort(self._keys, (deadline, task_id))
+            self._deadlines[task_id] = deadline
+
+    def load(self, items: Iterable[tuple[int, date]]) -> None:
+        """Replace the contents with ``(task_id, deadline)`` pairs, sorted once.
+
+        For building the index from existing data: ``set`` one by one would
+        shift the list on every insert.
+        """
+        self._deadlines = dict(items)
+        self._keys = sorted(
+            (deadline, task_id) for task_id, deadline in self._deadlines.items()
+        )
+
+    def remove(self, task_id: int) -> None:
+        deadline = self._deadlines.pop(task_id, None)
+        if deadline is not None:
+            i = bisect_left(self._keys, (deadline, task_id))
+            del self._keys[i]
+
+    def before(self, day: date) -> list[int]:
+        """Ids of the tracked tasks with deadline < ``day``, earliest first."""
+        # (day,) sorts before every (day, id), so this stops at the first ``day``
+        stop = bisect_left(self._keys, (day,))
+        return [task_id for _, task_id in self._keys[:stop]]
@@ -1,69 +1,450 @@
 
 from __future__ import annotations
-from datetime import date
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
 
 import os
-from typing import Optional
+from typing import Any, Callable, ContextManager, Iterable, Iterator, Optional, Sequence
 
 from dotenv import load_dotenv
 
-from app.models.project import Project
-from app.models.task import Task
+from app.models.project import Project, TaskCounts
+from app.models.bulk import BulkUpdateResult, TaskChanges, TaskDraft
+from app.models.task import Status, Task, normalize_title
+from app.models.query import (
+    ChangeMarker,
+    ProjectQuery,
+    ProjectRow,
+    TaskQuery,
+    TaskRow,
+    TaskSort,
+    order_key,
+    task_deadline,
+    task_order_key,
+)
+from app.models.search import (
+    SearchHit,
+    SearchQuery,
+    search_order_key,
+    search_sort_key,
+)
 from app.exceptions.base import ValidationError, NotFoundError
+from todo.storage.deadline_index import DeadlineIndex
+from todo.storage.search_index import SearchIndex
+from todo.storage.task_chunks import TaskChunks
+from todo.storage.wal import (
+    WriteAheadLog,
+    drop_project_record,
+    drop_task_record,
+    project_record,
+    task_record,
+)
 
 
 load_dotenv()  # Load environment variables
 
 PROJECT_MAX = int(os.getenv("PROJECT_OF_NUMBER_MAX", "5"))
 TASK_MAX = int(os.getenv("TASK_OF_NUMBER_MAX", "20"))
+# تعداد قفل‌های نوشتن؛ پروژه‌ی p قفل p % MEMORY_LOCK_SHARDS را می‌گیرد
+LOCK_SHARDS = int(os.getenv("MEMORY_LOCK_SHARDS", "16"))
+
+# مقدار هر فیلد ردیف‌های list_task_rows، همان مقدارهایی که SqlAlchemyStorage
+# از ستون‌ها می‌خواند (status به صورت رشته، deadline به صورت date)
+_TASK_VALUES: dict[str, Callable[[Task], Any]] = {
+    "id": lambda t: t.id,
+    "title": lambda t: t.title,
+    "description": lambda t: t.description,
+    "status": lambda t: t.status.value,
+    "deadline": task_deadline,
+    "at_closed": lambda t: t.at_closed,
+    "created_at": lambda t: t.created_at,
+}
+# فیلدهای نمایشی ردیف‌ها به ترتیب پاسخ API (مثل _TASK_ROW_COLUMNS در SQL)
+_TASK_ROW_FIELDS = ("id", "title", "description", "status", "deadline", "at_closed")
+_PROJECT_ROW_FIELDS = ("id", "name", "description", "created_at")
+
+
+def _row_fields(
+    names: Iterable[str],
+    fields: tuple[str, ...] | None,
+    *,
+    always: Iterable[str] = ("id",),
+) -> list[str]:
+    """نسخه‌ی درحافظه‌ی _row_columns در SqlAlchemyStorage."""
+    if fields is None:
+        return list(names)
+    wanted = {*fields, *always}
+    return [name for name in names if name in wanted]
+
+
+def _wants(fields: tuple[str, ...] | None, name: str) -> bool:
+    return fields is None or name in fields
+
+
+def _task_row(task: Task, names: Iterable[str]) -> TaskRow:
+    return {name: _TASK_VALUES[name](task) for name in names}
+
+
+@dataclass(slots=True, frozen=True)
+class _ProjectView:
+    """نمای فقط‌خواندنی یک پروژه که خواننده‌ها بدون قفل از آن می‌خوانند.
+
+    نه Project و نه Taskهای داخلش بعد از انتشار تغییر نمی‌کنند: نوشتن‌ها روی
+    کپی انجام می‌شوند و نمای تازه با یک انتساب جای این یکی را می‌گیرد. تسک‌ها
+    در TaskChunks تکه‌تکه نگه داشته می‌شوند تا نمای تازه فقط تکه‌ی عوض‌شده را
+    کپی کند و بقیه را با نمای قبلی شریک باشد. چون
+    نما ثابت است، ترتیب‌های مرتب‌شده و شمارش‌ها یک بار برای هر نما حساب و
+    نگه داشته می‌شوند (دو خواننده‌ی هم‌زمان در بدترین حالت دو بار حساب می‌کنند).
+    """
+
+    project: Project  # بدون tasks
+    tasks: TaskChunks  # به ترتیب id
+    version: int
+    _derived: dict[Any, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def sorted_by(self, sort: TaskSort) -> Sequence[Task]:
+        """تسک‌ها به ترتیب ``sort`` (همان ORDER BY در SQL)."""
+        if sort is TaskSort.ID:
+            return self.tasks
+        ordered = self._derived.get(sort)
+        if ordered is None:
+            ordered = sorted(self.tasks, key=lambda t: task_order_key(t, sort))
+            self._derived[sort] = ordered
+        return ordered
+
+    def counts(self) -> TaskCounts:
+        counts = self._derived.get("counts")
+        if counts is None:
+            by_status = Counter(t.status for t in self.tasks)
+            counts = TaskCounts(
+                todo=by_status[Status.TODO],
+                doing=by_status[Status.DOING],
+                done=by_status[Status.DONE],
+            )
+            self._derived["counts"] = counts
+        return counts
+
+
+def _open_deadline(task: Task) -> date | None:
+    """کلید تسک در DeadlineIndex: deadline تسک‌های باز، وگرنه None."""
+    if task.status is Status.DONE:
+        return None
+    try:
+        return task_deadline(task)
+    except ValueError:
+        # deadline خراب هیچ‌وقت overdue حساب نمی‌شد؛ ایندکس هم نمی‌شود
+        return None
 
 
 class InMemoryStorage:
-    """Simple in-memory storage for projects and tasks."""
+    """In-memory storage for projects and tasks, safe to share between threads.
+
+    نوشتن‌ها: هر پروژه یکی از LOCK_SHARDS قفل را دارد (sharded lock) و همه‌ی
+    عملیات روی تسک‌های آن پروژه زیر همان قفل انجام می‌شوند؛ نوشتن در
+    پروژه‌های مختلف جز برای لحظه‌ی کوتاه به‌روزرسانی شمارنده‌ها و ایندکس‌های
+    مشترک (``self._lock``) منتظر هم نمی‌مانند. ترتیب گرفتن قفل‌ها همیشه
+    shard و بعد ``self._lock`` است.
+
+    خواندن‌ها: لیست‌ها، get_project و markerها از ``_ProjectView``هایی می‌خوانند
+    که نوشتن‌ها منتشر می‌کنند (copy-on-write): هیچ قفلی نمی‌گیرند، پس هیچ‌وقت
+    نوشتن را معطل نمی‌کنند و هر خواندن یک snapshot سازگار از پروژه می‌بیند.
+    Taskها هیچ‌وقت درجا تغییر نمی‌کنند؛ ویرایش روی کپی انجام و جایگزین می‌شود.
+    جستجو و overdue که از ایندکس‌های مشترک می‌خوانند، ``self._lock`` را فقط
+    برای خواندن ایندکس می‌گیرند.
+
+    ماندگاری (اختیاری، ``wal``): هر نوشتن بعد از انتشار، هنوز زیر قفل‌هایش،
+    رکورد حالت جدید را در WriteAheadLog صف می‌کند (پس ترتیب log همان ترتیب
+    اعمال است) و بعد از آزاد کردن قفل‌ها منتظر fsync می‌ماند (group commit).
+    ساختن storage از snapshot و log کار todo.storage.persistence است.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        lock_shards: int = LOCK_SHARDS,
+        project_max: int | None = None,
+        task_max: int | None = None,
+        wal: WriteAheadLog | None = None,
+    ) -> None:
+        self._project_max = PROJECT_MAX if project_max is None else project_max
+        self._task_max = TASK_MAX if task_max is None else task_max
+        # وضعیت سمت نوشتن (فقط زیر قفل‌ها تغییر می‌کند)
         self.projects: dict[int, Project] = {}
         self._project_counter = 1
         self._task_counter = 1
+        # normalized project name -> project id (uniqueness without a scan)
+        self._project_names: dict[str, int] = {}
+        # number of stored tasks across all projects (for TASK_MAX)
+        self._task_count = 0
+        self._search = SearchIndex()
+        # task id -> project id، برای پیدا کردن تسک نتایج جستجو
+        self._task_owner: dict[int, int] = {}
+        # تسک‌های باز (done نشده) با deadline، مرتب بر اساس (deadline, id)
+        self._deadlines = DeadlineIndex()
 
-    # --- Project operations --------------------------------------------
-    def add_project(self, name: str, description: str) -> Project:
-        """Add a new project if name unique and limit not exceeded."""
-        if len(self.projects) >= PROJECT_MAX:
-            raise ValidationError("maximum number of projects reached")
+        self._lock = threading.Lock()
+        self._shards = tuple(threading.Lock() for _ in range(max(1, lock_shards)))
 
-        if any(p.name == name for p in self.projects.values()):
-            raise ValidationError(f"project name '{name}' already exists")
+        # سمت خواندن: project id -> آخرین نمای منتشرشده. افزودن/حذف پروژه یک
+        # dict تازه می‌سازد، پس پیمایش خواننده‌ها هیچ‌وقت با تغییر اندازه برخورد نمی‌کند.
+        self._views: dict[int, _ProjectView] = {}
+        # با هر نوشتن زیاد می‌شوند؛ مبنای ETag (مثل max(updated_at) در SQL).
+        # epoch جلوی یکی شدن ETag دو process مختلف را می‌گیرد.
+        self._epoch = time.time_ns()
+        self._version = 0
+        self._projects_version = 0
+        self._wal = wal
 
-        project = Project(self._project_counter, name, description)
-        self.projects[self._project_counter] = project
-        self._project_counter += 1
-        return project
+    def unit_of_work(self) -> ContextManager[None]:
+        """Nothing to batch in memory: every mutation is applied immediately."""
+        return nullcontext()
 
-    def get_project(self, project_id: int) -> Project:
+    # --- Locks & snapshots ---------------------------------------------
+    def _shard(self, project_id: int) -> threading.Lock:
+        return self._shards[project_id % len(self._shards)]
+
+    def _project(self, project_id: int) -> Project:
+        """پروژه‌ی سمت نوشتن؛ فقط زیر قفل shard همان پروژه استفاده شود."""
         project = self.projects.get(project_id)
         if not project:
             raise NotFoundError(f"project {project_id} not found")
         return project
 
+    def _view(self, project_id: int) -> _ProjectView:
+        view = self._views.get(project_id)
+        if view is None:
+            raise NotFoundError(f"project {project_id} not found")
+        return view
+
+    def _publish(
+        self,
+        project: Project,
+        *,
+        put: Iterable[Task] = (),
+        drop: Iterable[int] = (),
+    ) -> None:
+        """نمای تازه‌ی ``project`` را منتشر می‌کند (زیر قفل shard پروژه).
+
+        ``put`` تسک‌های اضافه/جایگزین‌شده و ``drop`` id تسک‌های حذف‌شده است؛
+        فقط تکه‌هایی از TaskChunks که این تغییرها در آن‌ها می‌افتند کپی
+        می‌شوند (نه همه‌ی تسک‌های پروژه)، آن هم بیرون از ``self._lock``.
+        """
+        meta = replace(project, tasks=[])
+        # نمای این پروژه فقط زیر همین قفل shard عوض می‌شود
+        tasks = self._views[project.id].tasks.updated(put, drop)
+        with self._lock:
+            self._version += 1
+            self._views[project.id] = _ProjectView(meta, tasks, self._version)
+
+    def _indexed_tasks(self, task_ids: Iterable[int]) -> Iterator[tuple[Task, int]]:
+        """(تسک، project id) برای idهایی که از ایندکس‌ها آمده‌اند (زیر self._lock).
+
+        نوشتن‌ها تسک‌های پروژه و ایندکس‌ها را در یک بخش زیر self._lock عوض
+        می‌کنند، پس این‌جا هر دو با هم سازگارند؛ Taskها هم درجا تغییر نمی‌کنند.
+        """
+        for task_id in task_ids:
+            project_id = self._task_owner[task_id]
+            yield self.projects[project_id].get_task(task_id), project_id
+
+    # --- Write-ahead log -----------------------------------------------
+    def _log(self, *records: list) -> int:
+        """رکوردها را بدون انتظار در WAL صف می‌کند (زیر همان قفل‌های نوشتن)."""
+        return self._wal.append(*records) if self._wal is not None and records else 0
+
+    def _sync_log(self, lsn: int) -> None:
+        """بعد از آزاد کردن قفل‌ها: تا رسیدن رکوردها به دیسک صبر می‌کند."""
+        if lsn:
+            self._wal.sync(lsn)
+
+    def _restore(
+        self,
+        projects: list[Project],
+        *,
+        project_counter: int,
+        task_counter: int,
+    ) -> None:
+        """وضعیت بازیابی‌شده (snapshot + log) را در همین storage خالی بار می‌کند.
+
+        بدون اعتبارسنجی و بدون log (این داده قبلاً پذیرفته و ثبت شده)؛
+        ایندکس‌ها، شمارنده‌ها و نماها یک‌جا از روی داده ساخته می‌شوند.
+        ``projects`` به ترتیب id و تسک‌های هر پروژه هم به ترتیب id.
+        """
+        with self._lock:
+            self.projects = {p.id: p for p in projects}
+            self._project_names = {normalize_title(p.name): p.id for p in projects}
+            self._project_counter = project_counter
+            self._task_counter = task_counter
+            self._task_count = sum(len(p.tasks) for p in projects)
+            open_deadlines = []
+            for project in projects:
+                for task in project.tasks:
+                    self._task_owner[task.id] = project.id
+                    deadline = _open_deadline(task)
+                    if deadline is not None:
+                        open_deadlines.append((task.id, deadline))
+            self._deadlines.load(open_deadlines)
+            self._search.load(
+                (t.id, t.title, t.description) for p in projects for t in p.tasks
+            )
+
+            self._version += 1
+            self._projects_version += 1
+            self._views = {
+                p.id: _ProjectView(
+                    replace(p, tasks=[]), TaskChunks.of(p.tasks), self._version
+                )
+                for p in projects
+            }
+
+    # --- Project operations --------------------------------------------
+    def add_project(self, name: str, description: str) -> Project:
+        """Add a new project if name unique and limit not exceeded."""
+        with self._lock:
+            if len(self.projects) >= self._project_max:
+                raise ValidationError("maximum number of projects reached")
+
+            self._ensure_unique_project_name(name)
+
+            project = Project(self._project_counter, name, description)
+            self.projects[self._project_counter] = project
+            self._project_names[normalize_title(name)] = project.id
+            self._project_counter += 1
+
+            self._version += 1
+            self._projects_version += 1
+            view = _ProjectView(replace(project, tasks=[]), TaskChunks(), self._version)
+            self._views = {**self._views, project.id: view}
+            lsn = self._log(project_record(project))
+        self._sync_log(lsn)
+        return view.project
+
+    def _ensure_unique_project_name(
+        self, name: str, exclude_id: int | None = None
+    ) -> None:
+        owner = self._project_names.get(normalize_title(name))
+        if owner is not None and owner != exclude_id:
+            raise ValidationError(f"project name '{name}' already exists")
+
+    def get_project(self, project_id: int) -> Project:
+        view = self._view(project_id)
+        return replace(view.project, tasks=list(view.tasks))
+
     def update_project(
         self,
         project_id: int,
         name: str | None = None,
         description: str | None = None,
     ) -> Project:
-        project = self.get_project(project_id)
-        project.rename(name=name, description=description)
-        return project
+        with self._shard(project_id):
+            project = self._project(project_id)
+            with self._lock:
+                if name is not None:
+                    self._ensure_unique_project_name(name, exclude_id=project_id)
+                old_name = project.name
+                project.rename(name=name, description=description)
+                if project.name != old_name:
+                    del self._project_names[normalize_title(old_name)]
+                    self._project_names[normalize_title(project.name)] = project_id
+                self._projects_version += 1
+            self._publish(project)
+            updated = self._views[project_id].project
+            lsn = self._log(project_record(project))
+        self._sync_log(lsn)
+        return updated
+
+    def list_projects(self, query: ProjectQuery | None = None) -> list[Project]:
+        query = query or ProjectQuery()
+        projects = []
+        for view in self._project_page(query):
+            project = view.project
+            if query.with_counts:
+                # کپی سطحی تا شمارش‌ها روی نمای منتشرشده باقی نماند
+                project = replace(project, task_counts=replace(view.counts()))
+            if query.tasks_limit is not None:
+                project = replace(project, tasks=self._top_tasks(view, query.tasks_limit))
+            projects.append(project)
+        return projects
+
+    def list_project_rows(self, query: ProjectQuery | None = None) -> list[ProjectRow]:
+        """همان قرارداد SqlAlchemyStorage.list_project_rows، از روی نماها."""
+        query = query or ProjectQuery()
+        names = _row_fields(_PROJECT_ROW_FIELDS, query.fields)
+        with_counts = query.with_counts and _wants(query.fields, "task_counts")
+        with_tasks = query.tasks_limit is not None and _wants(query.fields, "tasks")
+        rows = []
+        for view in self._project_page(query):
+            item = {name: getattr(view.project, name) for name in names}
+            counts = view.counts() if with_counts else None
+            item["task_counts"] = (
+                {
+                    "todo": counts.todo,
+                    "doing": counts.doing,
+                    "done": counts.done,
+                    "total": counts.total,
+                }
+                if counts is not None
+                else None
+            )
+            item["tasks"] = (
+                [
+                    _task_row(t, _TASK_ROW_FIELDS)
+                    for t in self._top_tasks(view, query.tasks_limit)
+                ]
+                if with_tasks
+                else None
+            )
+            rows.append(item)
+        return rows
+
+    def project_list_marker(self, query: ProjectQuery | None = None) -> ChangeMarker:
+        """(epoch، تعداد پروژه‌ها، نسخه‌ی پروژه‌ها)؛ اگر ``query`` تسک‌ها را embed
+        کند (counts یا tasks) نسخه‌ی کل داده هم.
+
+        شمارنده‌ها در حافظه‌اند، پس (برخلاف SqlAlchemyStorage) محدود کردن به
+        صفحه‌ی ``query`` چیزی ارزان‌تر نمی‌کند.
+        """
+        query = query or ProjectQuery()
+        marker: ChangeMarker = (self._epoch, len(self._views), self._projects_version)
+        if query.with_counts or query.tasks_limit is not None:
+            marker += (self._task_count, self._version)
+        return marker
 
-    def list_projects(self) -> list[Project]:
-        return sorted(self.projects.values(), key=lambda p: p.created_at)
+    def _project_page(self, query: ProjectQuery) -> list[_ProjectView]:
+        # dict به ترتیب درج (یعنی id صعودی) است؛ همان ترتیب SqlAlchemyStorage
+        views = self._views
+        ids = list(views)
+        start = 0 if query.after is None else bisect_right(ids, query.after[-1])
+        stop = None if query.limit is None else start + query.limit
+        return [views[pid] for pid in ids[start:stop]]
+
+    @staticmethod
+    def _top_tasks(view: _ProjectView, limit: int) -> list[Task]:
+        """N تسک اول پروژه بر اساس deadline (مثل SqlAlchemyStorage)."""
+        return list(view.sorted_by(TaskSort.DEADLINE)[:limit])
 
     def remove_project(self, project_id: int) -> None:
         """Remove a project and cascade-delete its tasks."""
-        if project_id not in self.projects:
-            raise NotFoundError(f"project {project_id} not found")
-        del self.projects[project_id]
+        with self._shard(project_id), self._lock:
+            project = self.projects.pop(project_id, None)
+            if project is None:
+                raise NotFoundError(f"project {project_id} not found")
+            del self._project_names[normalize_title(project.name)]
+            self._task_count -= len(project.tasks)
+            for task in project.tasks:
+                self._unindex(task.id)
+
+            views = dict(self._views)
+            del views[project_id]
+            self._views = views
+            self._version += 1
+            self._projects_version += 1
+            lsn = self._log(drop_project_record(project_id))
+        self._sync_log(lsn)
 
     # --- Task operations -----------------------------------------------
     def add_task(
@@ -73,29 +454,188 @@ class InMemoryStorage:
         description: str,
         deadline: Optional[str] = None,
     ) -> Task:
-        project = self.get_project(project_id)
+        with self._shard(project_id):
+            project = self._project(project_id)
+            task = self._add_task(project, title, description, deadline)
+            self._publish(project, put=(task,))
+            lsn = self._log(task_record(project_id, task))
+        self._sync_log(lsn)
+        return task
 
-        all_tasks = sum(len(p.tasks) for p in self.projects.values())
-        if all_tasks >= TASK_MAX:
-            raise ValidationError("maximum number of tasks reached")
+    def _add_task(
+        self,
+        project: Project,
+        title: str,
+        description: str,
+        deadline: Optional[str],
+    ) -> Task:
+        """افزودن بدون انتشار؛ قفل shard پروژه باید گرفته شده باشد."""
+        with self._lock:
+            if self._task_count >= self._task_max:
+                raise ValidationError("maximum number of tasks reached")
 
-        task = Task(self._task_counter, title, description, "todo", deadline)
-        project.add_task(task)
-        self._task_counter += 1
+            task = Task(self._task_counter, title, description, "todo", deadline)
+            project.add_task(task)
+            self._task_counter += 1
+            self._task_count += 1
+            self._index(project.id, task)
         return task
 
+    def _index(self, project_id: int, task: Task) -> None:
+        self._search.add(task.id, task.title, task.description)
+        self._task_owner[task.id] = project_id
+        self._track_deadline(task)
+
+    def _unindex(self, task_id: int) -> None:
+        self._search.remove(task_id)
+        self._task_owner.pop(task_id, None)
+        self._deadlines.remove(task_id)
+
+    def _track_deadline(self, task: Task) -> None:
+        """بعد از هر تغییر deadline یا status جای تسک را در DeadlineIndex به‌روز می‌کند."""
+        self._deadlines.set(task.id, _open_deadline(task))
+
+    def add_tasks(self, project_id: int, drafts: list[TaskDraft]) -> list[Task]:
+        """All-or-nothing: if one draft is rejected, none of them stay added."""
+        with self._shard(project_id):
+            project = self._project(project_id)
+            added: list[Task] = []
+            try:
+                for d in drafts:
+                    added.append(
+                        self._add_task(project, d.title, d.description, d.deadline)
+                    )
+            except (ValidationError, NotFoundError):
+                for task in added:
+                    self._remove_task(project, task.id)
+                raise
+            if added:
+                self._publish(project, put=added)
+            lsn = self._log(*(task_record(project_id, t) for t in added))
+        self._sync_log(lsn)
+        return added
+
+    def existing_titles(self, project_id: int, titles: Iterable[str]) -> set[str]:
+        with self._shard(project_id):
+            project = self._project(project_id)
+            return {t for t in set(titles) if project.task_with_title(t) is not None}
+
+    def update_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery,
+        changes: TaskChanges,
+        *,
+        returning: bool = False,
+    ) -> BulkUpdateResult:
+        with self._shard(project_id):
+            project = self._project(project_id)
+            # اول همه‌ی کپی‌ها ساخته می‌شوند؛ اگر یکی خطا بدهد چیزی عوض نشده
+            updated: list[Task] = []
+            for task in project.tasks:
+                if not query.matches(task):
+                    continue
+                task = replace(task)
+                if changes.status is not None:
+                    task.change_status(changes.status)
+                if changes.deadline is not None:
+                    task.deadline = changes.deadline
+                if changes.shift_deadline_days is not None:
+                    deadline = task_deadline(task)
+                    if deadline is not None:
+                        task.deadline = deadline + timedelta(
+                            days=changes.shift_deadline_days
+                        )
+                updated.append(task)
+            with self._lock:
+                for task in updated:
+                    project.replace_task(task)
+                    self._track_deadline(task)
+            if updated:
+                self._publish(project, put=updated)
+            lsn = self._log(*(task_record(project_id, t) for t in updated))
+        self._sync_log(lsn)
+        return BulkUpdateResult(
+            updated=len(updated),
+            tasks=updated if returning else None,
+        )
+
     def remove_task(self, project_id: int, task_id: int) -> None:
-        project = self.get_project(project_id)
-        project.remove_task(task_id)
+        with self._shard(project_id):
+            project = self._project(project_id)
+            self._remove_task(project, task_id)
+            self._publish(project, drop=(task_id,))
+            lsn = self._log(drop_task_record(project_id, task_id))
+        self._sync_log(lsn)
+
+    def _remove_task(self, project: Project, task_id: int) -> None:
+        with self._lock:
+            project.remove_task(task_id)
+            self._task_count -= 1
+            self._unindex(task_id)
 
-    def list_tasks(self, project_id: int) -> list[Task]:
-        project = self.get_project(project_id)
-        return project.list_tasks()
+    def list_tasks(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[Task]:
+        query = query or TaskQuery()
+        view = self._view(project_id)
+
+        # ترتیب هر sort یک بار برای هر نما ساخته می‌شود؛ فیلتر ترتیب را حفظ می‌کند
+        tasks = view.sorted_by(query.sort)
+        if query.has_filters:
+            tasks = [t for t in tasks if query.matches(t)]
+
+        # bisect جای شروع صفحه را O(log n) پیدا می‌کند (keyset مثل SQL)
+        start = (
+            0
+            if query.after is None
+            else bisect_right(
+                tasks,
+                order_key(query.after, query.sort),
+                key=lambda t: task_order_key(t, query.sort),
+            )
+        )
+        stop = None if query.limit is None else start + query.limit
+        return list(tasks[start:stop])
+
+    def list_task_rows(
+        self,
+        project_id: int,
+        query: TaskQuery | None = None,
+    ) -> list[TaskRow]:
+        """همان قرارداد SqlAlchemyStorage.list_task_rows (فقط فیلدهای خواسته‌شده)."""
+        query = query or TaskQuery()
+        names = _row_fields(
+            _TASK_ROW_FIELDS,
+            query.fields,
+            always=("id", "deadline") if query.sort is TaskSort.DEADLINE else ("id",),
+        )
+        if query.sort is TaskSort.CREATED_AT:
+            names.append("created_at")
+        return [_task_row(t, names) for t in self.list_tasks(project_id, query)]
 
-    def change_task_status(self, project_id: int, task_id: int, status: str) -> None:
-        project = self.get_project(project_id)
-        task = project.get_task(task_id)
-        task.change_status(status)
+    def task_list_marker(self, project_id: int) -> ChangeMarker:
+        """(epoch، تعداد، نسخه‌ی نمای پروژه)؛ با هر نوشتن در پروژه عوض می‌شود.
+
+        :raises NotFoundError: اگر پروژه وجود نداشته باشد
+        """
+        view = self._view(project_id)
+        return (self._epoch, len(view.tasks), view.version)
+
+    def change_task_status(self, project_id: int, task_id: int, status: str) -> Task:
+        with self._shard(project_id):
+            project = self._project(project_id)
+            task = replace(project.get_task(task_id))
+            task.change_status(status)
+            with self._lock:
+                project.replace_task(task)
+                self._track_deadline(task)
+            self._publish(project, put=(task,))
+            lsn = self._log(task_record(project_id, task))
+        self._sync_log(lsn)
+        return task
 
     def edit_task(
         self,
@@ -106,39 +646,86 @@ class InMemoryStorage:
         description: Optional[str] = None,
         status: Optional[str] = None,
         deadline: Optional[str] = None,
-    ) -> None:
-        project = self.get_project(project_id)
-        task = project.get_task(task_id)
-        task.update(
-            title=title,
-            description=description,
-            status=status,
-            deadline=deadline,
-        )
-    # --- Overdue helper ------------------------------------------------
-    def iter_overdue(self, today: date | None = None) -> list[Task]:
-        """برگرداندن همه تسک‌های دیرکرددار (deadline گذشته و status != done)."""
-        if today is None:
-            today = date.today()
+    ) -> Task:
+        with self._shard(project_id):
+            project = self._project(project_id)
+            task = replace(project.get_task(task_id))
+            if title is not None:
+                other = project.task_with_title(title)
+                if other is not None and other.id != task_id:
+                    raise ValidationError(
+                        f"task title '{title}' already exists in project {project_id}"
+                    )
+            task.update(
+                title=title,
+                description=description,
+                status=status,
+                deadline=deadline,
+            )
+            with self._lock:
+                project.replace_task(task)
+                if title is not None or description is not None:
+                    self._search.add(task.id, task.title, task.description)
+                if status is not None or deadline is not None:
+                    self._track_deadline(task)
+            self._publish(project, put=(task,))
+            lsn = self._log(task_record(project_id, task))
+        self._sync_log(lsn)
+        return task
 
-        overdue_tasks: list[Task] = []
+    # --- Search --------------------------------------------------------
+    def search_tasks(self, query: SearchQuery) -> list[SearchHit]:
+        """Same contract as SqlAlchemyStorage.search_tasks, from SearchIndex.
 
-        for project in self.projects.values():
-            # فرض می‌کنیم project.list_tasks() لیست Taskها رو می‌ده
-            for task in project.list_tasks():
-                # اگر deadline نداشت، اصلاً بررسی نمی‌کنیم
-                if not task.deadline:
-                    continue
+        Words are matched like PostgreSQL's 'simple' configuration; the rank
+        is a weighted word count, close to but not equal to ts_rank.
+        """
+        with self._lock:
+            ranks = self._search.search(query.text)
+            hits = [
+                SearchHit(task=task, project_id=project_id, rank=ranks[task.id])
+                for task, project_id in self._indexed_tasks(ranks)
+            ]
+        hits.sort(key=lambda h: search_order_key(search_sort_key(h)))
+        start = (
+            0
+            if query.after is None
+            else bisect_right(
+                hits,
+                search_order_key(query.after),
+                key=lambda h: search_order_key(search_sort_key(h)),
+            )
+        )
+        stop = None if query.limit is None else start + query.limit
+        return hits[start:stop]
 
-                try:
-                    # چون تو add_task deadline رو به صورت str می‌فرستی،
-                    # فرض می‌کنیم فرمتش YYYY-MM-DD هست و با fromisoformat می‌خونیم.
-                    task_deadline = date.fromisoformat(task.deadline)
-                except ValueError:
-                    # اگر فرمت تاریخ خراب بود، ازش می‌گذریم
-                    continue
+    # --- Export --------------------------------------------------------
+    def iter_task_rows(self, *, batch_size: int = 1000) -> Iterator[dict]:
+        views = self._views
+        for project_id in sorted(views):
+            for task in views[project_id].tasks:
+                yield {
+                    "project_id": project_id,
+                    "id": task.id,
+                    "title": task.title,
+                    "description": task.description,
+                    "status": task.status.value,
+                    "deadline": task_deadline(task),
+                    "at_closed": task.at_closed,
+                    "created_at": task.created_at,
+                }
 
-                if task_deadline < today and task.status != "done":
-                    overdue_tasks.append(task)
+    # --- Overdue helper ------------------------------------------------
+    def iter_overdue(self, today: date | None = None) -> list[Task]:
+        """تسک‌های دیرکرددار (deadline قبل از today و status != done).
 
-        return overdue_tasks
\ No newline at end of file
+        فقط ابتدای DeadlineIndex تا today خوانده می‌شود، نه همه‌ی تسک‌ها؛
+        ترتیب خروجی (deadline, id) است، مثل SqlAlchemyStorage.iter_overdue.
+        با today دلخواه همین متد «تسک‌های باز با موعد قبل از X» را می‌دهد.
+        """
+        if today is None:
+            today = date.today()
+        with self._lock:
+            return [
+                task for task, _ in self._indexed_tasks(self._deadlines.before(today))
+            ]
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from operator import attrgetter
+from pathlib import Path
+from typing import Any
+
+from app.models.project import Project
+from app.models.task import Task
+from todo.storage.memory_storage import InMemoryStorage
+from todo.storage.snapshot import Snapshot, read_snapshot, write_snapshot
+from todo.storage.wal import (
+    Record,
+    WriteAheadLog,
+    fsync_directory,
+    list_segments,
+    read_segment,
+    record_project,
+    record_task,
+)
+
+
+# پوشه‌ی WAL و snapshot؛ خالی یعنی InMemoryStorage ماندگار نیست (پیش‌فرض)
+DATA_DIR = os.getenv("MEMORY_DATA_DIR", "").strip()
+# 0: بدون fsync (فقط write)؛ سریع‌تر ولی با crash سیستم‌عامل ممکن است آخرین تغییرات برود
+WAL_FSYNC = os.getenv("MEMORY_WAL_FSYNC", "1") == "1"
+# هر چند ثانیه یک snapshot (اگر از snapshot قبلی چیزی نوشته شده باشد)
+SNAPSHOT_SECONDS = float(os.getenv("MEMORY_SNAPSHOT_SECONDS", "300"))
+
+SNAPSHOT_NAME = "snapshot.bin"
+
+
+@dataclass(slots=True)
+class RecoveryReport:
+    """What startup loaded: snapshot size, log records replayed, time taken."""
+
+    snapshot_tasks: int = 0
+    segments: int = 0
+    replayed: int = 0
+    projects: int = 0
+    tasks: int = 0
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.projects} project(s), {self.tasks} task(s) restored in "
+            f"{self.elapsed:.3f}s (snapshot: {self.snapshot_tasks} task(s); "
+            f"replayed {self.replayed} record(s) from {self.segments} segment(s))"
+        )
+
+
+@dataclass(slots=True)
+class CheckpointReport:
+    """One snapshot: where the log resumes, its size and how long it took."""
+
+    segment: int
+    tasks: int
+    size: int
+    elapsed: float
+
+    def __str__(self) -> str:
+        return (
+            f"snapshot of {self.tasks} task(s), {self.size} bytes in "
+            f"{self.elapsed:.3f}s; log resumes at segment {self.segment}"
+        )
+
+
+class _Replay:
+    """Applies log records on top of a snapshot, without any validation.
+
+    The records are post-change states, so applying them in log order leaves
+    every project/task as the last record says. Validation is skipped on
+    purpose: it already passed when the change was made (a deadline that was
+    in the future then may well be in the past now).
+    """
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        self.projects = {p.id: p for p in snapshot.projects}
+        # id -> task maps, built only for the projects the log touches
+        self._tasks: dict[int, dict[int, Task]] = {}
+        # highest ids the log mentions, including projects/tasks dropped later
+        # in it: the counters must never hand those ids out again
+        self.max_project_id = 0
+        self.max_task_id = 0
+
+    def _tasks_of(self, project_id: int) -> dict[int, Task] | None:
+        project = self.projects.get(project_id)
+        if project is None:
+            # dropped later in the log (or before the snapshot was taken)
+            return None
+        tasks = self._tasks.get(project_id)
+        if tasks is None:
+            tasks = self._tasks[project_id] = {t.id: t for t in project.tasks}
+        return tasks
+
+    def apply(self, record: Record) -> None:
+        kind = record[0]
+        if kind == "task":
+            self.max_task_id = max(self.max_task_id, record[2])
+            tasks = self._tasks_of(record[1])
+            if tasks is not None:
+                tasks[record[2]] = record_task(record)
+        elif kind == "drop_task":
+            self.max_task_id = max(self.max_task_id, record[2])
+            tasks = self._tasks_of(record[1])
+            if tasks is not None:
+                tasks.pop(record[2], None)
+        elif kind == "project":
+            self.max_project_id = max(self.max_project_id, record[1])
+            project = record_project(record)
+            old = self.projects.get(project.id)
+            if old is not None:
+                project.tasks = old.tasks
+            self.projects[project.id] = project
+        elif kind == "drop_project":
+            self.max_project_id = max(self.max_project_id, record[1])
+            self.projects.pop(record[1], None)
+            self._tasks.pop(record[1], None)
+        else:
+            raise ValueError(f"unknown log record {kind!r}")
+
+    def result(self) -> list[Project]:
+        for project_id, tasks in self._tasks.items():
+            self.projects[project_id].tasks = sorted(
+                tasks.values(), key=attrgetter("id")
+            )
+        return [self.projects[pid] for pid in sorted(self.projects)]
+
+
+class MemoryPersistence:
+    """Durability for one InMemoryStorage: write-ahead log + periodic snapshots.
+
+    Files in ``directory``:
+      ``snapshot.bin``   binary snapshot (see todo.storage.snapshot), replaced
+                         atomically by every checkpoint
+      ``wal-N.log``      log segments; the snapshot names the first one to replay
+
+    ``open()`` restores the storage (snapshot through mmap, then the log) and
+    returns it with the log attached: from then on every mutation returns only
+    after its record is on disk. ``start()`` runs checkpoints in a background
+    thread, ``close()`` writes a last one.
+
+    A checkpoint does not stop writers: it rotates the log, then copies the
+    published project views. A change that lands in between is both in the
+    snapshot and in the new segment, which is harmless because replaying a
+    post-change record over its own result changes nothing.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        fsync: bool = WAL_FSYNC,
+        snapshot_seconds: float = SNAPSHOT_SECONDS,
+    ) -> None:
+        self.directory = Path(directory)
+        self._fsync = fsync
+        self._snapshot_seconds = snapshot_seconds
+        self._wal: WriteAheadLog | None = None
+        self._storage: InMemoryStorage | None = None
+        self._checkpoint_lock = threading.Lock()
+        # LSN the last snapshot covers; nothing new since -> no checkpoint
+        self._checkpointed = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.recovery: RecoveryReport | None = None
+        self.last_checkpoint: CheckpointReport | None = None
+
+    @property
+    def storage(self) -> InMemoryStorage:
+        if self._storage is None:
+            raise RuntimeError("MemoryPersistence.open() was not called")
+        return self._storage
+
+    def open(self, **storage_options: Any) -> InMemoryStorage:
+        """Restore the storage from ``directory`` and attach the log to it."""
+        if self._storage is not None:
+            return self._storage
+        self.directory.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        # millions of new long-lived objects: without this the cyclic GC
+        # rescans all of them again and again while they are being created
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            storage, report = self._restore(storage_options)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        # and keeps them out of later full collections (they live as long as
+        # the process; refcounting still frees the ones that get replaced)
+        gc.freeze()
+        report.elapsed = time.perf_counter() - started
+        self.recovery = report
+        if report.replayed:
+            # the next start should not have to replay the same records again
+            self.checkpoint()
+        return storage
+
+    def _restore(
+        self, storage_options: dict[str, Any]
+    ) -> tuple[InMemoryStorage, RecoveryReport]:
+
+        snapshot = read_snapshot(self.directory / SNAPSHOT_NAME) or Snapshot(0, 1, 1)
+        report = RecoveryReport(snapshot_tasks=snapshot.task_count)
+        replay = _Replay(snapshot)
+        last_segment = snapshot.segment
+        for segment, path in list_segments(self.directory):
+            if segment < snapshot.segment:
+                continue
+            report.segments += 1
+            last_segment = segment
+            for record in read_segment(path):
+                replay.apply(record)
+                report.replayed += 1
+        projects = replay.result()
+
+        # a fresh segment: the last one may end with a torn record
+        self._wal = WriteAheadLog(self.directory, last_segment + 1, fsync=self._fsync)
+        storage = InMemoryStorage(wal=self._wal, **storage_options)
+        storage._restore(
+            projects,
+            project_counter=max(
+                [
+                    snapshot.project_counter,
+                    replay.max_project_id + 1,
+                    *(p.id + 1 for p in projects),
+                ]
+            ),
+            task_counter=max(snapshot.task_counter, replay.max_task_id + 1),
+        )
+        self._storage = storage
+
+        report.projects = len(projects)
+        report.tasks = storage._task_count
+        return storage, report
+
+    def checkpoint(self) -> CheckpointReport:
+        """Write a snapshot of the current state and drop the log it makes obsolete."""
+        storage = self.storage
+        assert self._wal is not None
+        with self._checkpoint_lock:
+            started = time.perf_counter()
+            lsn = self._wal.appended
+            # every record from here on goes to ``segment``; views are read
+            # after the rotation so they already contain everything before it
+            segment = self._wal.rotate()
+            views = list(storage._views.values())
+            size = write_snapshot(
+                self.directory / SNAPSHOT_NAME,
+                ((view.project, view.tasks) for view in views),
+                segment=segment,
+                # read after the views: never lower than an id they contain
+                project_counter=storage._project_counter,
+                task_counter=storage._task_counter,
+            )
+            fsync_directory(self.directory)
+            for old, path in list_segments(self.directory):
+                if old < segment:
+                    path.unlink()
+            fsync_directory(self.directory)
+
+            self._checkpointed = lsn
+            self.last_checkpoint = CheckpointReport(
+                segment=segment,
+                tasks=sum(len(view.tasks) for view in views),
+                size=size,
+                elapsed=time.perf_counter() - started,
+            )
+            return self.last_checkpoint
+
+    def status(self) -> dict[str, Any]:
+        """Last recovery and checkpoint, and log activity since ``open``."""
+        return {
+            "directory": str(self.directory),
+            "fsync": self._fsync,
+            "recovery": asdict(self.recovery) if self.recovery else None,
+            "last_checkpoint": (
+                asdict(self.last_checkpoint) if self.last_checkpoint else None
+            ),
+            # group commit: one fsync usually covers many records
+            "log_records": self._wal.appended if self._wal else 0,
+            "fsyncs": self._wal.fsyncs if self._wal else 0,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._snapshot_seconds):
+            if self._wal is None or self._wal.appended == self._checkpointed:
+                continue
+            try:
+                self.checkpoint()
+            except Exception as exc:  # noqa: BLE001 - the log still has everything
+                print(f"[memory] checkpoint failed: {exc}", file=sys.stderr)
+
+    def start(self) -> None:
+        """Take snapshots every ``snapshot_seconds`` in a daemon thread."""
+        if self._thread is not None or self._snapshot_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="memory-checkpoint", daemon=True
+        )
+        self._thread.start()
+
+    def close(self, *, checkpoint: bool = True) -> None:
+        """Stop the checkpoint thread, write a final snapshot, close the log.
+
+        ``checkpoint=False`` leaves the state as a crash after the last
+        acknowledged write would (the next ``open`` replays the log).
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._wal is None:
+            return
+        if checkpoint and self._wal.appended != self._checkpointed:
+            self.checkpoint()
+        self._wal.close()
+        # a later open() restores from the directory again
+        self._wal = None
+        self._storage = None
+        self._checkpointed = 0
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+from app.models.search import DESCRIPTION_WEIGHT, TITLE_WEIGHT, tokenize
+
+
+class SearchIndex:
+    """Inverted index over task titles and descriptions.
+
+    In-memory counterpart of the ``tasks.search_vector`` GIN index: every word
+    maps to the ids of the tasks containing it, with a weight (title words
+    count more than description words, like ts_rank's A/B labels). A search
+    intersects the postings of its words, smallest first, so it only touches
+    tasks that contain the rarest word.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[int, float]] = {}
+        # task id -> its words, so a task can be removed without a full scan
+        # (a tuple: a set per task would cost several times the memory)
+        self._words: dict[int, tuple[str, ...]] = {}
+
+    def add(self, task_id: int, title: str, description: str) -> None:
+        """Index (or re-index) one task."""
+        self.remove(task_id)
+        weights: Counter[str] = Counter()
+        for word in tokenize(title):
+            weights[word] += TITLE_WEIGHT
+        for word in tokenize(description):
+            weights[word] += DESCRIPTION_WEIGHT
+        for word, weight in weights.items():
+            self._postings.setdefault(word, {})[task_id] = weight
+        self._words[task_id] = tuple(weights)
+
+    def load(self, tasks: Iterable[tuple[int, str, str]]) -> None:
+        """Index many ``(task_id, title, description)`` at once (same result as ``add``).
+
+        For building the index from existing data: there is nothing to remove
+        first, and a plain dict is cheaper than a Counter per task.
+        """
+        postings = self._postings
+        for task_id, title, description in tasks:
+            weights: dict[str, float] = {}
+            for word in tokenize(title):
+                weights[word] = weights.get(word, 0) + TITLE_WEIGHT
+            for word in tokenize(description):
+                weights[word] = weights.get(word, 0) + DESCRIPTION_WEIGHT
+            for word, weight in weights.items():
+                posting = postings.get(word)
+                if posting is None:
+                    posting = postings[word] = {}
+                posting[task_id] = weight
+            self._words[task_id] = tuple(weights)
+
+    def remove(self, task_id: int) -> None:
+        for word in self._words.pop(task_id, ()):
+            posting = self._postings[word]
+            del posting[task_id]
+            if not posting:
+                del self._postings[word]
+
+    def search(self, text: str) -> dict[int, float]:
+        """Ids of the tasks containing every word of ``text``, with their rank."""
+        words = set(tokenize(text))
+        if not words:
+            return {}
+        postings = sorted((self._postings.get(w, {}) for w in words), key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            if not ids:
+                break
+            ids.intersection_update(posting)
+        return {task_id: sum(p[task_id] for p in postings) for task_id in ids}
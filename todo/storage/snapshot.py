@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from app.models.project import Project
+from app.models.query import task_deadline
+from app.models.task import Status, Task
+
+
+# Layout (little endian):
+#   header   magic, format, first log segment to replay, project/task counters,
+#            number of projects
+#   project  id, flags, created_at, number of tasks, name/description sizes,
+#            then name + description (UTF-8), then its tasks
+#   task     id, flags, deadline (ordinal, 0 = none), at_closed, created_at,
+#            title/description sizes, then title + description (UTF-8)
+#   trailer  crc32 of everything after the header
+# Datetimes are microseconds since 1970-01-01; a flag bit says whether the
+# value was timezone-aware (UTC) so it is restored exactly as it was stored.
+MAGIC = b"TODOSNAP"
+FORMAT = 1
+_HEADER = struct.Struct("<8sIQQQQ")
+_PROJECT = struct.Struct("<IBqQHH")
+_TASK = struct.Struct("<IBiqqHH")
+_TRAILER = struct.Struct("<I")
+
+_STATUSES = tuple(Status)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_STATUS_MASK = 0b11
+_HAS_CLOSED = 1 << 2
+_CLOSED_AWARE = 1 << 3
+_CREATED_AWARE = 1 << 4
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class SnapshotError(RuntimeError):
+    """The snapshot file is not one this version can read, or it is corrupt."""
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """What a snapshot holds: projects (with tasks, in id order) and where the log resumes."""
+
+    segment: int
+    project_counter: int
+    task_counter: int
+    projects: list[Project] = field(default_factory=list)
+
+    @property
+    def task_count(self) -> int:
+        return sum(len(p.tasks) for p in self.projects)
+
+
+def _encode_time(value: datetime) -> tuple[int, bool]:
+    if value.tzinfo is None:
+        return (value - _NAIVE_EPOCH) // _MICROSECOND, False
+    return (value - _UTC_EPOCH) // _MICROSECOND, True
+
+
+def _decode_time(micros: int, aware: bool) -> datetime:
+    return (_UTC_EPOCH if aware else _NAIVE_EPOCH) + timedelta(microseconds=micros)
+
+
+def _write_project(out: BinaryIO, project: Project, tasks: Iterable[Task], crc: int) -> int:
+    tasks = tuple(tasks)
+    name = project.name.encode()
+    description = project.description.encode()
+    created, aware = _encode_time(project.created_at)
+    chunk = [
+        _PROJECT.pack(
+            project.id,
+            _CREATED_AWARE if aware else 0,
+            created,
+            len(tasks),
+            len(name),
+            len(description),
+        ),
+        name,
+        description,
+    ]
+    pack = _TASK.pack
+    for task in tasks:
+        title = task.title.encode()
+        text = task.description.encode()
+        deadline = task_deadline(task)
+        created, created_aware = _encode_time(task.created_at)
+        flags = _STATUS_CODES[task.status]
+        closed = 0
+        if task.at_closed is not None:
+            closed, closed_aware = _encode_time(task.at_closed)
+            flags |= _HAS_CLOSED | (_CLOSED_AWARE if closed_aware else 0)
+        if created_aware:
+            flags |= _CREATED_AWARE
+        chunk.append(
+            pack(
+                task.id,
+                flags,
+                deadline.toordinal() if deadline is not None else 0,
+                closed,
+                created,
+                len(title),
+                len(text),
+            )
+        )
+        chunk.append(title)
+        chunk.append(text)
+    data = b"".join(chunk)
+    out.write(data)
+    return zlib.crc32(data, crc)
+
+
+def write_snapshot(
+    path: Path,
+    projects: Iterable[tuple[Project, Iterable[Task]]],
+    *,
+    segment: int,
+    project_counter: int,
+    task_counter: int,
+) -> int:
+    """Write the snapshot atomically: temp file, fsync, then rename over ``path``.
+
+    :return: size of the file in bytes
+    """
+    projects = list(projects)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as out:
+        out.write(
+            _HEADER.pack(
+                MAGIC, FORMAT, segment, project_counter, task_counter, len(projects)
+            )
+        )
+        crc = 0
+        for project, tasks in projects:
+            crc = _write_project(out, project, tasks, crc)
+        out.write(_TRAILER.pack(crc))
+        out.flush()
+        os.fsync(out.fileno())
+        size = out.tell()
+    os.replace(tmp, path)
+    return size
+
+
+def read_snapshot(path: Path) -> Snapshot | None:
+    """Load a snapshot through a read-only memory map (None if there is none).
+
+    Fields are unpacked in place from the mapping; only the strings are
+    copied out, so no second copy of the file is ever held in memory.
+    """
+    if not path.exists():
+        return None
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        if len(data) < _HEADER.size + _TRAILER.size:
+            raise SnapshotError(f"{path} is truncated")
+        magic, version, segment, project_counter, task_counter, n_projects = (
+            _HEADER.unpack_from(data, 0)
+        )
+        if magic != MAGIC or version != FORMAT:
+            raise SnapshotError(f"{path} is not a format {FORMAT} snapshot")
+        end = len(data) - _TRAILER.size
+        with memoryview(data) as view:
+            crc = zlib.crc32(view[_HEADER.size:end])
+        if crc != _TRAILER.unpack_from(data, end)[0]:
+            raise SnapshotError(f"{path} is corrupt (checksum mismatch)")
+
+        snapshot = Snapshot(segment, project_counter, task_counter)
+        unpack_project = _PROJECT.unpack_from
+        unpack_task = _TASK.unpack_from
+        fromordinal = date.fromordinal
+        offset = _HEADER.size
+        for _ in range(n_projects):
+            project_id, flags, created, n_tasks, name_size, text_size = unpack_project(
+                data, offset
+            )
+            offset += _PROJECT.size
+            name = data[offset:offset + name_size].decode()
+            offset += name_size
+            description = data[offset:offset + text_size].decode()
+            offset += text_size
+
+            tasks = []
+            for _ in range(n_tasks):
+                task_id, task_flags, deadline, closed, task_created, title_size, size = (
+                    unpack_task(data, offset)
+                )
+                offset += _TASK.size
+                title = data[offset:offset + title_size].decode()
+                offset += title_size
+                text = data[offset:offset + size].decode()
+                offset += size
+                tasks.append(
+                    Task(
+                        task_id,
+                        title,
+                        text,
+                        _STATUSES[task_flags & _STATUS_MASK],
+                        fromordinal(deadline) if deadline else None,
+                        _decode_time(closed, bool(task_flags & _CLOSED_AWARE))
+                        if task_flags & _HAS_CLOSED
+                        else None,
+                        _decode_time(task_created, bool(task_flags & _CREATED_AWARE)),
+                    )
+                )
+            snapshot.projects.append(
+                Project(
+                    project_id,
+                    name,
+                    description,
+                    _decode_time(created, bool(flags & _CREATED_AWARE)),
+                    tasks,
+                )
+            )
+    return snapshot
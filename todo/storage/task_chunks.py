@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain
+from operator import attrgetter
+from typing import Iterable, Iterator, Sequence, overload
+
+from app.models.task import Task
+
+
+# Chunks are split when they grow past twice this size and merged into a
+# neighbour when they shrink below a quarter of it (except the last one, where
+# new tasks are appended).
+CHUNK_SIZE = 128
+
+_task_id = attrgetter("id")
+
+
+class TaskChunks(Sequence[Task]):
+    """Immutable tasks of one project in id order, stored as fixed-size chunks.
+
+    The read-side counterpart of ``Project.tasks``: ``updated`` returns a new
+    sequence that shares every chunk it did not touch with this one, so a
+    single-task write copies one chunk and the chunk index (O(n / CHUNK_SIZE +
+    CHUNK_SIZE)) instead of the whole task list. Readers keep using the old
+    sequence; nothing in it ever changes.
+    """
+
+    __slots__ = ("_chunks", "_firsts", "_starts", "_len")
+
+    def __init__(
+        self,
+        chunks: Iterable[tuple[Task, ...]] = (),
+        *,
+        _firsts: list[int] | None = None,
+    ) -> None:
+        self._chunks = tuple(filter(None, chunks))
+        # id of the first task of every chunk (where ``updated`` looks ids up)
+        self._firsts = (
+            _firsts
+            if _firsts is not None
+            else [chunk[0].id for chunk in self._chunks]
+        )
+        self._len = sum(map(len, self._chunks))
+        # position of the first task of every chunk; only positional reads
+        # need it, so it is built on the first one
+        self._starts: list[int] | None = None
+
+    @classmethod
+    def of(cls, tasks: Iterable[Task]) -> TaskChunks:
+        """Chunks of ``tasks``, which must already be in id order."""
+        tasks = tuple(tasks)
+        return cls(
+            tasks[i:i + CHUNK_SIZE] for i in range(0, len(tasks), CHUNK_SIZE)
+        )
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Task]:
+        return chain.from_iterable(self._chunks)
+
+    @overload
+    def __getitem__(self, index: int) -> Task: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Task]: ...
+
+    def __getitem__(self, index: int | slice) -> Task | list[Task]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return list(self)[index]
+            return self._range(start, stop)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("task index out of range")
+        starts = self._positions()
+        i = bisect_right(starts, index) - 1
+        return self._chunks[i][index - starts[i]]
+
+    def _positions(self) -> list[int]:
+        if self._starts is None:
+            self._starts = [0, *accumulate(map(len, self._chunks))]
+        return self._starts
+
+    def _range(self, start: int, stop: int) -> list[Task]:
+        """Tasks at positions [start, stop), visiting only the chunks involved."""
+        tasks: list[Task] = []
+        if start >= stop:
+            return tasks
+        starts = self._positions()
+        i = bisect_right(starts, start) - 1
+        offset = start - starts[i]
+        while len(tasks) < stop - start:
+            chunk = self._chunks[i]
+            tasks.extend(chunk[offset:offset + stop - start - len(tasks)])
+            i += 1
+            offset = 0
+        return tasks
+
+    def updated(
+        self,
+        put: Iterable[Task] = (),
+        drop: Iterable[int] = (),
+    ) -> TaskChunks:
+        """A copy with the tasks of ``put`` added or replaced (by id) and ``drop`` removed.
+
+        Every touched chunk is copied once, however many of the changes land in it.
+        """
+        chunks = list(self._chunks)
+        edited: dict[int, list[Task]] = {}
+
+        def chunk_of(task_id: int) -> tuple[int, list[Task]]:
+            i = max(bisect_right(self._firsts, task_id) - 1, 0)
+            if i not in edited:
+                edited[i] = list(chunks[i]) if chunks else []
+            return i, edited[i]
+
+        for task in put:
+            _, chunk = chunk_of(task.id)
+            j = bisect_left(chunk, task.id, key=_task_id)
+            if j < len(chunk) and chunk[j].id == task.id:
+                chunk[j] = task
+            else:
+                chunk.insert(j, task)
+        for task_id in drop:
+            if not chunks:
+                break
+            _, chunk = chunk_of(task_id)
+            j = bisect_left(chunk, task_id, key=_task_id)
+            if j < len(chunk) and chunk[j].id == task_id:
+                del chunk[j]
+
+        if not edited:
+            return self
+        if not chunks:
+            chunks = [()]
+        # (an empty sequence has no first ids to patch)
+        balanced = bool(self._chunks)
+        last = len(chunks) - 1
+        for i, chunk in edited.items():
+            chunks[i] = tuple(chunk)
+            balanced = balanced and 0 < len(chunk) <= 2 * CHUNK_SIZE and (
+                len(chunk) >= CHUNK_SIZE // 4 or i == last
+            )
+        if not balanced:
+            return TaskChunks(_rebalanced(chunks, sorted(edited)))
+        # same chunks, so only the first ids of the touched ones can change
+        firsts = list(self._firsts)
+        for i in edited:
+            firsts[i] = chunks[i][0].id
+        return TaskChunks(chunks, _firsts=firsts)
+
+
+def _rebalanced(
+    chunks: list[tuple[Task, ...]],
+    touched: list[int],
+) -> list[tuple[Task, ...]]:
+    """Split oversized and merge undersized chunks among ``touched`` (ascending)."""
+    for i in reversed(touched):
+        chunk = chunks[i]
+        if len(chunk) > 2 * CHUNK_SIZE:
+            chunks[i:i + 1] = [
+                chunk[j:j + CHUNK_SIZE] for j in range(0, len(chunk), CHUNK_SIZE)
+            ]
+        elif len(chunk) < CHUNK_SIZE // 4 and len(chunks) > 1:
+            # merge with the smaller neighbour; empty chunks simply disappear
+            k = i + 1 if i == 0 or (
+                i + 1 < len(chunks) and len(chunks[i + 1]) < len(chunks[i - 1])
+            ) else i - 1
+            lo, hi = min(i, k), max(i, k)
+            chunks[lo:hi + 1] = [chunks[lo] + chunks[hi]]
+    return chunks
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+import threading
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.models.project import Project
+from app.models.query import task_deadline
+from app.models.task import Task
+
+
+# Every record is framed as <payload length, crc32 of payload> + JSON payload,
+# so a write torn by a crash shows up as a short or mismatching last frame.
+_FRAME = struct.Struct("<II")
+_SEGMENT_NAME = re.compile(r"^wal-(\d{8})\.log$")
+
+Record = list[Any]
+
+
+# --- Records -------------------------------------------------------------
+# Records carry the state *after* a change (not the call that made it), so
+# replaying one twice, or over a snapshot that already has it, changes nothing.
+def project_record(project: Project) -> Record:
+    return [
+        "project",
+        project.id,
+        project.name,
+        project.description,
+        project.created_at.isoformat(),
+    ]
+
+
+def drop_project_record(project_id: int) -> Record:
+    return ["drop_project", project_id]
+
+
+def task_record(project_id: int, task: Task) -> Record:
+    deadline = task_deadline(task)
+    return [
+        "task",
+        project_id,
+        task.id,
+        task.title,
+        task.description,
+        task.status.value,
+        deadline.isoformat() if deadline is not None else None,
+        task.at_closed.isoformat() if task.at_closed is not None else None,
+        task.created_at.isoformat(),
+    ]
+
+
+def drop_task_record(project_id: int, task_id: int) -> Record:
+    return ["drop_task", project_id, task_id]
+
+
+def record_project(record: Record) -> Project:
+    """The project of a ``project`` record (without tasks)."""
+    _, project_id, name, description, created_at = record
+    return Project(project_id, name, description, datetime.fromisoformat(created_at))
+
+
+def record_task(record: Record) -> Task:
+    """The task of a ``task`` record."""
+    _, _, task_id, title, description, status, deadline, at_closed, created_at = record
+    return Task(
+        task_id,
+        title,
+        description,
+        status,
+        date.fromisoformat(deadline) if deadline is not None else None,
+        datetime.fromisoformat(at_closed) if at_closed is not None else None,
+        datetime.fromisoformat(created_at),
+    )
+
+
+def _frame(record: Record) -> bytes:
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode()
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+# --- Segments ------------------------------------------------------------
+def segment_path(directory: Path, segment: int) -> Path:
+    return directory / f"wal-{segment:08d}.log"
+
+
+def list_segments(directory: Path) -> list[tuple[int, Path]]:
+    """(number, path) of the log segments in ``directory``, oldest first."""
+    segments = []
+    for path in directory.iterdir():
+        match = _SEGMENT_NAME.match(path.name)
+        if match:
+            segments.append((int(match.group(1)), path))
+    return sorted(segments)
+
+
+def read_segment(path: Path) -> Iterator[Record]:
+    """The records of one segment, stopping at the first torn/corrupt frame.
+
+    Only the tail of the segment that was being written at a crash can be torn;
+    those records were never acknowledged (their fsync never returned).
+    """
+    data = path.read_bytes()
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        size, crc = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        payload = data[start:start + size]
+        if len(payload) < size or zlib.crc32(payload) != crc:
+            return
+        yield json.loads(payload)
+        offset = start + size
+
+
+def fsync_directory(directory: Path) -> None:
+    """Make created/renamed/deleted entries of ``directory`` durable (POSIX)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WalClosedError(RuntimeError):
+    """The log was closed, or a write/fsync failed and it stopped accepting work."""
+
+
+class WriteAheadLog:
+    """Append-only log of InMemoryStorage mutations, fsynced by group commit.
+
+    Writers ``append`` records while they still hold the storage locks (so the
+    log order is the order the changes were applied in) and ``sync`` after
+    releasing them. The first writer to sync becomes the leader: it writes
+    everything queued so far and fsyncs once; writers that queued meanwhile
+    wait for that fsync or lead the next one. Under concurrent writes, one
+    fsync acknowledges a whole group of them.
+
+    The log is a sequence of segment files; ``rotate`` starts a new one so a
+    snapshot can say "replay from segment N" and older segments can go.
+
+    A failed write or fsync is fatal: from then on every append/sync raises
+    WalClosedError (the change that was being logged is in memory but was
+    never acknowledged). Restart the process to get back to the last
+    acknowledged state.
+    """
+
+    def __init__(self, directory: Path, segment: int, *, fsync: bool = True) -> None:
+        self._directory = directory
+        self._fsync = fsync
+        self._cond = threading.Condition()
+        self._segment = segment
+        self._file = open(segment_path(directory, segment), "ab")
+        fsync_directory(directory)
+        self._pending: list[bytes] = []
+        # log sequence numbers: records queued / records on disk
+        self._appended = 0
+        self._durable = 0
+        self._flushing = False
+        self._error: BaseException | None = None
+        self._closed = False
+        self.fsyncs = 0
+
+    @property
+    def appended(self) -> int:
+        return self._appended
+
+    def append(self, *records: Record) -> int:
+        """Queue ``records`` (in order, without waiting); return the LSN to sync to."""
+        frames = [_frame(record) for record in records]
+        with self._cond:
+            self._check()
+            self._pending.extend(frames)
+            self._appended += len(frames)
+            return self._appended
+
+    def sync(self, lsn: int) -> None:
+        """Return once every record up to ``lsn`` is written (and fsynced)."""
+        while True:
+            with self._cond:
+                while self._flushing and self._durable < lsn:
+                    self._cond.wait()
+                if self._durable >= lsn:
+                    return
+                self._check()
+                batch, self._pending = self._pending, []
+                upto = self._appended
+                self._flushing = True
+            # the leader does the I/O without the lock: others keep appending
+            try:
+                self._write(batch)
+            except BaseException as exc:
+                with self._cond:
+                    self._error = exc
+                    self._flushing = False
+                    self._cond.notify_all()
+                raise WalClosedError("write-ahead log write failed") from exc
+            with self._cond:
+                self._durable = upto
+                self._flushing = False
+                self._cond.notify_all()
+
+    def _write(self, batch: list[bytes]) -> None:
+        self._file.write(b"".join(batch))
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise WalClosedError("write-ahead log failed earlier") from self._error
+        if self._closed:
+            raise WalClosedError("write-ahead log is closed")
+
+    def rotate(self) -> int:
+        """Flush, then send every later record to a new segment; return its number."""
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self._check()
+            # rare (one per snapshot): the queue is written while holding the
+            # lock, so no record can slip between the two segments
+            self._write(self._pending)
+            self._pending = []
+            self._durable = self._appended
+            self._file.close()
+            self._segment += 1
+            self._file = open(segment_path(self._directory, self._segment), "ab")
+            fsync_directory(self._directory)
+            self._cond.notify_all()
+            return self._segment
+
+    def close(self) -> None:
+        """Write what is queued and stop accepting records."""
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            if self._closed:
+                return
+            try:
+                if self._error is None:
+                    self._write(self._pending)
+                    self._pending = []
+                    self._durable = self._appended
+            finally:
+                self._closed = True
+                self._file.close()
+                self._cond.notify_all()